@@ -1,5 +1,9 @@
 """
 A component with a large number of inputs is finite differenced.
+
+The gradient is computed with both the 'iterative' and 'direct'
+gmres_mode settings so the cost of one gmres solve per right hand side
+can be compared to a single LU factorization of the assembled operator.
 """
 
 import numpy as np
@@ -49,7 +53,18 @@ if __name__ == "__main__":
         J = top.driver.calc_gradient(inputs=inputs,
                                      outputs=outputs,
                                      mode = 'forward')
-        print 'Time elapsed', time() - t0
+        t_iter = time() - t0
+        print 'Time elapsed (gmres_mode=iterative)', t_iter
+
+        top.driver.gradient_options.gmres_mode = 'direct'
+        t0 = time()
+        J_direct = top.driver.calc_gradient(inputs=inputs,
+                                            outputs=outputs,
+                                            mode = 'forward')
+        t_direct = time() - t0
+        print 'Time elapsed (gmres_mode=direct)', t_direct
+        print 'Speedup', t_iter/t_direct
+        print 'Max difference', np.max(np.abs(J - J_direct))
 
 
     # python -m cProfile -s time fd_scalable.py >z
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Round trip latency of ExternalCode.
+
+An ExternalCode that runs a trivial command is executed repeatedly, first
+waiting for the command to exit (the default) and then polling for it with
+a few fixed poll delays, and the mean time per execution is printed for
+each. The difference from the first line is the dead time added by polling.
+
+    python external_code_latency.py [count]
+"""
+
+import sys
+from time import time
+
+from openmdao.lib.components.external_code import ExternalCode
+from openmdao.main.api import set_as_top
+
+COUNT = 50
+POLL_DELAYS = [0., 0.001, 0.01, 0.1]
+
+
+def latency(poll_delay, count):
+    """ Return the mean time to execute a trivial ExternalCode. """
+    comp = set_as_top(ExternalCode())
+    if sys.platform == 'win32':
+        comp.command = ['cmd', '/c', 'rem']
+    else:
+        comp.command = ['true']
+    comp.poll_delay = poll_delay
+    comp.timeout = 60.
+
+    comp.run()  # Warm up.
+    t0 = time()
+    for i in range(count):
+        comp.run()
+    return (time() - t0) / count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+
+    print '%10s %12s' % ('poll_delay', 'ms per run')
+    for poll_delay in POLL_DELAYS:
+        print '%10g %12.2f' % (poll_delay, latency(poll_delay, count) * 1000.)
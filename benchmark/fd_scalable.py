@@ -1,5 +1,6 @@
 """
-A component with a large number of inputs is finite differenced.
+A component with a large number of inputs is finite differenced, first
+densely and then with a sparse coupling matrix and graph colouring.
 """
 
 import numpy as np
@@ -35,5 +36,24 @@ if __name__ == "__main__":
                                  mode = 'fd')
     print 'Time elapsed', time() - t0
 
+    # Same thing with a tridiagonal coupling matrix and sparsity detection.
+    # The first gradient finds the pattern, later ones (as seen by an
+    # optimizer) only need three runs.
+    top.comp.C_y = np.diag(np.random.random(N)) + \
+                   np.diag(np.random.random(N-1), 1) + \
+                   np.diag(np.random.random(N-1), -1)
+    top.driver.gradient_options.fd_sparsity = 'probe'
+    top.run()
+
+    t0 = time()
+    J = top.driver.calc_gradient(inputs=inputs,
+                                 outputs=outputs,
+                                 mode = 'fd')
+    print 'Time elapsed (sparsity detection)', time() - t0
+
+    t0 = time()
+    J = top.driver._calc_gradient(inputs, outputs, mode = 'fd')
+    print 'Time elapsed (coloured)', time() - t0
+
 
     # python -m cProfile -s time fd_scalable.py >z
\ No newline at end of file
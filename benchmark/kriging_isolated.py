@@ -29,3 +29,7 @@ for jj in range(len(xx)):
     pred = krig1.predict(xx[jj, :])
 print 'predicting Time elapsed', time() - t0
 
+
+t0 = time()
+mu, rmse = krig1.predict_batch(xx)
+print 'batch predicting Time elapsed', time() - t0
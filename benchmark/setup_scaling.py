@@ -0,0 +1,168 @@
+"""
+Scaling benchmark for setup, run and calc_gradient of large assemblies.
+
+Each model is a chain of `size` simple components, with every block of
+CYCLE components closed into a cycle by a feedback connection from its
+last component to its first, converged by a nested FixedPointIterator.
+For each size, the time to run the model (dominated by the first setup),
+rerun it, and compute a gradient across the whole chain is printed along
+with the slowest setup stages.
+
+    python setup_scaling.py [size ...] [--save FILE] [--compare FILE]
+
+--save writes the timings to FILE, and --compare reports any timing that
+is more than SLOWDOWN times the one saved in FILE by an earlier run, and
+exits with status 1 if there are any, so scaling regressions are caught.
+"""
+
+import json
+import sys
+from argparse import ArgumentParser
+from time import time
+
+import numpy as np
+
+from openmdao.lib.drivers.api import FixedPointIterator
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+
+SIZES = [100, 300, 1000, 3000, 10000]
+CYCLE = 10
+SLOWDOWN = 1.5
+
+# timings compared by --compare
+TIMINGS = ['first_run', 'setup', 'run', 'gradient_setup', 'calc_gradient']
+
+
+class Stage(Component):
+    """ y = 0.5*x + 0.1*z """
+
+    x = Float(1.0, iotype='in')
+    z = Float(0.0, iotype='in')
+    y = Float(0.0, iotype='out')
+
+    def execute(self):
+        self.y = 0.5*self.x + 0.1*self.z
+
+    def list_deriv_vars(self):
+        return ('x', 'z'), ('y',)
+
+    def provideJ(self):
+        return np.array([[0.5, 0.1]])
+
+
+def build_model(size, cycle=CYCLE):
+    """ Return a top level Assembly holding a chain of `size` Stages,
+    cycles of `cycle` Stages each converged by a FixedPointIterator.
+    """
+    top = set_as_top(Assembly())
+
+    names = ['c%d' % i for i in range(size)]
+    for i, name in enumerate(names):
+        top.add(name, Stage())
+        if i:
+            top.connect(names[i-1]+'.y', name+'.x')
+
+    workflow = []
+    for start in range(0, size, cycle):
+        block = names[start:start+cycle]
+        if len(block) < 2:
+            workflow.extend(block)
+            continue
+
+        solver = top.add('solver%d' % (start // cycle), FixedPointIterator())
+        solver.workflow.add(block)
+        solver.add_parameter(block[0]+'.z')
+        solver.add_constraint('%s.z = %s.y' % (block[0], block[-1]))
+        workflow.append(solver.name)
+
+    top.driver.workflow.add(workflow)
+    return top
+
+
+def bench(size):
+    """ Return a dict of timings for a model of the given size. """
+    results = {}
+
+    t0 = time()
+    top = build_model(size)
+    results['build'] = time() - t0
+
+    t0 = time()
+    top.run()
+    results['first_run'] = time() - t0
+
+    stats = top.get_setup_stats()
+    results['setup'] = stats['last_time']
+    results['phases'] = stats['phases']
+    results['graphs'] = stats['graphs']
+
+    t0 = time()
+    top.run()
+    results['run'] = time() - t0
+
+    t0 = time()
+    top.driver.calc_gradient(inputs=['c0.x'],
+                             outputs=['c%d.y' % (size-1)],
+                             mode='forward')
+    results['calc_gradient'] = time() - t0
+    results['gradient_setup'] = top.get_setup_stats()['last_time']
+
+    return results
+
+
+def report(size, results, nstages=5):
+    """ Print the timings in `results`. """
+    print '%d components: depgraph %d nodes/%d edges' % \
+          ((size,) + tuple(results['graphs']['depgraph']))
+    for name in ['build'] + TIMINGS:
+        print '    %-16s %10.3f s' % (name, results[name])
+
+    stages = sorted(results['phases'].items(), key=lambda item: -item[1])
+    print '    slowest setup stages:'
+    for name, elapsed in stages[:nstages]:
+        print '        %-24s %10.3f s' % (name, elapsed)
+
+
+def compare(all_results, baseline):
+    """ Print any timings more than SLOWDOWN times those in `baseline`,
+    returning the number found.
+    """
+    count = 0
+    for size, results in sorted(all_results.items()):
+        old = baseline.get(str(size))
+        if old is None:
+            continue
+        for name in TIMINGS:
+            if results[name] > SLOWDOWN * old[name]:
+                print 'REGRESSION: %d components, %s took %.3f s (was %.3f s)' \
+                      % (size, name, results[name], old[name])
+                count += 1
+    return count
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('sizes', type=int, nargs='*', default=SIZES,
+                        help='numbers of components to benchmark')
+    parser.add_argument('--save', help='file to save timings to')
+    parser.add_argument('--compare', help='file of timings to compare to')
+    options = parser.parse_args()
+
+    all_results = {}
+    for size in options.sizes:
+        all_results[size] = bench(size)
+        report(size, all_results[size])
+
+    if options.save:
+        with open(options.save, 'w') as out:
+            json.dump(dict([(str(size), results)
+                            for size, results in all_results.items()]),
+                      out, indent=4)
+
+    if options.compare:
+        with open(options.compare) as inp:
+            baseline = json.load(inp)
+        if compare(all_results, baseline):
+            sys.exit(1)
@@ -142,6 +142,30 @@ class MPITests9(MPITestCase):
                 else:
                     self.assertEqual(val, [])
 
+    def test_par3_load_balance(self):
+        num_inputs = 17
+        top, expected = model_par3_setup(num_inputs)
+        driver = top.driver
+        driver.load_balance = True
+        top.run()
+
+        for name, expval in expected.items():
+                val = driver.case_outputs.get(name)
+                if driver.workflow._system.mpi.comm != MPI.COMM_NULL:
+                    for v1, v2 in zip(expval, val):
+                        if isinstance(v1, np.ndarray):
+                            self.assertTrue(all(v1==v2))
+                        else:
+                            self.assertEqual(v1, v2)
+                else:
+                    self.assertEqual(val, [])
+
+        if MPI.COMM_WORLD.rank == 0:
+            self.assertEqual(len(driver.load_stats), 2)
+            # first parallel workflow hands out the cases
+            self.assertEqual(driver.load_stats[0][0], 0)
+            self.assertEqual(driver.load_stats[1][0], num_inputs)
+
 class MPITests5(MPITestCase):
 
     N_PROCS = 5
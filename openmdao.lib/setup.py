@@ -116,6 +116,7 @@ Component, Driver, Variable and other plugins for OpenMDAO
       openmdao.lib.casehandlers.caseset.CaseSet = openmdao.lib.casehandlers.caseset:CaseSet
       openmdao.lib.casehandlers.jsoncase.JSONCaseRecorder = openmdao.lib.casehandlers.jsoncase:JSONCaseRecorder
       openmdao.lib.casehandlers.jsoncase.BSONCaseRecorder = openmdao.lib.casehandlers.jsoncase:BSONCaseRecorder
+      openmdao.lib.casehandlers.binarycase.BinaryCaseRecorder = openmdao.lib.casehandlers.binarycase:BinaryCaseRecorder
 
       [openmdao.caseiterator]
       openmdao.lib.casehandlers.listcase.ListCaseIterator = openmdao.lib.casehandlers.listcase:ListCaseIterator
@@ -15,6 +15,7 @@ from openmdao.lib.casehandlers.dumpcase import DumpCaseRecorder
 
 from openmdao.lib.casehandlers.jsoncase import JSONCaseRecorder, \
                                                BSONCaseRecorder, verify_json
+from openmdao.lib.casehandlers.binarycase import BinaryCaseRecorder
 
 from openmdao.lib.casehandlers.listcase import ListCaseRecorder, \
                                                ListCaseIterator
@@ -0,0 +1,207 @@
+"""
+Columnar binary Case Recording.
+
+The file starts with a header holding the simulation and driver information,
+followed by any number of chunks.  Each chunk holds the cases of a single
+driver, with every numeric variable stored as a contiguous fixed-width
+column so that a reader can memory-map it rather than parse it::
+
+    'OMDAOCOL' <version:u4> <header_len:u4> <header JSON>
+    'CHNK' <meta_len:u4> <data_len:u8> <meta JSON> <pad> <column data>
+
+The chunk meta JSON lists each column's name, dtype, shape and offset
+(relative to the 8-byte aligned start of the column data), the case
+hierarchy ids, and the values of variables which can't be stored as
+fixed-width columns (strings, variable trees, ragged arrays, ...).
+"""
+
+import StringIO
+import cStringIO
+import json
+
+from struct import pack
+
+import numpy
+from numpy import ndarray
+
+from openmdao.lib.casehandlers.jsoncase import _BaseRecorder, _Encoder
+from openmdao.util.typegroups import int_types, real_types
+
+MAGIC = 'OMDAOCOL'
+VERSION = 1
+CHUNK_MAGIC = 'CHNK'
+CHUNK_HEADER = '<4sLQ'
+CHUNK_HEADER_SIZE = 16
+ALIGN = 8
+
+_NUMERIC_KINDS = 'biufc'
+
+
+def _padding(pos):
+    """ Return number of bytes needed to align `pos`. """
+    return (ALIGN - pos % ALIGN) % ALIGN
+
+
+def _column_layout(values):
+    """
+    Return ``(dtype, shape)`` if `values` can be stored as a fixed-width
+    column, else None.
+    """
+    first = values[0]
+    if isinstance(first, ndarray):
+        dtype, shape = first.dtype, first.shape
+        if dtype.kind not in _NUMERIC_KINDS:
+            return None
+        for value in values:
+            if not isinstance(value, ndarray) or value.dtype != dtype or \
+               value.shape != shape:
+                return None
+        return (dtype, shape)
+
+    bools = (bool, numpy.bool_)
+    if isinstance(first, bools):
+        check, dtype = bools, numpy.dtype(bool)
+    elif isinstance(first, int_types):
+        check, dtype = int_types, numpy.dtype(numpy.int64)
+    elif isinstance(first, real_types):
+        check, dtype = real_types, numpy.dtype(numpy.float64)
+    else:
+        return None
+
+    for value in values:
+        if not isinstance(value, check) or \
+           (check is not bools and isinstance(value, bools)):
+            return None
+    return (dtype, ())
+
+
+class BinaryCaseRecorder(_BaseRecorder):
+    """
+    Records a run in a columnar, append-only binary file `out`, which may be
+    a filename or a file-like object opened in binary mode.  If `out` is None,
+    cases will be ignored.
+
+    Cases are buffered and written every `chunk_size` cases, so call
+    :meth:`flush` or :meth:`close` before reading the file.  Each chunk
+    stores every numeric variable as a contiguous column, so the file can be
+    read back with ``CaseDataset(filename, 'binary')``, where by-variable
+    queries return views of a memory map of the file rather than parsing
+    every case.
+    Larger chunks mean fewer column segments to stitch together on read.
+    """
+
+    def __init__(self, out='cases.bin', chunk_size=1000):
+        super(BinaryCaseRecorder, self).__init__()
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be >= 1')
+        if isinstance(out, basestring):
+            out = open(out, 'wb')
+        self.out = out
+        self.chunk_size = chunk_size
+        self._pos = 0
+        self._seq = 0
+        self._pending = {}  # Buffered case info, keyed by driver id.
+        self._npending = 0
+
+    def record_constants(self, constants):
+        """ Record constant data. """
+        if not self.out:
+            return
+
+        header = dict(simulation_info=self.get_simulation_info(constants),
+                      driver_info=self.get_driver_info())
+        data = json.dumps(header, cls=_Encoder, check_circular=False)
+        self._write(MAGIC + pack('<LL', VERSION, len(data)) + data)
+        self.out.flush()
+
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+        """ Buffer the given run data, writing a chunk if enough is pending. """
+        if not self.out:
+            return
+
+        info = self.get_case_info(driver, inputs, outputs, exc,
+                                  case_uuid, parent_uuid)
+        info['_seq'] = self._seq
+        self._seq += 1
+        self._pending.setdefault(info['_driver_id'], []).append(info)
+        self._npending += 1
+        if self._npending >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """ Write all buffered cases. """
+        if not self.out:
+            return
+
+        for driver_id in sorted(self._pending):
+            self._write_chunk(driver_id, self._pending[driver_id])
+        self._pending = {}
+        self._npending = 0
+        self.out.flush()
+
+    def _write_chunk(self, driver_id, cases):
+        """ Write `cases` recorded by `driver_id` as a chunk of columns. """
+        names = set()
+        for info in cases:
+            names.update(info['data'])
+
+        columns = []
+        objects = {}
+        blocks = []
+        offset = 0
+        for name in sorted(names):
+            values = [info['data'].get(name) for info in cases]
+            layout = None if None in values else _column_layout(values)
+            if layout is None:
+                objects[name] = values
+                continue
+
+            dtype, shape = layout
+            block = numpy.array(values, dtype=dtype).tostring()
+            columns.append(dict(name=name, dtype=dtype.str,
+                                shape=list(shape), offset=offset))
+            pad = _padding(len(block))
+            blocks.append(block + '\0'*pad)
+            offset += len(block) + pad
+
+        meta = dict(driver_id=driver_id,
+                    count=len(cases),
+                    seq=[info['_seq'] for info in cases],
+                    ids=[info['_id'] for info in cases],
+                    parent_ids=[info['_parent_id'] for info in cases],
+                    error_status=[info['error_status'] for info in cases],
+                    error_message=[info['error_message'] for info in cases],
+                    timestamp=[info['timestamp'] for info in cases],
+                    columns=columns,
+                    objects=objects)
+        meta = json.dumps(meta, cls=_Encoder, check_circular=False)
+        pad = _padding(self._pos + CHUNK_HEADER_SIZE + len(meta))
+
+        self._write(pack(CHUNK_HEADER, CHUNK_MAGIC, len(meta), offset))
+        self._write(meta + '\0'*pad)
+        for block in blocks:
+            self._write(block)
+
+    def _write(self, data):
+        """ Write `data`, tracking file position for column alignment. """
+        self.out.write(data)
+        self._pos += len(data)
+
+    def close(self):
+        """
+        Writes any buffered cases and closes `out`. Note that a closed
+        recorder will do nothing in :meth:`record`.
+        """
+        if self.out is not None:
+            self.flush()
+            if not isinstance(self.out,
+                              (StringIO.StringIO, cStringIO.OutputType)):
+                # Closing a StringIO deletes its contents.
+                self.out.close()
+            self.out = None
+
+        self._cases = None
+
+    def get_iterator(self):
+        """ Just returns None. """
+        return None
@@ -10,10 +10,13 @@ except ImportError:
     import logging
     logging.error('No sqlite3 support for DBCaseIterator or DBCaseRecorder')
 
+import struct
 import time
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
 from optparse import OptionParser
 
+from numpy import ndarray, dtype, empty, frombuffer
+
 from traits.trait_handlers import TraitListObject, TraitDictObject
 
 # pylint: disable=E0611,F0401
@@ -26,6 +29,46 @@ from openmdao.lib.casehandlers.util import driver_map
 _casetable_attrs = set(['id', 'uuid', 'parent', 'msg', 'model_id', 'timeEnter'])
 _vartable_attrs = set(['var_id', 'name', 'case_id', 'sense', 'value'])
 
+# Numeric arrays are stored as this prefix, a header giving the dtype and
+# shape, and then the raw data. Pickles never start with this prefix.
+_ARRAY_MAGIC = '\x93NDARRAY'
+_ARRAY_KINDS = 'biufc'
+
+
+def _to_blob(value):
+    """Return `value` in the form stored in the value column of the
+    casevars table. Numeric arrays are stored raw, anything else other than
+    floats, ints and strings is pickled.
+    """
+    if isinstance(value, ndarray) and value.dtype.kind in _ARRAY_KINDS:
+        dstr = value.dtype.str
+        header = struct.pack('<B%dsB%dq' % (len(dstr), value.ndim),
+                             len(dstr), dstr, value.ndim, *value.shape)
+        return sqlite3.Binary(_ARRAY_MAGIC + header + value.tostring())
+    if isinstance(value, TraitDictObject):
+        value = dict(value)
+    elif isinstance(value, TraitListObject):
+        value = list(value)
+    return sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL))
+
+
+def _from_blob(value):
+    """Return the object stored in the given blob by :func:`_to_blob`."""
+    value = str(value)
+    if value.startswith(_ARRAY_MAGIC):
+        start = len(_ARRAY_MAGIC)
+        dlen = ord(value[start])
+        dstr = value[start+1:start+1+dlen]
+        start += 1 + dlen
+        ndim = ord(value[start])
+        start += 1
+        shape = struct.unpack('<%dq' % ndim, value[start:start+8*ndim])
+        start += 8*ndim
+        if start == len(value):
+            return empty(shape, dtype(dstr))
+        return frombuffer(value, dtype(dstr), offset=start).reshape(shape).copy()
+    return loads(value)
+
 def _query_split(query):
     """Return a tuple of lhs, relation, rhs after splitting on
     a list of allowed operators.
@@ -110,7 +153,7 @@ class DBCaseIterator(object):
                     value = float('NaN')
                 else:
                     try:
-                        value = loads(str(value))
+                        value = _from_blob(value)
                     except UnpicklingError as err:
                         print 'value', type(value), repr(value)
                         raise UnpicklingError("can't unpickle value '%s' for"
@@ -127,22 +170,40 @@ class DBCaseIterator(object):
 
 
 class DBCaseRecorder(object):
-    """Records Cases to a relational DB (sqlite). Values other than floats,
-    ints or strings are pickled and are opaque to SQL queries.
+    """Records Cases to a relational DB (sqlite). Numeric arrays are stored
+    as raw data, and values other than floats, ints or strings are pickled.
+    Both are opaque to SQL queries.
+
+    By default every case is committed as soon as it is recorded. For large
+    runs, set `commit_every` to commit only every N cases and/or
+    `commit_interval` to commit when that many seconds have passed since
+    the last commit. Variable rows are written with a single ``executemany``
+    per commit. Uncommitted cases are written by :meth:`flush`,
+    :meth:`close` and :meth:`get_iterator`.
     """
 
     implements(ICaseRecorder)
 
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 commit_every=1, commit_interval=None):
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
         self._cfg_map = {}
+        self._pending = []
+        self._uncommitted = 0
+        self._last_commit = time.time()
 
         if append:
             exstr = 'if not exists'
         else:
             exstr = ''
 
+        if dbfile != ':memory:':
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+
         self._connection.execute("""
         create table %s cases(
          id INTEGER PRIMARY KEY,
@@ -162,6 +223,11 @@ class DBCaseRecorder(object):
          value BLOB
          )""" % exstr)
 
+        self._connection.execute("""
+        create index if not exists casevars_case_id on casevars(case_id)""")
+        self._connection.execute("""
+        create index if not exists casevars_name on casevars(name)""")
+
     @property
     def dbfile(self):
         """The name of the database. This can be a filename or :memory: for
@@ -201,50 +267,49 @@ class DBCaseRecorder(object):
                     (None, case_uuid, parent_uuid, msg, self.model_id))
 
         case_id = cur.lastrowid
-        # insert the inputs and outputs into the vars table.  Pickle them if
-        # they're not one of the built-in types int, float, or str.
-
-        v = (None, 'timestamp', case_id, None, time.time())
-        cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                    v)
+        # insert the inputs and outputs into the vars table.  Store them as
+        # blobs if they're not one of the built-in types int, float, or str.
+        rows = self._pending
+        rows.append((None, 'timestamp', case_id, None, time.time()))
 
         in_names, out_names = self._cfg_map[driver]
 
-        for name, value in zip(in_names, inputs):
-            if isinstance(value, (float, int, str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'i',
-                     sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                        v)
-        for name, value in zip(out_names, outputs):
-            if isinstance(value, (float, int, str)):
-                v = (None, name, case_id, 'o', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'o',
-                     sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                        v)
+        for sense, names, values in (('i', in_names, inputs),
+                                     ('o', out_names, outputs)):
+            for name, value in zip(names, values):
+                if not isinstance(value, (float, int, str)):
+                    value = _to_blob(value)
+                rows.append((None, name, case_id, sense, value))
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every or \
+           (self.commit_interval is not None and
+            time.time() - self._last_commit >= self.commit_interval):
+            self.flush()
+
+    def flush(self):
+        """Write any buffered variable rows and commit."""
+        if self._connection is None:
+            return
+        if self._pending:
+            self._connection.executemany("""insert into
+                casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)""",
+                                         self._pending)
+            self._pending = []
         self._connection.commit()
+        self._uncommitted = 0
+        self._last_commit = time.time()
 
     def close(self):
-        """Commit and close DB connection if not using ``:memory:``."""
+        """Flush, commit and close DB connection if not using ``:memory:``."""
+        self.flush()
         if self._connection is not None and self._dbfile != ':memory:':
-            self._connection.commit()
             self._connection.close()
             self._connection = None
 
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        self.flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
 
@@ -334,7 +399,7 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
         for vname, value in varcur:
             if not isinstance(value, (float, int, str)):
                 try:
-                    value = loads(str(value))
+                    value = _from_blob(value)
                 except UnpicklingError as err:
                     raise UnpicklingError("can't unpickle value '%s' from"
                                           " database: %s" % (vname, str(err)))
@@ -3,15 +3,20 @@ import json
 import logging
 import cPickle
 import StringIO
+from copy import deepcopy
 from struct import pack, unpack
 from weakref import ref
 
+import numpy
 from numpy import ndarray
 
 from openmdao.main.api import Assembly, VariableTree
 from openmdao.lib.casehandlers.pymongo_bson.json_util import loads, dumps
 from openmdao.lib.casehandlers.pymongo_bson.binary import Binary
 from openmdao.lib.casehandlers.jsoncase import _Encoder
+from openmdao.lib.casehandlers.binarycase import MAGIC, CHUNK_MAGIC, \
+                                                CHUNK_HEADER, \
+                                                CHUNK_HEADER_SIZE, _padding
 
 _GLOBAL_DICT = dict(__builtins__=None)
 
@@ -19,9 +24,9 @@ _GLOBAL_DICT = dict(__builtins__=None)
 class CaseDataset(object):
     """
     Reads case data from `filename` and allows queries on it.
-    `format` should be ``bson`` or ``json``, indicating a
-    :class:`BSONCaseRecorder` file or :class:`JSONCaseRecorder` file
-    respectively.
+    `format` should be ``bson``, ``json`` or ``binary``, indicating a
+    :class:`BSONCaseRecorder` file, :class:`JSONCaseRecorder` file or
+    :class:`BinaryCaseRecorder` file respectively.
 
     To get all case data::
 
@@ -36,6 +41,12 @@ class CaseDataset(object):
 
         cases = cds.data.vars(['top.sub.comp.x, top.sub.comp.y']).fetch()
 
+    For a ``binary`` file, fetching numeric variables of a single driver
+    by variable returns arrays which are views of a memory map of the file::
+
+        cds = CaseDataset('recorded.bin', 'binary')
+        x = cds.data.driver(driver_name).vars('top.sub.comp.x').by_variable().fetch()[0]
+
     To get a case and all its child cases::
 
         cases = cds.data.parent_case(parent_id).fetch()
@@ -66,8 +77,11 @@ class CaseDataset(object):
             self._reader = _BSONReader(filename)
         elif format == 'json':
             self._reader = _JSONReader(filename)
+        elif format == 'binary':
+            self._reader = _BinaryReader(filename)
         else:
-            raise ValueError("dataset format must be 'json' or 'bson'")
+            raise ValueError("dataset format must be 'json', 'bson' or"
+                             " 'binary'")
 
         self._query_id = self._parent_id = self._driver_id = None
         self._case_ids = self._drivers = None
@@ -118,6 +132,11 @@ class CaseDataset(object):
             # Returning single row, not list of rows.
             return names
 
+        if query.transpose and isinstance(self._reader, _BinaryReader):
+            columns = self._fetch_columns(names, metadata_names)
+            if columns is not None:
+                return columns
+
         nan = float('NaN')
         rows = ListResult()
         state = {}  # Retains last seen values.
@@ -185,6 +204,35 @@ class CaseDataset(object):
         rows.cds = self
         return rows
 
+    def _fetch_columns(self, names, metadata_names):
+        """
+        Return `names` as memory-mapped columns if the query selects all
+        cases of a single driver which recorded every name as a fixed-width
+        column, else None.
+        """
+        if self._case_ids is not None:
+            return None
+
+        driver_id = self._driver_id
+        if driver_id is None:
+            if len(self._drivers) != 1:
+                return None  # Values may be carried over between drivers.
+            driver_id = self._drivers.keys()[0]
+
+        columns = DictList(names)
+        for name in names:
+            if name in metadata_names:
+                column = self._reader.case_metadata(driver_id, name)
+            else:
+                column = self._reader.column(driver_id, name)
+            if column is None or len(column) == 0:
+                return None
+            columns.append(column)
+
+        # Keep CDS as attribute for post-processing
+        columns.cds = self
+        return columns
+
     def _write(self, query, out, format):
         """ Write data based on `query` to `out`. """
         if query.local_only:
@@ -690,6 +738,141 @@ class _BSONReader(_Reader):
         return bson.loads(self._inp.read(reclen))
 
 
+class _BinaryReader(object):
+    """
+    Reads a :class:`BinaryCaseRecorder` file. The file is memory-mapped and
+    only the header and chunk metadata are parsed up front; column data is
+    accessed in place.
+    """
+
+    _METADATA_KEYS = {'_id': 'ids', '_parent_id': 'parent_ids',
+                      'error_status': 'error_status',
+                      'error_message': 'error_message',
+                      'timestamp': 'timestamp'}
+
+    def __init__(self, filename):
+        if isinstance(filename, StringIO.StringIO):
+            self._map = numpy.frombuffer(filename.getvalue(),
+                                         dtype=numpy.uint8)
+        else:
+            self._map = numpy.memmap(filename, dtype=numpy.uint8, mode='r')
+
+        raw = self._map
+        if raw[:8].tostring() != MAGIC:
+            raise ValueError('%s is not a binary case file' % filename)
+        reclen = unpack('<L', raw[12:16].tostring())[0]
+        pos = 16 + reclen
+        header = json.loads(raw[16:pos].tostring(), object_hook=object_hook)
+        self._simulation_info = header['simulation_info']
+        self._driver_info = header['driver_info']
+
+        # Index chunks, ignoring a partially written last chunk.
+        self._chunks = []
+        size = len(raw)
+        while pos + CHUNK_HEADER_SIZE <= size:
+            magic, meta_len, data_len = \
+                unpack(CHUNK_HEADER,
+                       raw[pos:pos+CHUNK_HEADER_SIZE].tostring())
+            if magic != CHUNK_MAGIC:
+                break
+            start = pos + CHUNK_HEADER_SIZE
+            meta = raw[start:start+meta_len].tostring()
+            start += meta_len
+            start += _padding(start)
+            if start + data_len > size:
+                break
+            meta = json.loads(meta, object_hook=object_hook)
+            meta['start'] = start
+            self._chunks.append(meta)
+            pos = start + data_len
+
+    @property
+    def simulation_info(self):
+        """ Simulation info dictionary. """
+        return self._simulation_info
+
+    def drivers(self):
+        """ Return list of 'driver_info' dictionaries. """
+        return deepcopy(self._driver_info)
+
+    def cases(self):
+        """ Return sequence of 'iteration_case' dictionaries. """
+        order = []
+        for i, chunk in enumerate(self._chunks):
+            order.extend([(seq, i, row)
+                          for row, seq in enumerate(chunk['seq'])])
+        order.sort()
+
+        columns = {}
+        for seq, i, row in order:
+            chunk = self._chunks[i]
+            if i not in columns:
+                columns[i] = [(col['name'], self._column(chunk, col))
+                              for col in chunk['columns']]
+            data = {}
+            for name, column in columns[i]:
+                if column.ndim == 1:
+                    data[name] = column[row].item()
+                else:
+                    data[name] = numpy.array(column[row])
+            for name, values in chunk['objects'].items():
+                data[name] = values[row]
+
+            yield dict(_id=chunk['ids'][row],
+                       _parent_id=chunk['parent_ids'][row],
+                       _driver_id=chunk['driver_id'],
+                       error_status=chunk['error_status'][row],
+                       error_message=chunk['error_message'][row],
+                       timestamp=chunk['timestamp'][row],
+                       data=data)
+
+    def column(self, driver_id, name):
+        """
+        Return all values of `name` recorded by `driver_id` as an array, or
+        None if `name` isn't stored as a fixed-width column.  The array is a
+        view of the file if the cases are in a single chunk.
+        """
+        parts = []
+        for chunk in self._chunks:
+            if chunk['driver_id'] != driver_id:
+                continue
+            for col in chunk['columns']:
+                if col['name'] == name:
+                    parts.append(self._column(chunk, col))
+                    break
+            else:
+                return None
+
+        if not parts:
+            return None
+        elif len(parts) == 1:
+            return parts[0]
+        try:
+            return numpy.concatenate(parts)
+        except ValueError:
+            return None  # Shape changed between chunks.
+
+    def case_metadata(self, driver_id, name):
+        """ Return list of case metadata `name` recorded by `driver_id`. """
+        values = []
+        for chunk in self._chunks:
+            if chunk['driver_id'] == driver_id:
+                if name == '_driver_id':
+                    values.extend([driver_id] * chunk['count'])
+                else:
+                    values.extend(chunk[self._METADATA_KEYS[name]])
+        return values
+
+    def _column(self, chunk, col):
+        """ Return view of column `col` in `chunk`. """
+        dtype = numpy.dtype(str(col['dtype']))
+        shape = tuple(col['shape'])
+        count = chunk['count']
+        start = chunk['start'] + col['offset']
+        nbytes = count * dtype.itemsize * int(numpy.prod(shape))
+        return self._map[start:start+nbytes].view(dtype).reshape((count,)+shape)
+
+
 class _JSONWriter(object):
     """ Writes case data as JSON. """
 
@@ -98,12 +98,16 @@ Constants:
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
+   driver.gradient_options.fd_sparsity: none
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
+   driver.gradient_options.gmres_mode: iterative
    driver.gradient_options.iprint: 0
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
+   driver.gradient_options.preconditioner: none
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
@@ -135,12 +139,16 @@ Constants:
    nested.doublenest.driver.gradient_options.derivative_direction: auto
    nested.doublenest.driver.gradient_options.directional_fd: False
    nested.doublenest.driver.gradient_options.fd_form: forward
+   nested.doublenest.driver.gradient_options.fd_processes: 1
+   nested.doublenest.driver.gradient_options.fd_sparsity: none
    nested.doublenest.driver.gradient_options.fd_step: 1e-06
    nested.doublenest.driver.gradient_options.fd_step_type: absolute
    nested.doublenest.driver.gradient_options.force_fd: False
+   nested.doublenest.driver.gradient_options.gmres_mode: iterative
    nested.doublenest.driver.gradient_options.iprint: 0
    nested.doublenest.driver.gradient_options.lin_solver: scipy_gmres
    nested.doublenest.driver.gradient_options.maxiter: 100
+   nested.doublenest.driver.gradient_options.preconditioner: none
    nested.doublenest.driver.gradient_options.rtol: 1e-09
    nested.doublenest.force_fd: False
    nested.doublenest.missing_deriv_policy: assume_zero
@@ -153,12 +161,16 @@ Constants:
    nested.driver.gradient_options.derivative_direction: auto
    nested.driver.gradient_options.directional_fd: False
    nested.driver.gradient_options.fd_form: forward
+   nested.driver.gradient_options.fd_processes: 1
+   nested.driver.gradient_options.fd_sparsity: none
    nested.driver.gradient_options.fd_step: 1e-06
    nested.driver.gradient_options.fd_step_type: absolute
    nested.driver.gradient_options.force_fd: False
+   nested.driver.gradient_options.gmres_mode: iterative
    nested.driver.gradient_options.iprint: 0
    nested.driver.gradient_options.lin_solver: scipy_gmres
    nested.driver.gradient_options.maxiter: 100
+   nested.driver.gradient_options.preconditioner: none
    nested.driver.gradient_options.rtol: 1e-09
    nested.force_fd: False
    nested.missing_deriv_policy: assume_zero
@@ -324,12 +336,16 @@ Constants:
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
+   driver.gradient_options.fd_sparsity: none
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
+   driver.gradient_options.gmres_mode: iterative
    driver.gradient_options.iprint: 0
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
+   driver.gradient_options.preconditioner: none
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
@@ -388,12 +404,16 @@ Constants:
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
+   driver.gradient_options.fd_sparsity: none
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
+   driver.gradient_options.gmres_mode: iterative
    driver.gradient_options.iprint: 0
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
+   driver.gradient_options.preconditioner: none
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
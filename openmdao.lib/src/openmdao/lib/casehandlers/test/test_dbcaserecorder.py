@@ -8,6 +8,9 @@ import StringIO
 import os
 import logging
 import shutil
+import sqlite3
+
+import numpy
 
 from openmdao.main.api import Assembly, Case, set_as_top
 from openmdao.test.execcomp import ExecComp
@@ -212,6 +215,58 @@ class DBCaseRecorderTestCase(unittest.TestCase):
             self.assertEqual(case['unicode'], u'Unicode String')
             self.assertEqual(case['list'], ['Hello', 'world'])
 
+    def test_arrays(self):
+        recorder = DBCaseRecorder()
+        recorder.register(self, ['a1', 'a2', 'a3', 'a4'], [])
+        inputs = [numpy.arange(6.).reshape((2, 3)),
+                  numpy.array([1, 2, 3], dtype=numpy.int32),
+                  numpy.zeros((0, 2)),
+                  numpy.array(['a', 'b'], dtype=object)]
+        recorder.record(self, inputs, [], None, '', '')
+
+        value = recorder._connection.execute(
+                    "SELECT value FROM casevars WHERE name='a1'").fetchone()[0]
+        self.assertTrue(str(value).startswith('\x93NDARRAY'))
+
+        for case in recorder.get_iterator():
+            self.assertTrue((case['a1'] == inputs[0]).all())
+            self.assertEqual(case['a1'].shape, (2, 3))
+            self.assertEqual(case['a2'].dtype, numpy.int32)
+            self.assertEqual(list(case['a2']), [1, 2, 3])
+            self.assertEqual(case['a3'].shape, (0, 2))
+            self.assertEqual(list(case['a4']), ['a', 'b'])
+
+    def test_buffered(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, commit_every=4)
+            recorder.register(self, ['comp1.x'], ['comp1.z'])
+            for i in range(10):
+                recorder.record(self, [float(i)], [i*2.], None, '', '')
+
+            # only the first 8 cases have been committed
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.z'])
+            self.assertEqual(varinfo['comp1.x'], range(8))
+
+            recorder.close()
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.z'])
+            self.assertEqual(varinfo['comp1.x'], range(10))
+            self.assertEqual(varinfo['comp1.z'], range(0, 20, 2))
+
+            # indexes for case_db_to_dict
+            connection = sqlite3.connect(dfile)
+            names = [row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'")]
+            connection.close()
+            self.assertTrue('casevars_case_id' in names)
+            self.assertTrue('casevars_name' in names)
+        finally:
+            try:
+                shutil.rmtree(tmpdir, onerror=onerror)
+            except OSError:
+                logging.error("problem removing directory %s", tmpdir)
+
     def test_close(self):
         # :memory: can be used after close.
         recorder = DBCaseRecorder()
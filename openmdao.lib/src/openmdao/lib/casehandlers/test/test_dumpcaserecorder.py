@@ -85,12 +85,16 @@ Constants:
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
+   driver.gradient_options.fd_sparsity: none
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
+   driver.gradient_options.gmres_mode: iterative
    driver.gradient_options.iprint: 0
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
+   driver.gradient_options.preconditioner: none
    driver.gradient_options.rtol: 1e-09
    driver.icndir: 0.0
    driver.iprint: 0
@@ -208,12 +212,16 @@ Constants:
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
+   driver.gradient_options.fd_sparsity: none
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
+   driver.gradient_options.gmres_mode: iterative
    driver.gradient_options.iprint: 0
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
+   driver.gradient_options.preconditioner: none
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
@@ -15,7 +15,8 @@ import numpy as np
 from openmdao.main.api import Assembly, Component, VariableTree, set_as_top
 from openmdao.main.datatypes.api import Array, Float, VarTree
 from openmdao.lib.casehandlers.api import CaseDataset, \
-                                          JSONCaseRecorder, BSONCaseRecorder
+                                          JSONCaseRecorder, BSONCaseRecorder, \
+                                          BinaryCaseRecorder
 from openmdao.lib.drivers.api import FixedPointIterator, SLSQPdriver
 from openmdao.lib.optproblems import sellar
 from openmdao.util.testutil import assert_rel_error
@@ -315,6 +316,54 @@ class TestCase(unittest.TestCase):
         cases = CaseDataset(path, 'json').data.fetch()
         self.assertEqual(len(cases), 7)
 
+    def test_binary(self):
+        # Compare _BinaryReader with _JSONReader for the same run.
+        top = set_as_top(SellarMDF())
+        top.recorders = [JSONCaseRecorder('cases.json'),
+                         BinaryCaseRecorder('cases.bin', chunk_size=50)]
+        top.run()
+        for recorder in top.recorders:
+            recorder.close()
+
+        json_cds = CaseDataset('cases.json', 'json')
+        bin_cds = CaseDataset('cases.bin', 'binary')
+        self.assertEqual(bin_cds.data.var_names().fetch(),
+                         json_cds.data.var_names().fetch())
+
+        json_cases = json_cds.data.fetch()
+        bin_cases = bin_cds.data.fetch()
+        self.assertEqual(len(bin_cases), len(json_cases))
+        for json_case, bin_case in zip(json_cases, bin_cases):
+            for name in ('_id', '_parent_id', 'half.z2a', 'sub.dis1.itername',
+                         'sub.dis1.y1', 'sub.dis2.exec_count'):
+                if isinstance(json_case[name], float) and \
+                   isnan(json_case[name]):
+                    self.assertTrue(isnan(bin_case[name]))
+                else:
+                    self.assertEqual(bin_case[name], json_case[name])
+
+        # By-variable fetch of numeric columns returns arrays.
+        names = ['sub.dis1.y1', 'sub.dis1.y2', '_id']
+        json_vars = json_cds.data.driver('sub.driver').vars(names) \
+                                 .by_variable().fetch()
+        bin_vars = bin_cds.data.driver('sub.driver').vars(names) \
+                               .by_variable().fetch()
+        for name in names[:2]:
+            self.assertTrue(isinstance(bin_vars[name], np.ndarray))
+            np.testing.assert_array_equal(bin_vars[name], json_vars[name])
+        self.assertEqual(bin_vars['_id'], json_vars['_id'])
+
+        # Columns in a single chunk are views of the file.
+        top = set_as_top(SellarMDF())
+        top.recorders = [BinaryCaseRecorder('single.bin')]
+        top.run()
+        top.recorders[0].close()
+        cds = CaseDataset('single.bin', 'binary')
+        y1 = cds.data.driver('sub.driver').vars('sub.dis1.y1') \
+                                          .by_variable().fetch()[0]
+        self.assertTrue(isinstance(y1, np.memmap))
+        self.assertFalse(y1.flags.owndata)
+
     def test_restore(self):
         # Restore from case, run, verify outputs match expected.
         top = set_as_top(SellarMDF())
@@ -19,6 +19,7 @@ from openmdao.main.rbac import AccessController, RoleError, rbac, remote_access
 from openmdao.main.resource import ResourceAllocationManager as RAM
 
 from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile
+from openmdao.util.resultcache import ResultCache
 from openmdao.util import shellproc
 
 from distutils.spawn import find_executable
@@ -44,11 +45,21 @@ class ExternalCode(Component):
                      desc='Resources required to run this component.')
     poll_delay = Float(0., low=0., units='s', iotype='in',
                        desc='Delay between polling for command completion.'
-                            ' A value of zero will use an internally computed'
-                            ' default.')
+                            ' A value of zero waits for the command to exit'
+                            ' without polling.')
     timeout = Float(0., low=0., iotype='in', units='s',
                     desc='Maximum time to wait for command completion.'
                          ' A value of zero implies an infinite wait.')
+    result_cache = Str('', desc='Directory of an on-disk cache of results.'
+                       ' If the command, environment, stdin and input files'
+                       ' are identical to an earlier successful run, its'
+                       ' output files are restored instead of running the'
+                       ' command. Use an absolute path to share the cache'
+                       ' between processes. Empty disables the cache.')
+    result_cache_size = Float(1024., low=0.,
+                              desc='Maximum size of the result cache in'
+                                   ' megabytes. Least recently used results'
+                                   ' are removed first. Zero means no limit.')
     timed_out = Bool(False, iotype='out', desc='True if the command timed-out.')
     return_code = Int(0, iotype='out', desc='Return code from the command.')
 
@@ -63,6 +74,10 @@ class ExternalCode(Component):
         self._process = None
         self._server = None
 
+        # result cache statistics (see result_cache)
+        self.result_cache_hits = 0
+        self.result_cache_misses = 0
+
     # This gets used by remote server.
     def get_access_controller(self):  #pragma no cover
         """ Return :class:`AccessController` for this object. """
@@ -95,6 +110,10 @@ class ExternalCode(Component):
         is allocated and the command is run on that server.
         Otherwise the command is run locally.
 
+        If `result_cache` is set and an earlier successful run had the same
+        command, environment, stdin and input files, its output files are
+        restored and the command isn't run at all.
+
         When running remotely, the following resources are set:
 
         ================ =====================================
@@ -144,13 +163,30 @@ class ExternalCode(Component):
 
         self.check_files(inputs=True)
 
+        cache = key = None
+        if self.result_cache:
+            cache = ResultCache(self.result_cache,
+                                int(self.result_cache_size * (1 << 20)))
+            key = self._result_cache_key()
+
         return_code = None
         error_msg = ''
         try:
-            if self.resources:
-                return_code, error_msg = self._execute_remote()
+            if key is not None and cache.restore(key) is not None:
+                self.result_cache_hits += 1
+                self._logger.debug('restored results from %s', cache.directory)
+                return_code = 0
             else:
-                return_code, error_msg = self._execute_local()
+                if key is not None:
+                    self.result_cache_misses += 1
+
+                if self.resources:
+                    return_code, error_msg = self._execute_remote()
+                else:
+                    return_code, error_msg = self._execute_local()
+
+                if key is not None and return_code == 0:
+                    self._store_result(cache, key)
 
             if return_code is None:
                 if self._stop:
@@ -179,6 +215,57 @@ class ExternalCode(Component):
         finally:
             self.return_code = -999999 if return_code is None else return_code
 
+    def _result_cache_key(self):
+        """
+        Return the result cache key for the current command, environment,
+        stdin and input files.
+        """
+        items = list(self.command)
+        for name, value in sorted(self.env_vars.items()):
+            items.append('%s=%s' % (name, value))
+
+        # Include the executable so that a rebuilt code isn't hidden.
+        exe = find_executable(self.command[0])
+        if exe:
+            info = os.stat(exe)
+            items.append('%s:%d:%r' % (exe, info.st_size, info.st_mtime))
+
+        paths = []
+        for metadata in self.external_files:
+            if metadata.get('input', False):
+                paths.extend(sorted(glob.glob(metadata.path)))
+        for pathname, obj in self.items(iotype='in', recurse=True):
+            if isinstance(obj, FileRef):
+                path = self.get_metadata(pathname, 'local_path')
+                if path:
+                    paths.append(path)
+        if self.stdin and self.stdin != self.DEV_NULL:
+            paths.append(self.stdin)
+
+        items.extend([str(self.stdout), str(self.stderr)])
+        return ResultCache.make_key(items, paths)
+
+    def _store_result(self, cache, key):
+        """ Save the output files of a successful run in `cache`. """
+        paths = []
+        for metadata in self.external_files:
+            if metadata.get('output', False):
+                paths.extend(sorted(glob.glob(metadata.path)))
+        for pathname, obj in self.items(iotype='out', recurse=True):
+            if isinstance(obj, FileRef) and os.path.exists(obj.path):
+                paths.append(obj.path)
+        for name in (self.stdout, self.stderr):
+            if isinstance(name, basestring) and \
+               name not in (self.DEV_NULL, self.STDOUT) and \
+               os.path.exists(name) and name not in paths:
+                paths.append(name)
+
+        try:
+            cache.store(key, 0, paths)
+        except (IOError, OSError) as exc:
+            self._logger.warning("couldn't save results in %s: %s",
+                                 cache.directory, exc)
+
     def check_files(self, inputs):
         """
         Check that all 'specific' input or output external files exist.
@@ -6,6 +6,8 @@
 
 from copy import deepcopy
 
+from numpy import array
+
 from openmdao.main.api import Component
 from openmdao.main.datatypes.api import List, Bool, Dict, Float, Slot, Str, \
                                         VarTree
@@ -133,58 +135,95 @@ class MetaModel(Component):
 
         # Train first
         if self._train:
+            self._train_surrogates()
 
-            input_data = self._param_data
-            if self.warm_restart is False:
-                input_data = []
-                base = 0
-            else:
-                base = len(input_data)
+        # Now Predict for current inputs
+
+        inputs = []
+        for name in self._surrogate_input_names:
+            val = self.get(name)
+            inputs.append(val)
 
-            for name in self._surrogate_input_names:
-                train_name = "params.%s" % name
-                val = self.get(train_name)
-                num_sample = len(val)
+        for name in self._surrogate_output_names:
+            surrogate = self._get_surrogate(name)
+            if surrogate is not None:
+                setattr(self, name, surrogate.predict(inputs))
 
-                for j in xrange(base, base + num_sample):
+    def predict_batch(self, X):
+        """Predict outputs for many points at once, training first if
+        needed. `X` is an array of shape (n_points, n_params) with params
+        in the order given to the constructor.
 
-                    if j > len(input_data) - 1:
-                        input_data.append([])
-                    input_data[j].append(val[j-base])
+        Returns a dict mapping each output name to an array of n_points
+        predicted values. Uncertain predictions are reduced to their
+        expected value. Surrogates that provide ``predict_batch`` evaluate
+        all points in one call; others are called once per point.
+        """
+        if self._train:
+            self._train_surrogates()
 
-            # Surrogate models take an (m, n) list of lists
-            # m = number of training samples
-            # n = number of inputs
-            #
-            # TODO - Why not numpy array instead?
+        X = array(X, dtype=float).reshape(-1, len(self._surrogate_input_names))
 
-            for name in self._surrogate_output_names:
+        predictions = {}
+        for name in self._surrogate_output_names:
+            surrogate = self._get_surrogate(name)
+            if surrogate is None:
+                continue
+            if hasattr(surrogate, 'predict_batch'):
+                values = surrogate.predict_batch(X)[0]
+            else:
+                values = []
+                for inputs in X:
+                    val = surrogate.predict(list(inputs))
+                    if has_interface(val, IUncertainVariable):
+                        val = val.getvalue()
+                    values.append(val)
+            predictions[name] = array(values)
+
+        return predictions
+
+    def _train_surrogates(self):
+        """Train each surrogate on the current training data."""
+
+        input_data = self._param_data
+        if self.warm_restart is False:
+            input_data = []
+            base = 0
+        else:
+            base = len(input_data)
 
-                train_name = "responses.%s" % name
-                output_data = self._response_data[name]
+        for name in self._surrogate_input_names:
+            train_name = "params.%s" % name
+            val = self.get(train_name)
+            num_sample = len(val)
 
-                if self.warm_restart is False:
-                    output_data = []
+            for j in xrange(base, base + num_sample):
 
-                output_data.extend(self.get(train_name))
-                surrogate = self._get_surrogate(name)
+                if j > len(input_data) - 1:
+                    input_data.append([])
+                input_data[j].append(val[j-base])
 
-                if surrogate is not None:
-                    surrogate.train(input_data, output_data)
+        # Surrogate models take an (m, n) list of lists
+        # m = number of training samples
+        # n = number of inputs
+        #
+        # TODO - Why not numpy array instead?
 
-            self._train = False
+        for name in self._surrogate_output_names:
 
-        # Now Predict for current inputs
+            train_name = "responses.%s" % name
+            output_data = self._response_data[name]
 
-        inputs = []
-        for name in self._surrogate_input_names:
-            val = self.get(name)
-            inputs.append(val)
+            if self.warm_restart is False:
+                output_data = []
 
-        for name in self._surrogate_output_names:
+            output_data.extend(self.get(train_name))
             surrogate = self._get_surrogate(name)
+
             if surrogate is not None:
-                setattr(self, name, surrogate.predict(inputs))
+                surrogate.train(input_data, output_data)
+
+        self._train = False
 
     def _get_surrogate(self, name):
         """Return the designated surrogate for the given output."""
@@ -190,6 +190,38 @@ class TestCase(unittest.TestCase):
                       globals(), locals(), RuntimeError,
                       ": missing input file 'missing-input'")
 
+    def test_result_cache(self):
+        logging.debug('')
+        logging.debug('test_result_cache')
+
+        sleeper = set_as_top(Sleeper())
+        sleeper.result_cache = os.path.join(self.tempdir, 'cache')
+        sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+        sleeper.stderr = None
+
+        sleeper.run()
+        self.assertEqual(sleeper.result_cache_misses, 1)
+        self.assertEqual(sleeper.result_cache_hits, 0)
+
+        # Same inputs, so the output is restored without running.
+        os.remove('output')
+        start = time.time()
+        sleeper.run()
+        self.assertTrue(time.time() - start < sleeper.delay)
+        self.assertEqual(sleeper.result_cache_hits, 1)
+        self.assertEqual(sleeper.return_code, 0)
+        with sleeper.outfile.open() as inp:
+            self.assertEqual(inp.read(), INP_DATA)
+
+        # New input data must run the command.
+        with open(INP_FILE, 'w') as out:
+            out.write('Something else')
+        sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+        sleeper.run()
+        self.assertEqual(sleeper.result_cache_misses, 2)
+        with sleeper.outfile.open() as inp:
+            self.assertEqual(inp.read(), 'Something else')
+
     def test_remote(self):
         logging.debug('')
         logging.debug('test_remote')
@@ -48,6 +48,33 @@ class MetaModelTestCase(unittest.TestCase):
         model.meta.run()
         assert_rel_error(self, model.meta.y1, 1.4609, .001)
 
+    def test_predict_batch(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1', 'y2')))
+        model.driver.workflow.add('meta')
+
+        model.meta.params.x1 = [1.0, 2.0, 3.0]
+        model.meta.params.x2 = [1.0, 3.0, 4.0]
+        model.meta.responses.y1 = [3.0, 2.0, 1.0]
+        model.meta.responses.y2 = [1.0, 4.0, 7.0]
+
+        model.meta.surrogates['y1'] = KrigingSurrogate()
+        model.meta.surrogates['y2'] = ResponseSurface()
+
+        points = [[2.0, 3.0], [2.5, 3.5], [1.5, 2.0]]
+        batch = model.meta.predict_batch(points)
+        self.assertEqual(len(batch['y1']), 3)
+        self.assertEqual(len(batch['y2']), 3)
+
+        for i, (x1, x2) in enumerate(points):
+            model.meta.x1 = x1
+            model.meta.x2 = x2
+            model.meta.run()
+            assert_rel_error(self, batch['y1'][i], model.meta.y1.mu, 1e-10)
+            assert_rel_error(self, batch['y2'][i], model.meta.y2, 1e-10)
+
     # Array param not supported yet. - KTM
     #def test_array_inputs(self):
 
@@ -3,7 +3,9 @@ Support for calculating one or more scalar averages across one or more
 regions in a domain.
 """
 
-from math import cos, sin, sqrt
+from itertools import product
+
+from numpy import array, cos, cumsum, empty, ndarray, sin, sqrt
 
 from openmdao.lib.datatypes.domain.flow import CELL_CENTER
 from openmdao.lib.datatypes.domain.zone import CYLINDRICAL
@@ -250,16 +252,18 @@ def _calc_weights(scheme, domain, regions):
             else:
                 zone_weights = _curve_weights_1d(scheme, domain, region)
         else:
-            zone_weights = [1.]
+            zone_weights = array([1.])
 
         zone_name = region[0]
         zone = getattr(domain, zone_name)
-        zone_weights *= zone.symmetry_instances  # Adjust for symmetry.
         if zone_name in weights:
             raise RuntimeError('Zone %r used more than once' % zone_name)
         else:
             weights[zone_name] = zone_weights
-        weight_total += sum(zone_weights)
+        # Values are adjusted for symmetry in mesh_probe(), so only the
+        # total is adjusted here.
+        weight_total += _total(zone_weights, True, None) * \
+                        zone.symmetry_instances
 
     return (weights, weight_total)
 
@@ -279,24 +283,19 @@ def _surface_weights_3d(scheme, domain, region):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical:
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
+    momentum = (None, None, None)
     if scheme == 'mass':
         try:
             if cylindrical:
-                mom_c1 = flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
+                momentum = (flow.momentum.z, flow.momentum.r, flow.momentum.t)
             else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = flow.momentum.z.item
+                momentum = (flow.momentum.x, flow.momentum.y, flow.momentum.z)
+            if [arr for arr in momentum if arr is None]:
+                raise AttributeError('momentum')
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
                                  " 'momentum'." % zone_name)
@@ -313,20 +312,20 @@ def _surface_weights_3d(scheme, domain, region):
         face_normal = _kface_normal
         face_value = _kface_cell_value if cell_center else _kface_node_value
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
-                if scheme == 'mass':
-                    loc = (i, j, k)
-                    rvu = face_value(mom_c1, loc)
-                    rvv = face_value(mom_c2, loc)
-                    rvw = face_value(mom_c3, loc)
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
+    def cell_weight(at, arrays, base):
+        c1, c2, c3, mom_c1, mom_c2, mom_c3 = arrays
+        i, j, k = base
+        sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
+        if scheme == 'mass':
+            rvu = face_value(mom_c1, base)
+            rvv = face_value(mom_c2, base)
+            rvw = face_value(mom_c3, base)
+            return rvu*sc1 + rvv*sc2 + rvw*sc3
+        else:
+            return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+
+    return _cell_values(True, (imin, jmin, kmin), (imax, jmax, kmax),
+                        coords + momentum, cell_weight)
 
 
 def _surface_weights_2d(scheme, domain, region):
@@ -339,59 +338,58 @@ def _surface_weights_2d(scheme, domain, region):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
+    momentum = (None, None, None)
     if scheme == 'mass':
         try:
             if cylindrical:
-                mom_c1 = None if flow.momentum.z is None else flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
+                momentum = (flow.momentum.z, flow.momentum.r, flow.momentum.t)
+                missing = momentum[1:]
             else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = None if flow.momentum.z is None else flow.momentum.z.item
+                momentum = (flow.momentum.x, flow.momentum.y, flow.momentum.z)
+                missing = momentum[:2]
+            if [arr for arr in missing if arr is None]:
+                raise AttributeError('momentum')
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
                                  " 'momentum'." % zone_name)
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
-                if scheme == 'mass':
-                    ip1 = i + 1
-                    jp1 = j + 1
-                    if cell_center:
-                        # Cell value is value.
+    def cell_weight(at, arrays, base):
+        c1, c2, c3, mom_c1, mom_c2, mom_c3 = arrays
+        i, j = base
+        sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
+        if scheme == 'mass':
+            ip1 = i + 1
+            jp1 = j + 1
+            if cell_center:
+                # Cell value is value.
 # FIXME: built-in ghosts
-                        rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
-                        rvv = mom_c2(ip1, jp1)
-                        rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
-                    else:
-                        # Average across vertices.
-                        if mom_c1 is None:
-                            rvu = 0.
-                        else:
-                            rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
-                                          mom_c1(i, jp1) + mom_c1(ip1, jp1))
-                        rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
-                                      mom_c2(i, jp1) + mom_c2(ip1, jp1))
-                        if mom_c3 is None:
-                            rvw = 0.
-                        else:
-                            rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
-                                          mom_c3(i, jp1) + mom_c3(ip1, jp1))
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
+                rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
+                rvv = mom_c2(ip1, jp1)
+                rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
+            else:
+                # Average across vertices.
+                if mom_c1 is None:
+                    rvu = 0.
                 else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
+                    rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
+                                  mom_c1(i, jp1) + mom_c1(ip1, jp1))
+                rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
+                              mom_c2(i, jp1) + mom_c2(ip1, jp1))
+                if mom_c3 is None:
+                    rvw = 0.
+                else:
+                    rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
+                                  mom_c3(i, jp1) + mom_c3(ip1, jp1))
+            return rvu*sc1 + rvv*sc2 + rvw*sc3
+        else:
+            return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+
+    return _cell_values(True, (imin, jmin), (imax, jmax),
+                        coords + momentum, cell_weight)
 
 
 def _curve_weights_3d(scheme, domain, region):
@@ -404,44 +402,35 @@ def _curve_weights_3d(scheme, domain, region):
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
     else:
-        x = grid.x.item
-        y = grid.y.item
-        z = grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    along_i, along_j = False, False
     if imin != imax:
-        along_i = True
         jmax += 1
         kmax += 1
+        step = (1, 0, 0)
     elif jmin != jmax:
-        along_j = True
         imax += 1
         kmax += 1
+        step = (0, 1, 0)
     else:
         imax += 1
         jmax += 1
+        step = (0, 0, 1)
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                if along_i:
-                    dx = x(i+1, j, k) - x(i, j, k)
-                    dy = y(i+1, j, k) - y(i, j, k)
-                    dz = z(i+1, j, k) - z(i, j, k)
-                elif along_j:
-                    dx = x(i, j+1, k) - x(i, j, k)
-                    dy = y(i, j+1, k) - y(i, j, k)
-                    dz = z(i, j+1, k) - z(i, j, k)
-                else:
-                    dx = x(i, j, k+1) - x(i, j, k)
-                    dy = y(i, j, k+1) - y(i, j, k)
-                    dz = z(i, j, k+1) - z(i, j, k)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    def cell_weight(at, arrays, base):
+        x, y, z = arrays
+        i, j, k = base
+        di, dj, dk = step
+        dx = x(i+di, j+dj, k+dk) - x(i, j, k)
+        dy = y(i+di, j+dj, k+dk) - y(i, j, k)
+        dz = z(i+di, j+dj, k+dk) - z(i, j, k)
+        return sqrt(dx*dx + dy*dy + dz*dz)
+
+    return _cell_values(True, (imin, jmin, kmin), (imax, jmax, kmax),
+                        coords, cell_weight)
 
 
 def _curve_weights_2d(scheme, domain, region):
@@ -454,33 +443,28 @@ def _curve_weights_2d(scheme, domain, region):
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
     else:
-        x = grid.x.item
-        y = grid.y.item
-        z = None if grid.z is None else grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
     if imin != imax:
-        along_i = True
         jmax += 1
+        step = (1, 0)
     else:
-        along_i = False
         imax += 1
+        step = (0, 1)
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                if along_i:
-                    dx = x(i+1, j) - x(i, j)
-                    dy = y(i+1, j) - y(i, j)
-                    dz = 0. if z is None else z(i+1, j) - z(i, j)
-                else:
-                    dx = x(i, j+1) - x(i, j)
-                    dy = y(i, j+1) - y(i, j)
-                    dz = 0. if z is None else z(i, j+1) - z(i, j)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    def cell_weight(at, arrays, base):
+        x, y, z = arrays
+        i, j = base
+        di, dj = step
+        dx = x(i+di, j+dj) - x(i, j)
+        dy = y(i+di, j+dj) - y(i, j)
+        dz = 0. if z is None else z(i+di, j+dj) - z(i, j)
+        return sqrt(dx*dx + dy*dy + dz*dz)
+
+    return _cell_values(True, (imin, jmin), (imax, jmax), coords, cell_weight)
 
 
 def _curve_weights_1d(scheme, domain, region):
@@ -493,20 +477,20 @@ def _curve_weights_1d(scheme, domain, region):
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
     else:
-        x = grid.x.item
-        y = None if grid.y is None else grid.y.item
-        z = None if grid.z is None else grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    weights = []
-    for i in range(imin, imax):
+    def cell_weight(at, arrays, base):
+        x, y, z = arrays
+        i, = base
         dx = x(i+1) - x(i)
         dy = 0. if y is None else y(i+1) - y(i)
         dz = 0. if z is None else z(i+1) - z(i)
-        weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+        return sqrt(dx*dx + dy*dy + dz*dz)
+
+    return _cell_values(True, (imin,), (imax,), coords, cell_weight)
 
 
 def _calc_metric(name, domain, region, weights, reference_state):
@@ -615,13 +599,9 @@ def _surface_3d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     if imin == imax: 
         face = 'i'
@@ -636,51 +616,46 @@ def _surface_3d(metric, integrate, zone, region, weights):
         kmax += 1
         get_normal = _kface_normal
 
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
+    def cell_value(at, coords, base):
+        normal = None
+        if integrate:
+            c1, c2, c3 = coords
+            i, j, k = base
+            normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
 
-                if integrate:
-                    normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
-    
-                if cell_center:
+        if cell_center:
 # FIXME: built-in ghosts
-                    # Average across cells sharing surface.
-                    val = metric.calculate((i+1, j+1, k+1), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j+1, k), normal)
-                    val *= 0.5
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k), normal)
-                    val *= 0.25
+            # Average across cells sharing surface.
+            val = metric.calculate(at(1, 1, 1), normal)
+            if face == 'i':
+                val = val + metric.calculate(at(0, 1, 1), normal)
+            elif face == 'j':
+                val = val + metric.calculate(at(1, 0, 1), normal)
+            else:
+                val = val + metric.calculate(at(1, 1, 0), normal)
+            val = val * 0.5
+        else:
+            # Average across vertices.
+            val = metric.calculate(at(0, 0, 0), normal)
+            if face == 'i':
+                val = val + metric.calculate(at(0, 1, 0), normal)
+                val = val + metric.calculate(at(0, 1, 1), normal)
+                val = val + metric.calculate(at(0, 0, 1), normal)
+            elif face == 'j':
+                val = val + metric.calculate(at(1, 0, 0), normal)
+                val = val + metric.calculate(at(1, 0, 1), normal)
+                val = val + metric.calculate(at(0, 0, 1), normal)
+            else:
+                val = val + metric.calculate(at(1, 0, 0), normal)
+                val = val + metric.calculate(at(1, 1, 0), normal)
+                val = val + metric.calculate(at(0, 1, 0), normal)
+            val = val * 0.25
+        return val
 
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+    values = _cell_values(getattr(metric, 'vectorized', False),
+                          (imin, jmin, kmin), (imax, jmax, kmax),
+                          coords, cell_value)
+    return _total(values, integrate, weights)
 
 
 def _surface_2d(metric, integrate, zone, region, weights):
@@ -692,42 +667,33 @@ def _surface_2d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
+    def cell_value(at, coords, base):
+        normal = None
+        if integrate:
+            c1, c2, c3 = coords
+            i, j = base
+            normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
 
-            if integrate:
-                normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
-    
-            if cell_center:
+        if cell_center:
 # FIXME: built-in ghosts
-                # Cell value is value.
-                val = metric.calculate((i+1, j+1), normal)
-            else:
-                # Average across vertices.
-                val  = metric.calculate((i, j), normal)
-                val += metric.calculate((i, j+1), normal)
-                val += metric.calculate((i+1, j+1), normal)
-                val += metric.calculate((i+1, j), normal)
-                val *= 0.25
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
+            # Cell value is value.
+            val = metric.calculate(at(1, 1), normal)
+        else:
+            # Average across vertices.
+            val = metric.calculate(at(0, 0), normal)
+            val = val + metric.calculate(at(0, 1), normal)
+            val = val + metric.calculate(at(1, 1), normal)
+            val = val + metric.calculate(at(1, 0), normal)
+            val = val * 0.25
+        return val
+
+    values = _cell_values(getattr(metric, 'vectorized', False),
+                          (imin, jmin), (imax, jmax), coords, cell_value)
+    return _total(values, integrate, weights)
 
 
 def _curve_3d(metric, integrate, zone, region, weights):
@@ -739,13 +705,9 @@ def _curve_3d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     if imin != imax:
         edge = 'i'
@@ -763,51 +725,45 @@ def _curve_3d(metric, integrate, zone, region, weights):
         jmax += 1
         get_length = _kedge_length
 
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    length = get_length(c1, c2, c3, (i, j, k), cylindrical)
+    def cell_value(at, coords, base):
+        length = None
+        if integrate:
+            c1, c2, c3 = coords
+            length = get_length(c1, c2, c3, base, cylindrical)
 
-                if cell_center:
+        if cell_center:
 # FIXME: built-in ghosts
-                    # Average across cells sharing edge.
-                    val = metric.calculate((i+1, j+1, k+1), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i, j+1, k), length)
-                    else:
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i, j, k+1), length)
-                    val *= 0.25
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                         val +=metric.calculate((i, j+1, k), length)
-                    else:
-                         val +=metric.calculate((i, j, k+1), length)
-                    val *= 0.5
+            # Average across cells sharing edge.
+            val = metric.calculate(at(1, 1, 1), length)
+            if edge == 'i':
+                val = val + metric.calculate(at(1, 0, 1), length)
+                val = val + metric.calculate(at(1, 1, 0), length)
+                val = val + metric.calculate(at(1, 0, 0), length)
+            elif edge == 'j':
+                val = val + metric.calculate(at(0, 1, 1), length)
+                val = val + metric.calculate(at(1, 1, 0), length)
+                val = val + metric.calculate(at(0, 1, 0), length)
+            else:
+                val = val + metric.calculate(at(0, 1, 1), length)
+                val = val + metric.calculate(at(1, 0, 1), length)
+                val = val + metric.calculate(at(0, 0, 1), length)
+            val = val * 0.25
+        else:
+            # Average across vertices.
+            val = metric.calculate(at(0, 0, 0), length)
+            if edge == 'i':
+                val = val + metric.calculate(at(1, 0, 0), length)
+            elif edge == 'j':
+                val = val + metric.calculate(at(0, 1, 0), length)
+            else:
+                val = val + metric.calculate(at(0, 0, 1), length)
+            val = val * 0.5
+        return val
 
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+    values = _cell_values(getattr(metric, 'vectorized', False),
+                          (imin, jmin, kmin), (imax, jmax, kmax),
+                          coords, cell_value)
+    return _total(values, integrate, weights)
 
 
 def _curve_2d(metric, integrate, zone, region, weights):
@@ -819,13 +775,9 @@ def _curve_2d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     if imin != imax:
         edge = 'i'
@@ -836,40 +788,34 @@ def _curve_2d(metric, integrate, zone, region, weights):
         imax += 1
         get_length = _jedge_length
 
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                length = get_length(c1, c2, c3, (i, j), cylindrical)
+    def cell_value(at, coords, base):
+        length = None
+        if integrate:
+            c1, c2, c3 = coords
+            length = get_length(c1, c2, c3, base, cylindrical)
 
-            if cell_center:
+        if cell_center:
 # FIXME: built-in ghosts
-                # Average across cells sharing edge.
-                val = metric.calculate((i+1, j+1), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
+            # Average across cells sharing edge.
+            val = metric.calculate(at(1, 1), length)
+            if edge == 'i':
+                val = val + metric.calculate(at(1, 0), length)
             else:
-                # Average across vertices.
-                val = metric.calculate((i, j), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-
-            if integrate:
-                total += val
+                val = val + metric.calculate(at(0, 1), length)
+            val = val * 0.5
+        else:
+            # Average across vertices.
+            val = metric.calculate(at(0, 0), length)
+            if edge == 'i':
+                val = val + metric.calculate(at(1, 0), length)
             else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
+                val = val + metric.calculate(at(0, 1), length)
+            val = val * 0.5
+        return val
+
+    values = _cell_values(getattr(metric, 'vectorized', False),
+                          (imin, jmin), (imax, jmax), coords, cell_value)
+    return _total(values, integrate, weights)
 
 
 def _curve_1d(metric, integrate, zone, region, weights):
@@ -881,41 +827,32 @@ def _curve_1d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        coords = (grid.z, grid.r, grid.t)
     else:
-        c1 = grid.x.item
-        c2 = None if grid.y is None else grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        coords = (grid.x, grid.y, grid.z)
 
     get_length = _iedge_length
 
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-
+    def cell_value(at, coords, base):
+        length = None
         if integrate:
-            length = get_length(c1, c2, c3, (i,), cylindrical)
+            c1, c2, c3 = coords
+            length = get_length(c1, c2, c3, base, cylindrical)
 
         if cell_center:
 # FIXME: built-in ghosts
             # Cell value is value.
-            val = metric.calculate((i+1,), length)
+            val = metric.calculate(at(1), length)
         else:
             # Average across vertices.
-            val  = metric.calculate((i,), length)
-            val += metric.calculate((i+1,), length)
-            val *= 0.5
+            val = metric.calculate(at(0), length)
+            val = val + metric.calculate(at(1), length)
+            val = val * 0.5
+        return val
 
-        if integrate:
-            total += val
-        else:
-            weight = weights[weight_index]
-            weight_index += 1
-            total += val * weight
-    return total
+    values = _cell_values(getattr(metric, 'vectorized', False),
+                          (imin,), (imax,), coords, cell_value)
+    return _total(values, integrate, weights)
 
 
 def _point(metric, zone, region):
@@ -963,6 +900,66 @@ def _point(metric, zone, region):
             return metric.calculate((imin,), None)
 
 
+def _cell_values(vectorized, lo, hi, arrays, cell_value):
+    """
+    Return the values of `cell_value` for the cells from index `lo` up to
+    (but not including) `hi`, in 'C' order.
+
+    `cell_value` is called with ``(at, arrays, base)``. `arrays` holds the
+    (possibly None) zone `arrays` as callables taking indices, `base` is
+    the indices of the cell, and ``at(*offset)`` returns the location of the
+    cell offset by `offset`, suitable for :meth:`calculate`.
+
+    If `vectorized`, `cell_value` is called just once, with `base` all zeros
+    and `at` and `arrays` returning slices covering the entire range, and an
+    array is returned. Otherwise `cell_value` is called for each cell and a
+    list is returned.
+    """
+    if vectorized:
+        def at(*offset):
+            return tuple([slice(low+off, high+off)
+                          for low, high, off in zip(lo, hi, offset)])
+
+        def slicer(arr):
+            return lambda *offset: arr[at(*offset)]
+
+        values = empty(tuple([high-low for low, high in zip(lo, hi)]))
+        values[...] = cell_value(at,
+                                 [None if arr is None else slicer(arr)
+                                  for arr in arrays],
+                                 (0,)*len(lo))
+        return values.ravel()
+
+    arrays = [None if arr is None else arr.item for arr in arrays]
+    values = []
+    for base in product(*[range(low, high) for low, high in zip(lo, hi)]):
+        at = lambda *offset: tuple([idx+off for idx, off in zip(base, offset)])
+        values.append(cell_value(at, arrays, base))
+    return values
+
+
+def _total(values, integrate, weights):
+    """
+    Return the sum of `values`, multiplied by the corresponding `weights` if
+    not `integrate`. Values are accumulated in order, so the result is the
+    same whether `values` is an array or a list.
+    """
+    if isinstance(values, ndarray):
+        if not len(values):
+            return 0.
+        if not integrate:
+            values = values * weights[:len(values)]
+        return cumsum(values)[-1]
+
+    total = 0.
+    for i, val in enumerate(values):
+        if integrate:
+            total += val
+        else:
+            total += val * weights[i]
+    return total
+
+
 def _iface_normal(c1, c2, c3, i, j, k, cylindrical):
     """
     Return non-dimensional vector normal to I face with magnitude equal to area.
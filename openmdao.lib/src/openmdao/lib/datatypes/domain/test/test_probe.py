@@ -10,6 +10,7 @@ import unittest
 from math import pi
 
 from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import get_metric
 from openmdao.lib.datatypes.domain.test import restart, overflow
 from openmdao.lib.datatypes.domain.test.cube import create_cube
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
@@ -237,6 +238,42 @@ class TestCase(unittest.TestCase):
         assert_rel_error(self, metrics[5], -149.525, 0.00001)
         assert_rel_error(self, metrics[6], -262.976, 0.00001)
 
+    def test_vectorized(self):
+        # Verify vectorized metrics match per-cell calculation.
+        logging.debug('')
+        logging.debug('test_vectorized')
+
+        domain = restart.read('lpc-test', logging.getLogger())
+        wedge = create_wedge_3d((30, 20, 100), 5., 0.5, 2., 30.)
+        variables = [('area', 'inch**2'),
+                     ('pressure_stagnation', 'psi'),
+                     ('temperature', 'degR'),
+                     ('mass_flow', 'lbm/s'),
+                     ('corrected_mass_flow', 'lbm/s')]
+        tests = [(domain, [('zone_1', 2, 2, 0, -1, 0, -1),
+                           ('zone_2', 2, 2, 0, -1, 0, -1)], variables),
+                 (domain, [('zone_1', 0, -1, 2, 2, 0, -1)], variables),
+                 (domain, [('zone_1', 0, -1, 0, -1, 2, 2)], variables),
+                 (wedge, [('xyzzy', 0, -1, 0, 0, 0, -1)],
+                  [('area', 'inch**2')]),
+                 (wedge, [('xyzzy', 0, -1, 5, 5, 5, 5)],
+                  [('length', 'inch'), ('density', None)]),
+                 (wedge, [('xyzzy', 5, 5, 5, 5, 0, -1)],
+                  [('length', 'inch'), ('density', None)])]
+
+        for dom, regions, variables in tests:
+            vectorized = mesh_probe(dom, regions, variables, 'area')
+            classes = [get_metric(name)[0] for name, units in variables]
+            try:
+                for cls in classes:
+                    cls.vectorized = False
+                scalar = mesh_probe(dom, regions, variables, 'area')
+            finally:
+                for cls in classes:
+                    cls.vectorized = True
+            logging.debug('%s: %s vs. %s', regions, vectorized, scalar)
+            self.assertEqual(vectorized, scalar)
+
     def test_errors(self):
         logging.debug('')
         logging.debug('test_errors')
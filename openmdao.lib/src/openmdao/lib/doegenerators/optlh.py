@@ -21,8 +21,8 @@ import logging
 from random import randint, shuffle, seed
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, size, sum, floor, zeros
-from numpy.linalg import norm
+from numpy import array, size, sum, floor, zeros, ones, arange, ix_, nonzero
+from scipy.spatial.distance import pdist, cdist, squareform
 
 from openmdao.main.datatypes.api import Int, Enum
 from openmdao.main.interfaces import implements, IDOEgenerator
@@ -79,6 +79,13 @@ class LHC_indivudal(object):
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
 
+        # Sum of d**-q over all pairs of points, and the symmetric matrix of
+        # d**-q terms it was summed from (computed lazily). A perturbed
+        # individual instead keeps its parent's matrix plus its changed rows.
+        self._phi_sum = None
+        self._inv_dist = None
+        self._pending = None
+
     @property
     def shape(self):
         """Size of the LatinHypercube DOE (rows,cols)."""
@@ -88,26 +95,29 @@ class LHC_indivudal(object):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
-
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
+            if self._phi_sum is None:
+                self._phi_sum = self._get_inv_dist().sum()/2.
+            self.phi = self._phi_sum**(1.0/self.q)
 
-            distinct_d = array(distdict.keys())
+        return self.phi
 
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
+    def _get_inv_dist(self):
+        """Returns the matrix of d**-q between each pair of points in the
+        DOE, with zeros on the diagonal."""
 
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+        if self._inv_dist is None:
+            if self._pending is None:
+                dist = pdist(self.doe, 'minkowski', p=self.p)
+                self._inv_dist = squareform(dist**(-self.q))
+            else:
+                parent, rows, new = self._pending
+                inv_dist = parent.copy()
+                inv_dist[rows, :] = new
+                inv_dist[:, rows] = new.T
+                self._inv_dist = inv_dist
+                self._pending = None
 
-        return self.phi
+        return self._inv_dist
 
     def perturb(self, mutation_count):
         """ Interchanges pairs of randomly chosen elements within randomly chosen
@@ -128,7 +138,42 @@ class LHC_indivudal(object):
             new_doe[el1, col] = self.doe[el2, col]
             new_doe[el2, col] = self.doe[el1, col]
 
-        return LHC_indivudal(new_doe, self.q, self.p)
+        child = LHC_indivudal(new_doe, self.q, self.p)
+
+        # Only distances involving the changed rows need recomputing.
+        rows = nonzero((new_doe != self.doe).any(1))[0]
+        if 2*len(rows) < n:
+            child._phi_sum = self._update_phi_sum(new_doe, rows, child)
+
+        return child
+
+    def _update_phi_sum(self, new_doe, rows, child):
+        """Returns the sum of d**-q for `new_doe`, which differs from this DOE
+        only in `rows`, and records the changed terms on `child`."""
+
+        self.mmphi()
+        total = self._phi_sum
+        inv_dist = self._get_inv_dist()
+        diag = (arange(len(rows)), rows)
+
+        dist = cdist(new_doe[rows], new_doe, 'minkowski', p=self.p)
+        dist[diag] = 1.
+        new = dist**(-self.q)
+        new[diag] = 0.
+        child._pending = (inv_dist, rows, new)
+
+        old_terms = inv_dist[rows, :].sum() - inv_dist[ix_(rows, rows)].sum()/2.
+        new_terms = new.sum() - new[:, rows].sum()/2.
+        new_total = total - old_terms + new_terms
+
+        if new_total <= total*1e-6:
+            # Removed terms dominated the total, so the difference has lost
+            # precision. Sum the unchanged terms directly instead.
+            keep = ones(len(new_doe), dtype=bool)
+            keep[rows] = False
+            new_total = inv_dist[ix_(keep, keep)].sum()/2. + new_terms
+
+        return new_total
 
     def __iter__(self):
         return self._get_rows()
@@ -24,6 +24,16 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi_incremental(self):
+        for p in (1, 2):
+            for q in (1, 2, 50):
+                lh = LHC_indivudal(rand_latin_hypercube(30, 3), q, p)
+                for i in range(10):
+                    lh = lh.perturb(2)
+                    full = LHC_indivudal(lh.doe, q, p)
+                    self.assertAlmostEqual(lh.mmphi()/full.mmphi(), 1.0,
+                                           places=10)
+
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_samples = 10
@@ -4,6 +4,7 @@
 """
 
 from cStringIO import StringIO
+import copy
 import gc
 import logging
 import os.path
@@ -11,18 +12,19 @@ import Queue
 import sys
 import thread
 import threading
+import time
 from uuid import uuid1, getnode
 
-from numpy import array
+from numpy import array, array_equal, ndarray
 
 from openmdao.main.api import Driver, VariableTree
-from openmdao.main.datatypes.api import Bool, Dict, Enum, Int
+from openmdao.main.datatypes.api import Bool, Dict, Enum, Float, Int
 from openmdao.main.exceptions import traceback_str, exception_str
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.hasparameters import HasVarTreeParameters
 from openmdao.main.hasresponses import HasVarTreeResponses
 from openmdao.main.interfaces import IHasParameters, IHasResponses, implements
-from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.main.rbac import get_credentials, set_credentials, rbac
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import LocalAllocator
 from openmdao.main.variable import is_legal_name, make_legal_path
@@ -36,6 +38,49 @@ _EMPTY     = 'empty'
 _LOADING   = 'loading'
 _EXECUTING = 'executing'
 
+# Marks a value not known to be in a server's model.
+_UNKNOWN = object()
+
+
+def _same(old, new):
+    """ Return True if `new` is known to be equal to `old`. """
+    if old is new:
+        return True
+    try:
+        if isinstance(old, ndarray) or isinstance(new, ndarray):
+            return isinstance(old, ndarray) and isinstance(new, ndarray) and \
+                   old.dtype == new.dtype and array_equal(old, new)
+        return type(old) is type(new) and bool(old == new)
+    except Exception:
+        return False
+
+
+def _remote_exc(msg):
+    """ Return a sys.exc_info() tuple for an error reported by a server. """
+    try:
+        raise RuntimeError(msg)
+    except RuntimeError:
+        return sys.exc_info()
+
+
+def _pack_outputs(data, exc):
+    """
+    Return outputs fetched by :meth:`_Case.fetch_outputs` in a form to be
+    sent back from a server.  If there was no error, only the values
+    are sent.
+    """
+    if exc is None:
+        return ([value for name, value in data], None)
+    return (data, traceback_str(exc))
+
+
+def _unpack_outputs(names, packed):
+    """ Return outputs packed by :func:`_pack_outputs` for `names`. """
+    data, exc = packed
+    if exc is None:
+        return (zip(names, data), None)
+    return (data, _remote_exc(exc))
+
 
 class _Case(object):
     """ Input data and required outputs for a particular simulation run. """
@@ -91,12 +136,18 @@ class _Case(object):
                 self._exprs = {}
             self._exprs[name] = expr
 
-    def apply_inputs(self, scope, parent):
+    def apply_inputs(self, scope, parent, values=None):
         """
         Take the values of all of the inputs in this case and apply them
-        to the specified scope.
+        to the specified scope.  If `values` is not None, it is a dictionary
+        of the values already in `scope`, which is used to skip setting
+        unchanged inputs and is updated with the values set.
         """
         for name, value in self._inputs.items():
+            if values is not None:
+                if _same(values.get(name, _UNKNOWN), value):
+                    continue
+                values[name] = value
             if self._exprs is None:
                 expr = None
             else:
@@ -184,6 +235,52 @@ class _ServerData(object):
         self.in_use = False     # True if being used.
         self.load_failures = 0  # Load failure count.
 
+        self.egg_file = None    # Egg file of loaded model.
+        self.values = None      # Input values known to be in loaded model.
+
+        self.batch = None       # Cases being evaluated as a batch.
+        self.results = None     # Results of evaluating batch.
+        self.batch_start = 0.   # Time batch was started.
+        self.case_time = None   # Measured time per case in a batch.
+
+
+class _BatchDriver(Driver):
+    """
+    Top level driver of the model saved to egg for servers.  It runs the
+    workflow once per execution, and can also evaluate a batch of cases in
+    the server, avoiding a round trip per case.
+    """
+
+    @rbac(('owner', 'user'))
+    def run_cases(self, itername, cases, outputs, extra_outputs, skip):
+        """
+        Evaluate `cases`, a list of ``(index, uuid, inputs)``, and return
+        a list of ``(outputs, extra_outputs)`` for each as packed by
+        :func:`_pack_outputs`. `skip` is an extra output handled by the
+        caller. If a case fails, its outputs are ``(None, traceback)``.
+        """
+        top = self.parent
+        if self.workflow._system is None:
+            top._setup()
+
+        results = []
+        for index, uuid, inputs in cases:
+            case = _Case(index, inputs, outputs, extra_outputs,
+                         case_uuid=uuid)
+            try:
+                case.apply_inputs(top, self)
+                top.set_itername(itername, index+1)
+                top.run(case_uuid=uuid)
+            except Exception:
+                exc = traceback_str(sys.exc_info())
+                results.append(((None, exc), (None, exc)))
+            else:
+                results.append(
+                    (_pack_outputs(*case.fetch_outputs(top)),
+                     _pack_outputs(*case.fetch_outputs(top, extra=True,
+                                                       itername=skip))))
+        return results
+
 
 
 @add_delegate(HasVarTreeParameters, HasVarTreeResponses)
@@ -217,6 +314,22 @@ class CaseIteratorDriver(Driver):
                                         ' requirements will be included in the'
                                         ' generated egg.')
 
+    batch_size = Int(1, low=1, iotype='in',
+                     desc='Maximum number of cases sent to a server at'
+                          ' once. Batches are sized to take about'
+                          ' batch_time. Only used if reload_model is'
+                          ' False.')
+
+    batch_time = Float(1., low=0., iotype='in', units='s',
+                       desc='Target time to evaluate a batch of cases.')
+
+    reuse_servers = Bool(False, iotype='in',
+                         desc='If True, keep concurrent servers and their'
+                              ' loaded models between executions, only'
+                              ' sending inputs that have changed. The model'
+                              ' is saved and reloaded only if its'
+                              ' configuration or external inputs change.')
+
     def __init__(self, *args, **kwargs):
         super(CaseIteratorDriver, self).__init__(*args, **kwargs)
         self._iter = None  # Set to None when iterator is empty.
@@ -226,6 +339,10 @@ class CaseIteratorDriver(Driver):
         self._egg_file = None
         self._egg_required_distributions = None
         self._egg_orphan_modules = None
+        self._egg_key = None      # Configuration saved in egg.
+        self._egg_values = {}     # Input values saved in egg.
+        self._model_values = {}   # Current values of inputs in _egg_values.
+        self._pool_resources = None  # Resources used by pooled servers.
 
         self._reply_q = None  # Replies from server threads.
         self._server_lock = None  # Lock for server data.
@@ -305,38 +422,16 @@ class CaseIteratorDriver(Driver):
             obj._setup()
 
         if not self.sequential:
-            # Save model to egg.
-            # Must do this before creating any locks or queues.
-            self._replicants += 1
-            version = 'replicant.%d' % (self._replicants)
-
-            # If only local host will be used, we can skip determining
-            # distributions required by the egg.
-            allocators = RAM.list_allocators()
-            need_reqs = False
-            if not self.ignore_egg_requirements:
-                for allocator in allocators:
-                    if not isinstance(allocator, LocalAllocator):
-                        need_reqs = True
-                        break
-
-            # Replicate and mutate model to run our workflow once.
-            # Originally this was done in-place, but that 'invalidated'
-            # various workflow quantities.
-            replicant = self.parent.copy()
-            workflow = replicant.get(self.name+'.workflow')
-            driver = replicant.add('driver', Driver())
-            workflow.parent = driver
-            workflow.scope = None
-            replicant.driver.workflow = workflow
-            egg_info = replicant.save_to_egg(self.name, version,
-                                             need_requirements=need_reqs)
-            replicant = workflow = driver = None  # Release objects.
-            gc.collect()  # Collect/compact before possible fork.
-
-            self._egg_file = egg_info[0]
-            self._egg_required_distributions = egg_info[1]
-            self._egg_orphan_modules = [name for name, path in egg_info[2]]
+            key = self._egg_config()
+            if self.reuse_servers and key == self._egg_key and \
+               self._egg_file and os.path.exists(self._egg_file):
+                self._model_values = self._model_inputs()
+                if not self._external_changed():
+                    self._logger.debug('reusing %s', self._egg_file)
+                    key = None
+            if key is not None:
+                self._save_egg()
+                self._egg_key = key
 
         inp_paths = []
         inp_values = []
@@ -365,6 +460,163 @@ class CaseIteratorDriver(Driver):
         self._iter = iter(cases)
         self._abort_exc = None
 
+    def _save_egg(self):
+        """ Save a copy of our parent, running only our workflow, to egg. """
+        # Must do this before creating any locks or queues.
+        if self._egg_file and os.path.exists(self._egg_file):
+            os.remove(self._egg_file)
+        self._replicants += 1
+        version = 'replicant.%d' % (self._replicants)
+
+        # If only local host will be used, we can skip determining
+        # distributions required by the egg.
+        allocators = RAM.list_allocators()
+        need_reqs = False
+        if not self.ignore_egg_requirements:
+            for allocator in allocators:
+                if not isinstance(allocator, LocalAllocator):
+                    need_reqs = True
+                    break
+
+        # Replicate and mutate model to run our workflow once.
+        # Originally this was done in-place, but that 'invalidated'
+        # various workflow quantities.
+        # Pooled servers must not be copied.
+        pool = (self._servers, self._reply_q, self._server_lock)
+        self._servers, self._reply_q, self._server_lock = {}, None, None
+        try:
+            replicant = self.parent.copy()
+        finally:
+            self._servers, self._reply_q, self._server_lock = pool
+        workflow = replicant.get(self.name+'.workflow')
+        driver = replicant.add('driver', _BatchDriver())
+        workflow.parent = driver
+        workflow.scope = None
+        replicant.driver.workflow = workflow
+        egg_info = replicant.save_to_egg(self.name, version,
+                                         need_requirements=need_reqs)
+        replicant = workflow = driver = pool = None  # Release objects.
+        gc.collect()  # Collect/compact before possible fork.
+
+        self._egg_file = egg_info[0]
+        self._egg_required_distributions = egg_info[1]
+        self._egg_orphan_modules = [name for name, path in egg_info[2]]
+        if self.reuse_servers:
+            self._egg_values = self._model_values = self._model_inputs()
+        else:
+            self._egg_values = self._model_values = {}
+
+    def _egg_config(self):
+        """
+        Return a key identifying the configuration of the model saved
+        to egg.  If it changes, pooled servers must load a new egg.
+        """
+        return (id(self.parent), getattr(self.parent, '_config_version', 0),
+                tuple(sorted(c.name for c in self.iteration_set())),
+                tuple(self.get_parameters().keys()),
+                tuple(self.get_responses().keys()),
+                self.ignore_egg_requirements)
+
+    def _model_inputs(self):
+        """
+        Return dictionary of copies of the values feeding our iteration
+        set which aren't set by our parameters.  Paths of unconnected inputs
+        are keys, along with ``(src,)`` for each connection from outside the
+        iteration set.  The former may be sent to a pooled server's model,
+        the latter require saving the model to egg again.
+        """
+        parent = self.parent
+        names = set(c.name for c in self.iteration_set())
+        targets = set()
+        for param in self.get_parameters().values():
+            targets.update(param.targets)
+
+        connected = {}
+        for src, dest in parent.list_connections():
+            connected[dest] = src
+
+        values = {}
+        for name in sorted(names):
+            comp = getattr(parent, name)
+            for vname in comp.list_inputs():
+                path = '%s.%s' % (name, vname)
+                if path in targets:
+                    continue
+                src = connected.get(path)
+                if src is None:
+                    key, expr = path, None
+                elif src.split('.', 1)[0] in names:
+                    continue
+                else:
+                    key, expr = (src,), ExprEvaluator(src, parent)
+                try:
+                    if expr is None:
+                        value = comp.get(vname)
+                    else:
+                        value = expr.evaluate()
+                    values[key] = copy.deepcopy(value)
+                except Exception as exc:
+                    self._logger.debug('not tracking %s: %r', key, exc)
+        return values
+
+    def _external_changed(self):
+        """
+        Return True if a connection from outside our iteration set has
+        a different value than when the model was saved to egg.
+        """
+        saved = self._egg_values
+        for key, value in self._model_values.items():
+            if isinstance(key, tuple) and \
+               not _same(saved.get(key, _UNKNOWN), value):
+                return True
+        return False
+
+    def release_servers(self):
+        """
+        Shut down any servers kept by :attr:`reuse_servers` and remove
+        the egg file they load.
+        """
+        self._stop_servers()
+
+        if self._egg_file and os.path.exists(self._egg_file):
+            os.remove(self._egg_file)
+        self._egg_file = None
+        self._egg_key = None
+        self._egg_values = {}
+        self._model_values = {}
+
+    def _stop_servers(self):
+        """ Shut down all started servers. """
+        self._logger.debug('Shut-down (started) servers')
+        n_queues = 0
+        for server in self._servers.values():
+            if server.queue is not None:
+                server.queue.put(None)
+                n_queues += 1
+        for i in range(n_queues):
+            try:
+                name, status, exc = self._reply_q.get(True, 60)
+            # Hard to force worker to hang, which is handled here.
+            except Queue.Empty:  # pragma no cover
+                pass
+            else:
+                self._servers[name].queue = None
+        # Hard to force worker to hang, which is handled here.
+        for server in self._servers.values():  # pragma no cover
+            if server.queue is not None:
+                self._logger.warning('Timeout waiting for %r to shut-down.',
+                                     server.name)
+
+        self._reply_q = None
+        self._server_lock = None
+        self._servers = {}
+        self._pool_resources = None
+
+    def pre_delete(self):
+        """ Release any pooled servers before we are deleted. """
+        self.release_servers()
+        super(CaseIteratorDriver, self).pre_delete()
+
     def _start(self):
         """ Start evaluating cases concurrently. """
         # Need credentials in case we're using a PublicKey server.
@@ -384,11 +636,38 @@ class CaseIteratorDriver(Driver):
             msg = 'No servers supporting required resources %s' % resources
             self.raise_exception(msg, RuntimeError)
 
+        if self._servers and resources != self._pool_resources:
+            self._logger.debug('releasing servers for new resources')
+            self._stop_servers()
+        self._pool_resources = resources
+
+        try:
+            self._run_servers(max_servers, resources, credentials)
+        except Exception:
+            self.release_servers()
+            raise
+        if not self.reuse_servers:
+            self.release_servers()
+
+    def _run_servers(self, max_servers, resources, credentials):
+        """
+        Evaluate cases with up to `max_servers` servers, reusing any pooled
+        servers and starting new ones as needed.
+        """
+        if self._reply_q is None:
+            self._server_lock = threading.Lock()
+            self._reply_q = Queue.Queue()
+
+        # Kick off pooled servers.
+        for server in self._servers.values():
+            server.load_failures = 0
+            if self._more_to_go():
+                server.in_use = self._server_ready(server)
+
         # Kick off initial wave of cases.
-        self._server_lock = threading.Lock()
-        self._reply_q = Queue.Queue()
         self._generation += 1
-        n_servers = 0
+        n_servers = len(self._servers)
+        started = []
         while n_servers < max_servers:
             if not self._more_to_go():
                 break
@@ -409,6 +688,7 @@ class CaseIteratorDriver(Driver):
             self._logger.debug('starting worker for %r', name)
             server = self._servers[name] = _ServerData(name)
             server.in_use = True
+            started.append(server)
             server_thread = threading.Thread(target=self._service_loop,
                                              args=(name, resources,
                                                    credentials, self._reply_q))
@@ -429,26 +709,35 @@ class CaseIteratorDriver(Driver):
                     except Queue.Empty:
                         break  # Timeout.
                     else:
+                        # Reply may be from a pooled server.
+                        replier = self._servers[name]
                         # Difficult to force startup failure.
-                        if server.server is None:  # pragma nocover
+                        if replier.server is None:  # pragma nocover
                             self._logger.debug('server startup failed for %r',
                                                name)
-                            server.in_use = False
+                            replier.in_use = False
                         else:
-                            server.in_use = self._server_ready(server)
+                            replier.in_use = self._server_ready(replier)
 
         if sys.platform == 'win32':  # pragma no cover
             # Don't start server processing until all servers are started,
             # otherwise we have egg removal issues.
-            for i in self._servers:
+            # Replies from pooled servers are handled below.
+            replies = []
+            n_startups = 0
+            while n_startups < len(started):
                 name, result, exc = self._reply_q.get()
                 server = self._servers[name]
+                if server not in started:
+                    replies.append(server)
+                    continue
+                n_startups += 1
                 if server.server is None:
                     self._logger.debug('server startup failed for %r', name)
                     server.in_use = False
 
             # Kick-off started servers.
-            for server in self._servers.values():
+            for server in started + replies:
                 if server.in_use:
                     server.in_use = self._server_ready(server)
 
@@ -486,26 +775,12 @@ class CaseIteratorDriver(Driver):
                 server = self._servers[name]
                 server.in_use = self._server_ready(server)
 
-        # Shut-down (started) servers.
-        self._logger.debug('Shut-down (started) servers')
-        n_queues = 0
-        for server in self._servers.values():
-            if server.queue is not None:
-                server.queue.put(None)
-                n_queues += 1
-        for i in range(n_queues):
-            try:
-                name, status, exc = self._reply_q.get(True, 60)
-            # Hard to force worker to hang, which is handled here.
-            except Queue.Empty:  # pragma no cover
-                pass
+        # Only keep servers which started successfully.
+        for name, server in self._servers.items():
+            if server.queue is None:
+                del self._servers[name]
             else:
-                self._servers[name].queue = None
-        # Hard to force worker to hang, which is handled here.
-        for server in self._servers.values():  # pragma no cover
-            if server.queue is not None:
-                self._logger.warning('Timeout waiting for %r to shut-down.',
-                                     server.name)
+                server.state = _EMPTY
 
     def _busy(self):
         """ Return True while at least one server is in use. """
@@ -521,16 +796,13 @@ class CaseIteratorDriver(Driver):
               for workers which haven't shut down by now.
         """
         self._iter = None
-        self._reply_q = None
-        self._server_lock = None
-        self._servers = {}
+        self._servers.pop(None, None)
         self._seq_server.top = None  # Avoid leak.
         self._todo = []
         self._rerun = []
 
-        if self._egg_file and os.path.exists(self._egg_file):
-            os.remove(self._egg_file)
-            self._egg_file = None
+        if self.sequential or not self.reuse_servers:
+            self.release_servers()
 
     def _server_ready(self, server):
         """
@@ -563,6 +835,12 @@ class CaseIteratorDriver(Driver):
                         server.state = _EMPTY
                         in_use = False
 
+        elif state == _EXECUTING and server.batch is not None:
+            self._finish_batch(server)
+
+            # Set up for next batch.
+            in_use = self._start_processing(server, reload=True)
+
         elif state == _EXECUTING:
             case = server.case
             server.case = None
@@ -579,17 +857,7 @@ class CaseIteratorDriver(Driver):
                 self._logger.debug('    exception while executing: %r', server.exception[1])
                 case.exc = server.exception
 
-            if case.exc is not None:
-                if self.error_policy == 'ABORT':
-                    if self._abort_exc is None:
-                        self._abort_exc = case.exc
-                    self._stop = True
-                elif case.retries < self.max_retries:
-                    case.exc = None
-                    case.retries += 1
-                    self._rerun.append(case)
-                else:
-                    self._logger.error('Too many retries for %s', case)
+            self._check_case(case)
 
             # Set up for next case.
             in_use = self._start_processing(server, reload=True)
@@ -597,11 +865,17 @@ class CaseIteratorDriver(Driver):
         elif state == _EMPTY:
             if server.name is None or server.queue is not None:
                 if self._more_to_go():
-                    if server.queue is not None:
-                        self._logger.debug('    load_model')
-                        server.load_failures = 0
-                        self._load_model(server)
-                    server.state = _LOADING
+                    if server.queue is not None and \
+                       not self.reload_model and \
+                       server.egg_file == self._egg_file:
+                        self._logger.debug('    reuse model')
+                        in_use = self._start_next_case(server)
+                    else:
+                        if server.queue is not None:
+                            self._logger.debug('    load_model')
+                            server.load_failures = 0
+                            self._load_model(server)
+                        server.state = _LOADING
                 else:
                     self._logger.debug('    no more cases')
                     in_use = False
@@ -624,6 +898,20 @@ class CaseIteratorDriver(Driver):
 
         return in_use
 
+    def _check_case(self, case):
+        """ Handle any error in evaluating `case` per :attr:`error_policy`. """
+        if case.exc is not None:
+            if self.error_policy == 'ABORT':
+                if self._abort_exc is None:
+                    self._abort_exc = case.exc
+                self._stop = True
+            elif case.retries < self.max_retries:
+                case.exc = None
+                case.retries += 1
+                self._rerun.append(case)
+            else:
+                self._logger.error('Too many retries for %s', case)
+
     def _more_to_go(self):
         """ Return True if there's more work to do. """
         if self._stop:
@@ -662,31 +950,56 @@ class CaseIteratorDriver(Driver):
         return in_use
 
     def _start_next_case(self, server):
-        """ Look for the next case and start it. """
+        """ Look for the next case (or batch of cases) and start it. """
+        case = self._next_case()
+        if case is None:
+            return False
+
+        size = self._batch_size(server)
+        if size:
+            cases = [case]
+            while len(cases) < size and not self._stop:
+                case = self._next_case()
+                if case is None:
+                    break
+                cases.append(case)
+            return self._run_batch(cases, server)
 
+        return self._run_case(case, server)
+
+    def _next_case(self):
+        """ Return the next case to be evaluated, or None. """
+        case = None
         if self._todo:
             self._logger.debug('    run startup case')
             case = self._todo.pop(0)
-            in_use = self._run_case(case, server)
         elif self._rerun:
             self._logger.debug('    rerun case')
             case = self._rerun.pop(0)
-            in_use = self._run_case(case, server)
         elif self._iter is None:
             self._logger.debug('    no more cases')
-            in_use = False
         else:
             try:
                 case = self._iter.next()
             except StopIteration:
                 self._logger.debug('    no more cases')
                 self._iter = None
-                in_use = False
             else:
                 self._logger.debug('    run next case')
-                in_use = self._run_case(case, server)
+        return case
 
-        return in_use
+    def _batch_size(self, server):
+        """
+        Return the number of cases to send to `server` at once, aiming
+        for batches taking :attr:`batch_time` based on the time per case
+        measured for its previous batch. Returns 0 if cases aren't batched.
+        """
+        if server.queue is None or self.reload_model or self.batch_size < 2:
+            return 0
+        if not server.case_time:
+            return 1  # Measure a single case first.
+        size = int(self.batch_time / server.case_time)
+        return max(1, min(size, self.batch_size))
 
     def _run_case(self, case, server):
         """ Setup and start a case. Returns True if started. """
@@ -697,7 +1010,11 @@ class CaseIteratorDriver(Driver):
         case.parent_uuid = self._case_uuid
 
         try:
-            case.apply_inputs(server.top, self)
+            if server.values is None:
+                case.apply_inputs(server.top, self)
+            else:
+                self._update_model(server)
+                case.apply_inputs(server.top, self, server.values)
         except Exception:
             case.exc = sys.exc_info()
             msg = 'Exception setting case inputs: %s' % case.exc[1]
@@ -712,12 +1029,92 @@ class CaseIteratorDriver(Driver):
         server.state = _EXECUTING
         return True
 
-    def _record_case(self, scope, case):
+    def _run_batch(self, cases, server):
+        """ Setup and start a batch of cases. Returns True if started. """
+        for case in cases:
+            case.exc = None
+            case.uuid = _Case.next_uuid()
+            case.parent_uuid = self._case_uuid
+
+        if server.values is not None:
+            try:
+                self._update_model(server)
+            except Exception:
+                exc = sys.exc_info()
+                self._logger.error('    Exception updating model: %s', exc[1])
+                for case in cases:
+                    case.exc = exc
+                    self._check_case(case)
+                return self._start_processing(server)
+
+            # Case inputs are set in the server.
+            for case in cases:
+                for name in case._inputs:
+                    server.values.pop(name, None)
+
+        self._logger.debug('    run batch of %d cases', len(cases))
+        server.batch = cases
+        server.batch_start = time.time()
+        server.exception = None
+        server.queue.put((self._remote_run_batch, server))
+        server.state = _EXECUTING
+        return True
+
+    def _finish_batch(self, server):
+        """ Record the results of the batch of cases run by `server`. """
+        cases, results = server.batch, server.results
+        server.batch = server.results = None
+        server.case_time = (time.time() - server.batch_start) / len(cases)
+
+        if server.exception is not None:
+            self._logger.debug('    exception while executing batch: %r',
+                               server.exception[1])
+            for case in cases:
+                case.exc = server.exception
+                self._check_case(case)
+            return
+
+        itername = '%s.workflow.itername' % self.name
+        for case, (packed, packed_extra) in zip(cases, results):
+            if packed[0] is None:
+                case.exc = _remote_exc(packed[1])
+            else:
+                extra_names = [name for name in case._extra_outputs
+                                         if name != itername]
+                fetched = _unpack_outputs(case._outputs, packed) + \
+                          _unpack_outputs(extra_names, packed_extra)
+                try:
+                    self._record_case(self.parent, case, fetched)
+                except Exception as exc:
+                    msg = 'Exception recording case: %s' % exc
+                    self._logger.debug('    %s', msg)
+                    self._logger.debug('%s', case)
+                    case.msg = '%s: %s' % (self.get_pathname(), msg)
+            self._check_case(case)
+
+    def _update_model(self, server):
+        """
+        Send the values of unconnected inputs which differ from those
+        known to be in the model of pooled `server`.
+        """
+        values = server.values
+        for path, value in self._model_values.items():
+            if not isinstance(path, tuple) and \
+               not _same(values.get(path, _UNKNOWN), value):
+                server.top.set(path, value)
+                values[path] = value
+
+    def _record_case(self, scope, case, fetched=None):
         """
         Record case data from `scope` in ``case_outputs``.
         Also sends case data to recorders.
+        If `fetched` is not None, it is ``(case_outputs, exc, extra,
+        extra_exc)`` already fetched by a server.
         """
-        case_outputs, exc = case.fetch_outputs(scope)
+        if fetched is None:
+            case_outputs, exc = case.fetch_outputs(scope)
+        else:
+            case_outputs, exc, extra, extra_exc = fetched
         if exc is None and case.exc is None:
             index = case.index
             for path, value in case_outputs:
@@ -746,8 +1143,9 @@ class CaseIteratorDriver(Driver):
                     outputs.append(value)
 
             itername = '%s.workflow.itername' % self.name
-            extra, extra_exc = case.fetch_outputs(scope, extra=True,
-                                                  itername=itername)
+            if fetched is None:
+                extra, extra_exc = case.fetch_outputs(scope, extra=True,
+                                                      itername=itername)
             for path, value in extra:
                 if self.sequential and isinstance(value, VariableTree):
                     value = value.copy()
@@ -840,6 +1238,7 @@ class CaseIteratorDriver(Driver):
                 self._logger.error('server %r filexfer of %r failed: %r',
                                    server.name, self._egg_file, exc)
                 server.top = None
+                server.egg_file = server.values = None
                 server.exception = sys.exc_info()
                 return
             else:
@@ -851,9 +1250,15 @@ class CaseIteratorDriver(Driver):
             self._logger.error('server.load_model of %r failed: %r',
                                self._egg_file, exc)
             server.top = None
+            server.egg_file = server.values = None
             server.exception = sys.exc_info()
         else:
             server.top = tlo
+            server.egg_file = self._egg_file
+            if self.reuse_servers:
+                server.values = dict(self._egg_values)
+            else:
+                server.values = None
 
     def _model_execute(self, server):
         """ Execute model in server. """
@@ -867,6 +1272,24 @@ class CaseIteratorDriver(Driver):
         else:
             server.queue.put((self._remote_model_execute, server))
 
+    def _remote_run_batch(self, server):
+        """ Evaluate batch of cases in remote server. """
+        cases = server.batch
+        case = cases[0]
+        try:
+            server.results = server.top.driver.run_cases(
+                self.get_itername(),
+                [(case.index, case.uuid, case._inputs.items())
+                 for case in cases],
+                case._outputs, case._extra_outputs,
+                '%s.workflow.itername' % self.name)
+        except Exception as exc:
+            server.exception = sys.exc_info()
+            self._logger.error('Caught exception from server %r,'
+                               ' PID %d on %s: %r',
+                               server.info['name'], server.info['pid'],
+                               server.info['host'], exc)
+
     def _remote_model_execute(self, server):
         """ Execute model in remote server. """
         case = server.case
@@ -1,6 +1,9 @@
 """ A driver that runs input cases in parallel via MPI."""
 
+import time
+
 from openmdao.main.api import Driver
+from openmdao.main.datatypes.api import Bool
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.hasparameters import HasVarTreeParameters
 from openmdao.main.hasresponses import HasVarTreeResponses
@@ -11,6 +14,10 @@ from openmdao.main.mpiwrap import MPI, evenly_distrib_idxs, MPIContext
 
 from openmdao.util.decorators import add_delegate
 
+# Message tags used when load balancing.
+_REQUEST_TAG = 1  # Worker -> master: result of last case, ready for next.
+_CASE_TAG = 2     # Master -> worker: index of next case, None when done.
+
 
 @add_delegate(HasVarTreeParameters, HasVarTreeResponses)
 class MPICaseDriver(Driver):
@@ -20,6 +27,25 @@ class MPICaseDriver(Driver):
     """
     implements(IHasParameters, IHasResponses)
 
+    load_balance = Bool(False, iotype='in',
+                        desc='If True, the first parallel workflow hands out'
+                             ' cases one at a time to the others as they'
+                             ' become free, rather than splitting the cases'
+                             ' evenly beforehand.')
+
+    broadcast_results = Bool(True, iotype='in',
+                             desc='If True, all processes receive all case'
+                                  ' outputs. Otherwise only rank 0 does.')
+
+    def __init__(self):
+        super(MPICaseDriver, self).__init__()
+        self._sub_comm = None
+        self._resp_comm = None
+
+        # List of (number of cases, busy time, total time) for each
+        # parallel workflow from the last execution (rank 0 only).
+        self.load_stats = []
+
     def get_req_cpus(self):
         # None means there is no max procs. It will use as many as it's given
         req = self.workflow.get_req_cpus()
@@ -58,47 +84,154 @@ class MPICaseDriver(Driver):
         for path in self.get_responses():
             case_paths[path] = make_legal_path(path)
 
-        sizes, offsets = evenly_distrib_idxs(self._num_parallel_subs,
-                                             length)
-        start = offsets[color]
-        end = start + sizes[color]
-
         self.init_responses(length)
-
-        # Run each parameter set.
-        for i in range(start, end):
-
-            # Set inputs.
-            for j, path in enumerate(inputs):
-                self.set_parameter_by_name(path, values[j][i])
-
-            # Run workflow.
-            with MPIContext():
-                self.run_iteration()
-
-            # Get outputs.
-            for path in self.get_responses():
-                cpath = case_paths[path]
-                self.case_outputs.get(cpath)[i] = self.parent.get(path)
+        start_time = time.time()
+
+        if self.load_balance and self._num_parallel_subs > 1:
+            ncases, busy = self._run_balanced(length, inputs, values,
+                                              case_paths)
+            owners = None
+        else:
+            sizes, offsets = evenly_distrib_idxs(self._num_parallel_subs,
+                                                 length)
+            start = offsets[color]
+            end = start + sizes[color]
+            ncases, busy = self._run_cases(range(start, end), inputs, values,
+                                           case_paths)
+            owners = zip(offsets, sizes)
 
         if self._num_parallel_subs > 1:
-            # Now, collect the results back from all parallel processes
-            for path in self.get_responses():
-                path = case_paths[path]
-                vals = self.case_outputs.get(path)
-                if self._resp_comm != MPI.COMM_NULL:
-                    allvals = self._resp_comm.gather(vals, root=0)
-
-                    if self._resp_comm.rank == 0:
-                        for i in range(self._num_parallel_subs):
-                            vals[offsets[i]:offsets[i]+sizes[i]] = allvals[i][offsets[i]:offsets[i]+sizes[i]]
-                        junk = self.mpi.comm.bcast(vals, root=0)
-                    else:
-                        vals = self.mpi.comm.bcast(None, root=0)
+            self._collect_results(case_paths, owners)
+            self._collect_stats(ncases, busy, time.time() - start_time)
+
+    def _run_cases(self, indices, inputs, values, case_paths):
+        """
+        Run the cases with the given `indices`, returning the number run
+        and the time taken.
+        """
+        busy = 0.
+        for i in indices:
+            start = time.time()
+            self._run_case(i, inputs, values, case_paths)
+            busy += time.time() - start
+        return (len(indices), busy)
+
+    def _run_case(self, i, inputs, values, case_paths):
+        """ Run case `i` and save its outputs in ``case_outputs``. """
+        # Set inputs.
+        for j, path in enumerate(inputs):
+            self.set_parameter_by_name(path, values[j][i])
+
+        # Run workflow.
+        with MPIContext():
+            self.run_iteration()
+
+        # Get outputs.
+        for path in self.get_responses():
+            cpath = case_paths[path]
+            self.case_outputs.get(cpath)[i] = self.parent.get(path)
+
+    def _run_balanced(self, length, inputs, values, case_paths):
+        """
+        Run cases handed out by the first parallel workflow, which acts as
+        master. Returns the number of cases run and the time taken.
+        """
+        if self._resp_comm == MPI.COMM_NULL:
+            # Not a leader, run whatever case our leader is given.
+            if self._color[self.mpi.rank] == 0:
+                return (0, 0.)  # Master has nothing to do.
+            ncases = 0
+            busy = 0.
+            while True:
+                i = self._sub_comm.bcast(None, root=0)
+                if i is None:
+                    return (ncases, busy)
+                start = time.time()
+                self._run_case(i, inputs, values, case_paths)
+                busy += time.time() - start
+                ncases += 1
+
+        if self._resp_comm.rank == 0:
+            self._hand_out_cases(length, case_paths)
+            return (0, 0.)
+
+        # Worker: send the result of the last case with each request.
+        ncases = 0
+        busy = 0.
+        result = None
+        while True:
+            self._resp_comm.send(result, dest=0, tag=_REQUEST_TAG)
+            i = self._resp_comm.recv(source=0, tag=_CASE_TAG)
+            self._sub_comm.bcast(i, root=0)
+            if i is None:
+                return (ncases, busy)
+            start = time.time()
+            self._run_case(i, inputs, values, case_paths)
+            busy += time.time() - start
+            ncases += 1
+            result = (i, [(cpath, self.case_outputs.get(cpath)[i])
+                          for cpath in case_paths.values()])
+
+    def _hand_out_cases(self, length, case_paths):
+        """
+        Hand out case indices to the other parallel workflows as they
+        request them, saving the results they send back.
+        """
+        status = MPI.Status()
+        todo = range(length-1, -1, -1)
+        active = self._num_parallel_subs - 1
+        while active:
+            result = self._resp_comm.recv(source=MPI.ANY_SOURCE,
+                                          tag=_REQUEST_TAG, status=status)
+            if result is not None:
+                i, outputs = result
+                for cpath, value in outputs:
+                    self.case_outputs.get(cpath)[i] = value
+            if todo:
+                i = todo.pop()
+            else:
+                i = None
+                active -= 1
+            self._resp_comm.send(i, dest=status.Get_source(), tag=_CASE_TAG)
+
+    def _collect_results(self, case_paths, owners):
+        """
+        Collect the case outputs computed by each parallel workflow into
+        rank 0, then broadcast them if `broadcast_results` is set.
+        `owners` is a list of ``(offset, size)`` of the cases run by each
+        parallel workflow, or None if rank 0 already has all the results.
+        """
+        for path in self.get_responses():
+            path = case_paths[path]
+            vals = self.case_outputs.get(path)
+            if owners is not None and self._resp_comm != MPI.COMM_NULL:
+                allvals = self._resp_comm.gather(vals, root=0)
+                if self._resp_comm.rank == 0:
+                    for i, (offset, size) in enumerate(owners):
+                        vals[offset:offset+size] = allvals[i][offset:offset+size]
+
+            if self.broadcast_results:
+                if self.mpi.comm.rank == 0:
+                    self.mpi.comm.bcast(vals, root=0)
                 else:
-                    vals = self.mpi.comm.bcast(vals, root=0)
+                    vals = self.mpi.comm.bcast(None, root=0)
 
-                self.case_outputs.set(path, vals)
+            self.case_outputs.set(path, vals)
+
+    def _collect_stats(self, ncases, busy, elapsed):
+        """
+        Gather the number of cases run and busy time of each parallel
+        workflow into :attr:`load_stats` on rank 0, and log them.
+        """
+        if self._resp_comm == MPI.COMM_NULL:
+            return
+        stats = self._resp_comm.gather((ncases, busy, elapsed), root=0)
+        if self._resp_comm.rank == 0:
+            self.load_stats = stats
+            for i, (ncases, busy, elapsed) in enumerate(stats):
+                self._logger.info('workflow %d: %d cases, %.3f s busy'
+                                  ' (%.1f%%)', i, ncases, busy,
+                                  100. * busy / elapsed if elapsed else 0.)
 
     def setup_communicators(self, comm):
         self.mpi.comm = comm
@@ -122,6 +255,7 @@ class MPICaseDriver(Driver):
             resp_color.extend([MPI.UNDEFINED] * leftover)
 
         sub_comm = comm.Split(color[rank])
+        self._sub_comm = sub_comm
         self._color = color
 
         # if we weren't given enough procs to run parallel workflows,
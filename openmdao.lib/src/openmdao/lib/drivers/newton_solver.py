@@ -48,6 +48,12 @@ class NewtonSolver(Driver):
     alpha = Float(1.0, iotype='in', low=0.0, high=1.0,
                   desc='Initial over-relaxation factor')
 
+    jac_reuse = Int(1, low=1, iotype='in',
+                    desc='Number of iterations that use the same '
+                    'linearization. 1 is a full Newton method. Larger values '
+                    'give a modified Newton method, which linearizes again '
+                    'sooner if an iteration fails to reduce the residual.')
+
     iprint = Enum(0, [0, 1, 2], iotype='in', desc='set to 1 to print '
                   'convergence. Set to 2 to get backtracking convergence '
                   'as well.')
@@ -79,10 +85,17 @@ class NewtonSolver(Driver):
 
         itercount = 0
         alpha = self.alpha
+
+        # Number of iterations since the last linearization.
+        jac_age = None
         while itercount < self.max_iteration and f_norm > self.atol and \
               f_norm/f_norm0 > self.rtol:
 
-            system.calc_newton_direction(options=options)
+            relinearize = jac_age is None or jac_age >= self.jac_reuse
+            system.calc_newton_direction(options=options,
+                                         linearize=relinearize)
+            jac_age = 1 if relinearize else jac_age + 1
+            f_norm_prev = f_norm
 
             #print "LS 1", uvec.array, '+', dfvec.array
             uvec.array += alpha*dfvec.array
@@ -119,6 +132,11 @@ class NewtonSolver(Driver):
             # Reset backtracking
             alpha = self.alpha
 
+            # An old linearization that doesn't reduce the residual is
+            # replaced on the next iteration.
+            if f_norm >= f_norm_prev:
+                jac_age = None
+
         # Need to make sure the whole workflow is executed at the final
         # point, not just evaluated.
         self.pre_iteration()
@@ -158,6 +158,17 @@ class CaseComponent(Component):
         self.y = self.x
 
 
+class ExtraComponent(Component):
+
+    x = Float(iotype='in')
+    y = Float(iotype='out')
+    z = Float(iotype='out')
+
+    def execute(self):
+        self.y = self.x
+        self.z = 2. * self.x
+
+
 class TreeModel(Assembly):
 
     def configure(self):
@@ -248,6 +259,73 @@ class TestCase(unittest.TestCase):
         self.model.driver.extra_resources = {'allocator': name}
         self.run_cases(sequential=False)
 
+    def test_batches(self):
+        logging.debug('')
+        logging.debug('test_batches')
+        init_cluster(encrypted=True, allow_shell=True)
+        driver = self.model.driver
+        driver.reload_model = False
+        driver.batch_size = 4
+        self.run_cases(sequential=False)
+
+        # Errors are reported per case within a batch.
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+    def test_batches_recorded(self):
+        logging.debug('')
+        logging.debug('test_batches_recorded')
+        init_cluster(encrypted=True, allow_shell=True)
+
+        top = set_as_top(Assembly())
+        top.recorders = [ListCaseRecorder()]
+        cid = top.add('driver', CaseIteratorDriver())
+        top.add('comp', ExtraComponent())
+        cid.workflow.add('comp')
+        cid.add_parameter('comp.x')
+        cid.add_response('comp.y')
+        cid.sequential = False
+        cid.reload_model = False
+        cid.batch_size = 2
+        cid.case_inputs.comp.x = range(5)
+        top.run()
+
+        self.assertEqual(list(cid.case_outputs.comp.y), range(5))
+
+        # comp.z isn't a response, so it's only sent to the recorders.
+        recorded = {}
+        for case in top.recorders[0].get_iterator():
+            if 'comp.x' in case._inputs:
+                recorded[case.get_input('comp.x')] = case.get_output('comp.z')
+        self.assertEqual(recorded, dict((x, 2.*x) for x in range(5)))
+
+    def test_reuse_servers(self):
+        logging.debug('')
+        logging.debug('test_reuse_servers')
+        init_cluster(encrypted=True, allow_shell=True)
+        driver = self.model.driver
+        driver.reuse_servers = True
+        driver.reload_model = False
+
+        self.run_cases(sequential=False)
+        servers = set(driver._servers)
+        egg_file = driver._egg_file
+        self.assertTrue(servers)
+        self.assertTrue(os.path.exists(egg_file))
+
+        # New cases and a changed unconnected input use the same servers
+        # and egg.
+        self.generate_cases()
+        self.model.driven.sleep = 0.1
+        self.model.run()
+        self.verify_results()
+        self.assertEqual(set(driver._servers), servers)
+        self.assertEqual(driver._egg_file, egg_file)
+
+        driver.release_servers()
+        self.assertEqual(driver._servers, {})
+        self.assertFalse(os.path.exists(egg_file))
+
     def run_cases(self, sequential, forced_errors=False, retry=True):
         """ Evaluate cases, either sequentially or across multiple servers. """
         driver = self.model.driver
@@ -189,6 +189,19 @@ class Newton_SolverTestCase(unittest.TestCase):
                                self.top.d2.y2,
                                1.0e-4)
 
+    def test_modified_newton(self):
+
+        self.top.run()
+        full_linearizations = self.top.d1.derivative_exec_count
+
+        top = set_as_top(Sellar_MDA())
+        top.driver.jac_reuse = 4
+        top.run()
+
+        assert_rel_error(self, top.d1.y1, top.d2.y1, 1.0e-4)
+        assert_rel_error(self, top.d1.y2, top.d2.y2, 1.0e-4)
+        self.assertTrue(top.d1.derivative_exec_count < full_linearizations)
+
     def test_newton_flip_constraint(self):
 
         self.top.driver.clear_constraints()
@@ -1,9 +1,10 @@
 """ Surrogate model based on Kriging. """
-from math import log, e, sqrt
+from math import log
 
 # pylint: disable-msg=E0611,F0401
 from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
-                  sum, log10
+                  sum, log10, sqrt, diag, logaddexp, newaxis, triu_indices
+from numpy import log as np_log
 from numpy.linalg import det, linalg, lstsq
 from scipy.linalg import cho_factor, cho_solve
 from scipy.optimize import minimize
@@ -32,6 +33,19 @@ class KrigingSurrogate(Container):
         self.mu = None
         self.log_likelihood = None
 
+        # Training data as arrays, and squared distances between pairs of
+        # training points (upper triangle of R), independent of thetas.
+        self._X = None
+        self._Y = None
+        self._triu = None
+        self._dist = None
+
+        # Solutions reused by predictions: R^-1 (Y - mu), R^-1 one and
+        # one^T R^-1 one.
+        self._alpha = None
+        self._Rinv_one = None
+        self._one_Rinv_one = None
+
     def get_uncertain_value(self, value):
         """Returns a NormalDistribution centered around the value, with a
         standard deviation of 0."""
@@ -41,55 +55,41 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = self.predict_batch(new_x)
+        return NormalDistribution(f[0], RMSE[0])
+
+    def predict_batch(self, X):
+        """Calculates predicted values of the response and their root mean
+        squared errors for each row of `X`, an array of shape (n_points,
+        n_inputs), using one set of matrix operations for all points.
+
+        Returns a tuple of arrays ``(mu, RMSE)`` of length n_points.
+        """
         if self.m is None:  # untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
+        X = array(X, dtype=float).reshape(-1, self.m)
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i] - new_x)**2.)
-        r = exp(-r)
 
-        one = ones(self.n)
+        # Correlation of each new point with each training point.
+        r = exp(-dot((X[:, newaxis, :] - self._X[newaxis, :, :])**2.,
+                     thetas))
+
         if self.R_fact is not None:
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-
+            Rinv_r = cho_solve(self.R_fact, r.T)
         else:
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
+            Rinv_r = lstsq(self.R.T, r.T)[0]
+
+        f = self.mu + dot(r, self._alpha)
+        term1 = sum(r*Rinv_r.T, 1)
+        term2 = (1.0 - sum(Rinv_r, 0))**2./self._one_Rinv_one
 
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
         MSE = self.sig2*(1.0 - term1 + term2)
         RMSE = sqrt(abs(MSE))
 
-        dist = NormalDistribution(f, RMSE)
-        return dist
+        return f, RMSE
 
     def train(self, X, Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -108,6 +108,11 @@ class KrigingSurrogate(Container):
         self.m = len(X[0])
         self.n = len(X)
 
+        self._X = array(X, dtype=float)
+        self._Y = array(Y, dtype=float)
+        self._triu = triu_indices(self.n, 1)
+        self._dist = (self._X[self._triu[0]] - self._X[self._triu[1]])**2.
+
         thetas = zeros(self.m)
         #print "initial guess", thetas
 
@@ -138,12 +143,11 @@ class KrigingSurrogate(Container):
         #if self.m == None:
         #    Give error message
         R = zeros((self.n, self.n))
-        X, Y = array(self.X), array(self.Y)
+        Y = self._Y
         thetas = 10.**self.thetas
 
         #weighted distance formula
-        for i in range(self.n):
-            R[i, i+1:self.n] = e**(-sum(thetas*(X[i] - X[i+1:self.n])**2., 1))
+        R[self._triu] = exp(-dot(self._dist, thetas))
 
         R = R*(1.0 - self.nugget)
         R = R + R.T + eye(self.n)
@@ -153,16 +157,18 @@ class KrigingSurrogate(Container):
         try:
             self.R_fact = cho_factor(R)
             rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
+            cho = cho_solve(self.R_fact, rhs).T
 
             self.mu = dot(one, cho[0])/dot(one, cho[1])
             ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, cho_solve(self.R_fact,
-                                                (ymdotone)))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
+            self._alpha = cho_solve(self.R_fact, ymdotone)
+            self._Rinv_one = cho[1]
+            self.sig2 = dot(ymdotone, self._alpha)/self.n
+
+            # log(det(R) + 1e-16) using log(det(R)) from the Cholesky factor.
+            log_det = 2.*sum(np_log(diag(self.R_fact[0])))
             self.log_likelihood = -self.n/2.*log(self.sig2) - \
-                                  1./2.*log(abs(det(self.R) + 1.e-16))
+                                  1./2.*logaddexp(log_det, log(1.e-16))
 
         except (linalg.LinAlgError, ValueError):
             #------LSTSQ---------
@@ -172,11 +178,15 @@ class KrigingSurrogate(Container):
             lsq = lstsq(self.R.T, rhs)[0].T
             self.mu = dot(one, lsq[0])/dot(one, lsq[1])
             ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, lstsq(self.R, ymdotone)[0])/self.n
+            self._alpha = lstsq(self.R, ymdotone)[0]
+            self._Rinv_one = lsq[1]
+            self.sig2 = dot(ymdotone, self._alpha)/self.n
             self.log_likelihood = -self.n/2.*log(self.sig2) - \
                                    1./2.*log(abs(det(self.R) + 1.e-16))
             #print self.log_likelihood
 
+        self._one_Rinv_one = dot(one, self._Rinv_one)
+
 
 class FloatKrigingSurrogate(KrigingSurrogate):
     """Surrogate model based on the simple Kriging interpolation. Predictions are returned as floats,
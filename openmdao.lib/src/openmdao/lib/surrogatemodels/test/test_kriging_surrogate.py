@@ -68,6 +68,30 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(5.79, pred.sigma, places=0)
         self.assertAlmostEqual(25.34, pred.mu, places=1)
 
+    def test_predict_batch(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5], [-3.5, 6.], [4., 7.5], [-5., 9.], [5.5, 10.5],
+                   [10., 12.], [7., 13.5], [2.5, 15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+
+        new_x = array([[-2., 0.], [5., 5.], [0.3, 8.2], [9., 1.]])
+        mu, rmse = krig1.predict_batch(new_x)
+        self.assertEqual(mu.shape, (4,))
+        self.assertEqual(rmse.shape, (4,))
+        for i, point in enumerate(new_x):
+            pred = krig1.predict(point)
+            self.assertAlmostEqual(pred.mu, mu[i], places=8)
+            self.assertAlmostEqual(pred.sigma, rmse[i], places=8)
+
+        self.assertAlmostEqual(bran(x[0]), mu[0], places=5)
+        self.assertAlmostEqual(25.34, mu[1], places=1)
+
     def test_get_uncertain_value(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542, -0.210367746201974, -0.489015457891476, 12.3033138316612])
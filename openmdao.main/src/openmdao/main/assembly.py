@@ -7,6 +7,7 @@ __all__ = ['Assembly', 'set_as_top']
 from fnmatch import fnmatch
 import re
 import sys
+import time
 import traceback
 from itertools import chain
 
@@ -45,6 +46,8 @@ from openmdao.main.depgraph import DependencyGraph, all_comps, \
 from openmdao.main.systems import SimpleSystem, SerialSystem, ParamSystem, \
                                   _create_simple_sys, OpaqueSystem
 from openmdao.main.mpiwrap import to_idx_array
+from openmdao.main import setupstats
+from openmdao.main.setupstats import timed
 
 from openmdao.util.graph import list_deriv_vars, base_var, fix_single_tuple
 from openmdao.util.log import logger
@@ -159,10 +162,34 @@ class Assembly(Component):
         # all later transformations.
         self._depgraph = None
 
+        # nodes added to _depgraph for each component during the last
+        # setup, keyed by component name, so they can be reused if the
+        # component hasn't changed.
+        self._comp_graphs = {}
+
         # this is created from _depgraph. All _depgraph variable connections
         # are collapsed into single nodes
         self._reduced_graph = None
 
+        # signature of the last completed _setup, so a repeated setup for
+        # the same inputs, outputs and driver can be skipped
+        self._setup_key = None
+        self._setup_stats = dict(count=0, reused=0, time=0., last_time=0.,
+                                 phases={}, graphs={}, vector_size=0)
+
+        # execution cache size used by any child Component whose
+        # exec_cache_size is None.  0 disables execution caching.
+        self.default_exec_cache_size = 0
+
+        # whether any child Component whose vector_views is None shares
+        # its float array variables with the system vectors.
+        self.default_vector_views = False
+
+        # whether any child Component whose reuse_linearization is None
+        # skips linearization when its inputs, outputs and states are
+        # unchanged.
+        self.default_reuse_linearization = False
+
         # default Driver executes its workflow once
         self.add('driver', Driver())
 
@@ -710,6 +737,7 @@ class Assembly(Component):
 
         self._pre_driver = None
         self._system = None
+        self._setup_key = None
 
     def _set_failed(self, path, value):
         parts = path.split('.', 1)
@@ -1215,10 +1243,11 @@ class Assembly(Component):
             self._depgraph.add_boundary_var(self, name,
                                             iotype='out')
 
+        comp_graphs = {}
         for cname in self.list_containers():
             obj = getattr(self, cname)
             if cname not in self._depgraph and has_interface(obj, IComponent):
-                self._depgraph.add_component(cname, obj)
+                comp_graphs[cname] = self._add_component_graph(cname, obj)
 
         # add our connections to the graph.  Some connections, e.g.,
         # connections with unit conversions and connections involving
@@ -1287,6 +1316,30 @@ class Assembly(Component):
             if has_interface(comp, IDriver) or has_interface(comp, IAssembly):
                 comp.setup_depgraph(self._depgraph)
 
+        # Connecting components marks their configuration as changed, so
+        # record versions only now that the graph is complete.
+        self._comp_graphs = {}
+        for cname, graph in comp_graphs.items():
+            obj = getattr(self, cname)
+            self._comp_graphs[cname] = (obj, _config_version(obj), graph)
+
+    def _add_component_graph(self, cname, obj):
+        """Add nodes for component `obj` and its variables to our depgraph,
+        reusing those from the last setup if `obj` hasn't been reconfigured
+        since then.  Returns the graph holding just those nodes.
+        """
+        cached = self._comp_graphs.get(cname)
+        if cached is not None and cached[0] is obj and \
+           cached[1] == _config_version(obj):
+            graph = cached[2]
+            self._depgraph.add_graph(graph)
+            self._depgraph.update_differentiable(obj, cname)
+        else:
+            graph = DependencyGraph()
+            graph.add_component(cname, obj)
+            self._depgraph.add_graph(graph)
+        return graph
+
     def setup_reduced_graph(self, inputs=None, outputs=None, drvname=None):
         """Create the graph we need to do the breakdown of the model
         into Systems.
@@ -1366,7 +1419,8 @@ class Assembly(Component):
                 dgraph.add_connected_subvar(out)
 
         if not skip:
-            dgraph = dgraph.relevant_subgraph(inputs, outputs, keep)
+            dgraph = timed('relevant_subgraph', dgraph.relevant_subgraph,
+                           inputs, outputs, keep)
 
         dgraph._remove_vartrees(self)
 
@@ -1660,31 +1714,47 @@ class Assembly(Component):
         calc_gradient is called with input or output lists that
         differ from the lists of parameters or objectives/constraints
         that are inherent to the model.
+
+        If the configuration hasn't changed since the last setup, which was
+        done for the same `inputs`, `outputs`, and `drvname`, then the
+        existing system hierarchy is reused.
         """
         # only perform full setup if we're the top Assembly
         if self.parent:
             return
 
+        key = (drvname, _setup_sig(inputs), _setup_sig(outputs))
+        if key == self._setup_key and self._system is not None and \
+           not self._new_config:
+            # Solvers and the 'u' vector are all a new setup would change.
+            self._system.clear_solvers()
+            self.post_setup()
+            self._setup_stats['reused'] += 1
+            return
+        self._setup_key = None
+
         if MPI:
             MPI.COMM_WORLD.Set_errhandler(MPI.ERRORS_ARE_FATAL)
             comm = MPI.COMM_WORLD
         else:
             comm = None
 
+        setupstats.start()
+        t0 = time.time()
         try:
-            self.setup_init()
+            timed('setup_init', self.setup_init)
 
-            self.setup_depgraph()
-            self.compute_itersets(None)
-            self.compute_ordering(None)
+            timed('setup_depgraph', self.setup_depgraph)
+            timed('compute_itersets', self.compute_itersets, None)
+            timed('compute_ordering', self.compute_ordering, None)
 
-            self.init_var_sizes()
+            timed('init_var_sizes', self.init_var_sizes)
 
-            self.setup_reduced_graph(inputs=inputs, outputs=outputs,
-                                     drvname=drvname)
-            self.setup_systems()
+            timed('setup_reduced_graph', self.setup_reduced_graph,
+                  inputs=inputs, outputs=outputs, drvname=drvname)
+            timed('setup_systems', self.setup_systems)
 
-            self.check_config()
+            timed('check_config', self.check_config)
 
             # if MPI.COMM_WORLD.rank == 0:
             #     from openmdao.util.dotgraph import plot_system_tree, plot_graph
@@ -1692,16 +1762,18 @@ class Assembly(Component):
             #     plot_graph(self._reduced_graph, 'red.pdf')
 
             # communicators are distributed and dist idxs are gathered from comps here
-            self.setup_communicators(comm)
+            timed('setup_communicators', self.setup_communicators, comm)
 
-            self.collect_metadata()
+            timed('collect_metadata', self.collect_metadata)
 
-            self.get_var_print_ranks()
+            timed('get_var_print_ranks', self.get_var_print_ranks)
 
-            self.setup_variables()
-            self.setup_sizes()
-            self.setup_vectors()
-            self.setup_scatters()
+            timed('setup_variables', self.setup_variables)
+            timed('setup_sizes', self.setup_sizes)
+            timed('setup_vectors', self.setup_vectors)
+            timed('setup_scatters', self.setup_scatters)
+
+            timed('post_setup', self.post_setup)
 
         except Exception as err:
             exc = sys.exc_info()
@@ -1709,7 +1781,80 @@ class Assembly(Component):
             sys.stderr.flush()
             raise exc[0], exc[1], exc[2]
 
-        self.post_setup()
+        finally:
+            phases = setupstats.stop()
+
+        elapsed = time.time() - t0
+
+        self._setup_key = key
+        stats = self._setup_stats
+        stats['count'] += 1
+        stats['time'] += elapsed
+        stats['last_time'] = elapsed
+        stats['phases'] = phases
+        stats['graphs'] = dict(depgraph=_graph_size(self._depgraph),
+                               reduced_graph=_graph_size(self._reduced_graph))
+        if self._system.is_active():
+            stats['vector_size'] = self._system.vec['u'].array.size
+        else:
+            stats['vector_size'] = 0
+
+        self._logger.debug("setup took %.3f s (%s), depgraph %d nodes/%d"
+                           " edges, reduced graph %d nodes/%d edges",
+                           elapsed,
+                           ', '.join(['%s %.3f' % item
+                                      for item in phases.items()]),
+                           *(stats['graphs']['depgraph'] +
+                             stats['graphs']['reduced_graph']))
+
+    def get_setup_stats(self):
+        """Return a dict of statistics on the system setups done by this
+        (top level) Assembly:
+
+        count
+            number of full setups
+        reused
+            number of setups skipped because the existing system hierarchy
+            could be reused
+        time
+            total time in seconds spent in full setups
+        last_time
+            time in seconds of the most recent full setup
+        phases
+            OrderedDict mapping each stage of the most recent full setup to
+            its time in seconds.  Besides the setup phases themselves, this
+            includes stages timed within them (e.g., 'relevant_subgraph' is
+            part of 'setup_reduced_graph'), totalled over all Assemblies.
+        graphs
+            (nodes, edges) counts of the 'depgraph' and 'reduced_graph' of
+            this Assembly from the most recent full setup
+        vector_size
+            size of the top level 'u' vector on this process
+        """
+        stats = self._setup_stats.copy()
+        stats['phases'] = stats['phases'].copy()
+        stats['graphs'] = stats['graphs'].copy()
+        return stats
+
+
+def _graph_size(graph):
+    """Return the (nodes, edges) counts of `graph`."""
+    if graph is None:
+        return (0, 0)
+    return (graph.number_of_nodes(), graph.number_of_edges())
+
+
+def _config_version(comp):
+    """Return the number of times `comp` has been reconfigured."""
+    return getattr(comp, '_config_version', 0)
+
+
+def _setup_sig(names):
+    """Return a hashable version of a list of inputs or outputs."""
+    if names is None:
+        return None
+    return tuple([tuple(name) if isinstance(name, list) else name
+                  for name in names])
 
 
 def dump_iteration_tree(obj, f=sys.stdout, full=True, tabsize=4, derivs=False):
@@ -170,6 +170,22 @@ class Component(Container):
         self._case_id = ''
         self._case_uuid = ''
 
+        # Max number of input/output sets to memoize so that execution can
+        # be skipped when inputs are unchanged. None means use the
+        # default_exec_cache_size of our parent Assembly. 0 disables caching.
+        self.exec_cache_size = None
+
+        # If True, float array variables are shared with the vectors of our
+        # System (see SimpleSystem.run) instead of being copied.  None means
+        # use the default_vector_views of our parent Assembly.
+        self.vector_views = None
+
+        # If True, our Jacobian is only recalculated when our inputs,
+        # outputs or states have changed since the last linearization.
+        # None means use the default_reuse_linearization of our parent
+        # Assembly.
+        self.reuse_linearization = None
+
     @property
     def dir_context(self):
         """The :class:`DirectoryContext` for this component."""
@@ -675,6 +691,9 @@ class Component(Container):
         self._new_config = True
         self._provideJ_bounds = None
 
+        # lets ExprEvaluators scoped to us know their compiled code is stale
+        self._config_version = getattr(self, '_config_version', 0) + 1
+
     @rbac(('owner', 'user'))
     def list_inputs(self):
         """Return a list of names of input values."""
@@ -331,6 +331,25 @@ class DependencyGraph(DGraphBase):
             if val is not _missing and not is_differentiable_val(val):
                 data['differentiable'] = False
 
+    def add_graph(self, graph):
+        """Add copies of the nodes and edges of `graph`, along with
+        their metadata.
+        """
+        self.add_nodes_from(graph.nodes_iter(data=True))
+        self.add_edges_from(graph.edges_iter(data=True))
+
+    def update_differentiable(self, obj, cname):
+        """Update the 'differentiable' metadata of the variables of
+        component `cname`, which depends on their current values.
+        """
+        for vname in chain(obj.list_inputs(), obj.list_outputs()):
+            data = self.node['.'.join((cname, vname))]
+            val = getattr(obj, vname, _missing)
+            if val is not _missing and not is_differentiable_val(val):
+                data['differentiable'] = False
+            else:
+                data.pop('differentiable', None)
+
     def add_boundary_var(self, obj, name, **kwargs):
         """Add a boundary variable, i.e., one not associated
         with any component in the graph.
@@ -2,7 +2,7 @@ import sys
 
 """ Some functions and objects that support the component-side derivative API.
 """
-from numpy import zeros, vstack, hstack
+from numpy import zeros, vstack, hstack, ndarray
 
 # pylint: disable=E0611,F0401
 from openmdao.main.array_helpers import flatten_slice, flattened_size
@@ -79,9 +79,94 @@ def applyJ(system, variables):
 
     J = system.J
     obj = system.inner()
-    scope = system.scope
+    is_sys = ISystem.providedBy(obj)
+    arg, result = _applyJ_args(system, variables, is_sys)
+
+    # Bail if this component is not connected in the graph
+    if len(arg) == 0 or len(result) == 0:
+        return
 
+    # Speedhack, don't call component's derivatives if incoming vector is zero.
+    nonzero = False
+    for key, value in arg.iteritems():
+        if any(value != 0):
+            nonzero = True
+            break
+
+    if nonzero is False:
+        #print 'applyJ', obj.name, arg, result
+        return
+
+    # If storage of the local Jacobian is a problem, the user can specify the
+    # 'apply_deriv' function instead of provideJ.
+    if J is None and hasattr(obj, 'apply_deriv'):
+
+        # TODO - We shouldn't need to calculate the size of the full arrays,
+        # so the cache shouldn't be needed. Cache is None for now.
+        shape_cache = {}
+
+        # The apply_deriv function expects the argument and result dicts for
+        # each input and output to have the same shape as the input/output.
+        resultkeys = sorted(result.keys())
+        for key in resultkeys:
+            pre_process_dicts(obj, key, result, shape_cache, system.scope,
+                              is_sys)
+
+        argkeys = arg.keys()
+        for key in sorted(argkeys):
+            pre_process_dicts(obj, key, arg, shape_cache, system.scope,
+                              is_sys)
+
+        obj.apply_deriv(arg, result)
+
+        # Result vector needs to be flattened.
+        for key in reversed(resultkeys):
+            post_process_dicts(key, result)
+
+        # Arg is still called afterwards, so flatten it back.
+        for key in argkeys:
+            value = arg[key]
+            if hasattr(value, 'flatten'):
+                arg[key] = value.flatten()
+
+        #print 'applyJ', obj.name, arg, result
+        return
+
+    for okey, ikey, Jsub in _jacobian_blocks(system, obj, is_sys, J,
+                                             arg, result):
+        tmp = result[okey]
+        tmp += Jsub.dot(arg[ikey])
+
+    #print 'applyJ', obj.name, arg, result
+
+
+def jacobian_blocks(system, variables):
+    """Return a list of ``(result, arg, Jsub)`` for the blocks of the
+    Jacobian that :func:`applyJ` would apply for `system`, where `result` is
+    the view of the rhs vector and `arg` the view of the ``du`` or ``dp``
+    vector that `Jsub` maps between. Returns None if the Jacobian of
+    `system` isn't an array (e.g., the component provides apply_deriv).
+    """
+    J = system.J
+    if not isinstance(J, ndarray):
+        return None
+
+    obj = system.inner()
     is_sys = ISystem.providedBy(obj)
+    arg, result = _applyJ_args(system, variables, is_sys)
+    if len(arg) == 0 or len(result) == 0:
+        return []
+
+    return [(result[okey], arg[ikey], Jsub)
+            for okey, ikey, Jsub in _jacobian_blocks(system, obj, is_sys, J,
+                                                     arg, result)]
+
+
+def _applyJ_args(system, variables, is_sys):
+    """Return dicts of the views of the vectors that are the argument and
+    result of :func:`applyJ` for `system`, keyed by variable name.
+    """
+    scope = system.scope
 
     arg = {}
     for item in system.list_states():
@@ -136,54 +221,13 @@ def applyJ(system, variables):
             key = item.partition('.')[-1]
         result[key] = system.rhs_vec[item]
 
-    # Bail if this component is not connected in the graph
-    if len(arg) == 0 or len(result) == 0:
-        return
+    return arg, result
 
-    # Speedhack, don't call component's derivatives if incoming vector is zero.
-    nonzero = False
-    for key, value in arg.iteritems():
-        if any(value != 0):
-            nonzero = True
-            break
-
-    if nonzero is False:
-        #print 'applyJ', obj.name, arg, result
-        return
-
-    # If storage of the local Jacobian is a problem, the user can specify the
-    # 'apply_deriv' function instead of provideJ.
-    if J is None and hasattr(obj, 'apply_deriv'):
-
-        # TODO - We shouldn't need to calculate the size of the full arrays,
-        # so the cache shouldn't be needed. Cache is None for now.
-        shape_cache = {}
-
-        # The apply_deriv function expects the argument and result dicts for
-        # each input and output to have the same shape as the input/output.
-        resultkeys = sorted(result.keys())
-        for key in resultkeys:
-            pre_process_dicts(obj, key, result, shape_cache, scope, is_sys)
-
-        argkeys = arg.keys()
-        for key in sorted(argkeys):
-            pre_process_dicts(obj, key, arg, shape_cache, scope, is_sys)
-
-        obj.apply_deriv(arg, result)
-
-        # Result vector needs to be flattened.
-        for key in reversed(resultkeys):
-            post_process_dicts(key, result)
-
-        # Arg is still called afterwards, so flatten it back.
-        for key in argkeys:
-            value = arg[key]
-            if hasattr(value, 'flatten'):
-                arg[key] = value.flatten()
-
-        #print 'applyJ', obj.name, arg, result
-        return
 
+def _jacobian_blocks(system, obj, is_sys, J, arg, result):
+    """Yield ``(okey, ikey, Jsub)`` for each block of the Jacobian `J` of
+    `obj` mapping ``arg[ikey]`` to ``result[okey]``.
+    """
     if is_sys:
         input_keys = system.list_inputs() + system.list_states()
         output_keys = system.list_outputs() + system.list_residuals()
@@ -221,7 +265,6 @@ def applyJ(system, variables):
                     obj.raise_exception(msg, KeyError)
                 continue
 
-        tmp = result[okey]
         used = set()
         for ikey in arg:
 
@@ -250,9 +293,7 @@ def applyJ(system, variables):
                                       o1, o2, odx, osh)
             #print ikey, okey, Jsub
 
-            tmp += Jsub.dot(arg[ikey])
-
-    #print 'applyJ', obj.name, arg, result
+            yield okey, ikey, Jsub
 
 def applyJT(system, variables):
     """Multiply an input vector by the transposed Jacobian.
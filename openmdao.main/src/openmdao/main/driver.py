@@ -57,6 +57,26 @@ class GradientOptions(VariableTree):
                                 "single block.",
                            framework_var=True)
 
+    fd_processes = Int(1, low=1, desc="Number of processes used to "
+                       "evaluate the finite difference steps concurrently. "
+                       "Each worker is forked from the current process, so "
+                       "this is ignored on Windows and under MPI. The "
+                       "workers share the model's directories, so it is "
+                       "also ignored when the finite differenced components "
+                       "read or write files (e.g. ExternalCode).",
+                       framework_var=True)
+
+    fd_sparsity = Enum('none', ['none', 'graph', 'probe'],
+                       desc="Sparsity detection used to perturb structurally "
+                       "orthogonal Jacobian columns together during finite "
+                       "difference. 'graph' uses the connectivity of the "
+                       "model. 'probe' additionally drops entries that are "
+                       "zero both at the current point and at a random "
+                       "nearby one. The pattern is found on the first "
+                       "finite difference after the model is set up (or "
+                       "calc_gradient is called) and reused until then.",
+                       framework_var=True)
+
     directional_fd = Bool(False, desc="Set to True to do a directional "
                                        "finite difference for each GMRES "
                                        "iteration instead of pre-computing "
@@ -80,7 +100,8 @@ class GradientOptions(VariableTree):
     #                          framework_var=True)
 
     # Linear Solver settings
-    lin_solver = Enum('scipy_gmres', ['scipy_gmres', 'petsc_ksp', 'linear_gs'],
+    lin_solver = Enum('scipy_gmres', ['scipy_gmres', 'scipy_splu', 'petsc_ksp',
+                                      'linear_gs'],
                       desc='Method to use for gradient calculation',
                       framework_var=True)
 
@@ -95,6 +116,24 @@ class GradientOptions(VariableTree):
     iprint = Enum(0, [0, 1], desc="Set to 1 to print out residual of the linear solver",
                   framework_var=True)
 
+    gmres_mode = Enum('iterative', ['iterative', 'direct'],
+                      desc="How scipy_gmres solves for multiple right hand "
+                      "sides. 'iterative' calls gmres once for each right "
+                      "hand side. 'direct' assembles the linear operator "
+                      "once (one applyJ per unknown), LU factors it, and "
+                      "back-solves all right hand sides of the Jacobian "
+                      "from that single factorization.",
+                      framework_var=True)
+
+    preconditioner = Enum('none', ['none', 'block_jacobi', 'linear_gs'],
+                          desc="Preconditioner for scipy_gmres. "
+                          "'block_jacobi' solves with the diagonal block of "
+                          "the assembled Jacobian that belongs to each "
+                          "component. 'linear_gs' runs one linear block "
+                          "Gauss Seidel sweep. Either one is set up once "
+                          "per linearization.",
+                          framework_var=True)
+
 
     def _lin_solver_changed(self, oldls, newls):
         # if PETSc has been imported prior to the creation of a remote object using
@@ -55,7 +55,7 @@ else:
 
 
 from numpy import ndarray, ndindex, zeros, complex, imag, issubdtype
-from openmdao.main.interfaces import IComponent
+from openmdao.main.interfaces import IComponent, IContainerProxy
 from openmdao.main.mp_support import has_interface
 
 _Missing = object()
@@ -334,6 +334,227 @@ class ExprExaminer(ast.NodeVisitor):
     visit_NotIn      = _no_assign
 
 
+class _NotDifferentiable(Exception):
+    """Raised by ExprDifferentiator for an expression it can't handle."""
+    pass
+
+
+def _to_dense(jac):
+    """Return `jac` as a 2D array."""
+    if jac.ndim == 1:
+        return numpy.diag(jac)
+    return jac
+
+
+def _broadcast_jac(jac, size):
+    """Return `jac` for a value that has been broadcast to `size` entries."""
+    if jac.shape[0] == size:
+        return jac
+    if jac.shape[0] != 1:
+        raise _NotDifferentiable('unsupported broadcast')
+    return numpy.repeat(_to_dense(jac), size, axis=0)
+
+
+def _scale_jacs(jacs, factor, size):
+    """Return `jacs` with each row multiplied by the corresponding entry of
+    `factor` (the derivative of an elementwise operation).
+    """
+    factor = numpy.asarray(factor)
+    scaled = {}
+    for var, jac in jacs.items():
+        jac = _broadcast_jac(jac, size)
+        if jac.ndim == 1:
+            scaled[var] = jac * factor.ravel()
+        else:
+            scaled[var] = jac * factor.reshape((-1, 1))
+    return scaled
+
+
+def _add_jacs(jacs1, jacs2, size):
+    """Return the sum of two sets of Jacobians."""
+    result = {}
+    for var in set(jacs1).union(jacs2):
+        jac1 = jacs1.get(var)
+        jac2 = jacs2.get(var)
+        if jac1 is None:
+            result[var] = _broadcast_jac(jac2, size)
+        elif jac2 is None:
+            result[var] = _broadcast_jac(jac1, size)
+        else:
+            jac1 = _broadcast_jac(jac1, size)
+            jac2 = _broadcast_jac(jac2, size)
+            if jac1.ndim != jac2.ndim:
+                jac1, jac2 = _to_dense(jac1), _to_dense(jac2)
+            result[var] = jac1 + jac2
+    return result
+
+
+def _sum_jacs(jacs):
+    """Return Jacobians of the sum of all entries of a value."""
+    return dict([(var, _to_dense(jac).sum(axis=0).reshape((1, -1)))
+                 for var, jac in jacs.items()])
+
+
+# derivatives of functions of one argument, given the argument and the result
+_DERIVATIVES = {
+    numpy.sin: lambda x, y: numpy.cos(x),
+    numpy.cos: lambda x, y: -numpy.sin(x),
+    numpy.tan: lambda x, y: 1. + y*y,
+    numpy.sinh: lambda x, y: numpy.cosh(x),
+    numpy.cosh: lambda x, y: numpy.sinh(x),
+    numpy.tanh: lambda x, y: 1. - y*y,
+    numpy.exp: lambda x, y: y,
+    numpy.expm1: lambda x, y: y + 1.,
+    numpy.log: lambda x, y: 1. / x,
+    numpy.log10: lambda x, y: 1. / (x * math.log(10.)),
+    numpy.log1p: lambda x, y: 1. / (1. + x),
+    numpy.sqrt: lambda x, y: 0.5 / y,
+    numpy.fabs: lambda x, y: numpy.sign(x),
+    numpy.abs: lambda x, y: numpy.sign(x),
+    numpy.degrees: lambda x, y: 180. / math.pi,
+    numpy.radians: lambda x, y: math.pi / 180.,
+    abs: lambda x, y: numpy.sign(x),
+    math.sin: lambda x, y: math.cos(x),
+    math.cos: lambda x, y: -math.sin(x),
+    math.tan: lambda x, y: 1. + y*y,
+    math.exp: lambda x, y: y,
+    math.log: lambda x, y: 1. / x,
+    math.sqrt: lambda x, y: 0.5 / y,
+    math.asin: lambda x, y: 1. / math.sqrt(1. - x*x),
+    math.acos: lambda x, y: -1. / math.sqrt(1. - x*x),
+    math.atan: lambda x, y: 1. / (1. + x*x),
+    math.asinh: lambda x, y: 1. / math.sqrt(x*x + 1.),
+    math.acosh: lambda x, y: 1. / math.sqrt(x*x - 1.),
+    math.atanh: lambda x, y: 1. / (1. - x*x),
+}
+
+
+class ExprDifferentiator(ast.NodeVisitor):
+    """Forward mode differentiation of an expression AST in which each
+    variable reference has been replaced by ``var_dict['varname']``, as
+    done by :meth:`ExprEvaluator.evaluate_gradient`.
+
+    Visiting a node returns ``(value, jacs)``, where `jacs` maps each
+    variable the node depends on to the Jacobian of the flattened value
+    with respect to the flattened variable. Jacobians of elementwise
+    operations on a single array are kept as 1D arrays holding just the
+    diagonal. Raises _NotDifferentiable for anything other than arithmetic
+    and a known set of math functions of variables.
+    """
+    def __init__(self, var_dict):
+        super(ExprDifferentiator, self).__init__()
+        self.var_dict = var_dict
+
+    def _var_name(self, node):
+        """Return the variable name if `node` is a variable reference."""
+        if isinstance(node, ast.Subscript) and \
+           isinstance(node.value, ast.Name) and \
+           node.value.id == 'var_dict' and \
+           isinstance(node.slice, ast.Index) and \
+           isinstance(node.slice.value, ast.Str):
+            return node.slice.value.s
+        return None
+
+    def _eval(self, node):
+        """Return the value of `node`."""
+        expr = ast.fix_missing_locations(ast.Expression(body=node))
+        return eval(compile(expr, '<string>', 'eval'), _expr_dict,
+                    {'var_dict': self.var_dict})
+
+    def generic_visit(self, node):
+        # Subexpressions that don't reference variables are constants.
+        for sub in ast.walk(node):
+            if self._var_name(sub) is not None:
+                raise _NotDifferentiable('unsupported operation %s'
+                                         % node.__class__.__name__)
+        return (self._eval(node), {})
+
+    def visit_Expression(self, node):
+        return self.visit(node.body)
+
+    def visit_Subscript(self, node):
+        name = self._var_name(node)
+        if name is None:
+            return self.generic_visit(node)
+        val = self.var_dict[name]
+        return (val, {name: numpy.ones(numpy.size(val))})
+
+    def visit_UnaryOp(self, node):
+        val, jacs = self.visit(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return (val, jacs)
+        elif isinstance(node.op, ast.USub):
+            return (-val, _scale_jacs(jacs, -1., numpy.size(val)))
+        return self.generic_visit(node)
+
+    def visit_BinOp(self, node):
+        left, ljacs = self.visit(node.left)
+        right, rjacs = self.visit(node.right)
+        if not (ljacs or rjacs):
+            return self.generic_visit(node)
+        return self._binop(node.op, left, ljacs, right, rjacs)
+
+    def _binop(self, op, left, ljacs, right, rjacs):
+        """Return value and Jacobians of ``left <op> right``."""
+        if isinstance(op, ast.Add):
+            val = left + right
+            return (val, _add_jacs(ljacs, rjacs, numpy.size(val)))
+        elif isinstance(op, ast.Sub):
+            val = left - right
+            size = numpy.size(val)
+            return (val, _add_jacs(ljacs, _scale_jacs(rjacs, -1., size), size))
+        elif isinstance(op, ast.Mult):
+            val = left * right
+            size = numpy.size(val)
+            return (val, _add_jacs(_scale_jacs(ljacs, right, size),
+                                   _scale_jacs(rjacs, left, size), size))
+        elif isinstance(op, ast.Div):
+            val = left / right
+            size = numpy.size(val)
+            return (val, _add_jacs(_scale_jacs(ljacs, 1. / right, size),
+                                   _scale_jacs(rjacs, -val / right, size),
+                                   size))
+        elif isinstance(op, ast.Pow):
+            val = left ** right
+            size = numpy.size(val)
+            jacs = {}
+            if ljacs:
+                jacs = _scale_jacs(ljacs, right * left ** (right - 1.), size)
+            if rjacs:
+                jacs = _add_jacs(jacs, _scale_jacs(rjacs,
+                                                   numpy.log(left) * val,
+                                                   size), size)
+            return (val, jacs)
+        raise _NotDifferentiable('unsupported operator %s'
+                                 % op.__class__.__name__)
+
+    def visit_Call(self, node):
+        if node.keywords or node.starargs or node.kwargs:
+            return self.generic_visit(node)
+
+        args = [self.visit(arg) for arg in node.args]
+        if not [jacs for val, jacs in args if jacs]:
+            return self.generic_visit(node)
+
+        func = self._eval(node.func)
+        if len(args) == 1:
+            arg, jacs = args[0]
+            if func is numpy.sum:
+                return (func(arg), _sum_jacs(jacs))
+            try:
+                deriv = _DERIVATIVES[func]
+            except (KeyError, TypeError):
+                raise _NotDifferentiable('unsupported function %s' % func)
+            val = func(arg)
+            return (val, _scale_jacs(jacs, deriv(arg, val), numpy.size(val)))
+
+        elif len(args) == 2 and func is numpy.power:
+            (left, ljacs), (right, rjacs) = args
+            return self._binop(ast.Pow(), left, ljacs, right, rjacs)
+
+        raise _NotDifferentiable('unsupported function %s' % func)
+
+
 class ExprEvaluator(object):
     """A class that translates an expression string into a new string
     containing any necessary framework access functions, e.g., set, get. The
@@ -354,6 +575,8 @@ class ExprEvaluator(object):
         self.getter = getter
         self.var_names = set()
         self.cached_grad_eq = None
+        self._grad_root = None
+        self._fast_version = None
 
     @property
     def text(self):
@@ -364,6 +587,7 @@ class ExprEvaluator(object):
     def text(self, value):
         self._code = self._assignment_code = None
         self._examiner = self.cached_grad_eq = None
+        self._fast_code = None
         self._text = value
 
     @property
@@ -383,6 +607,7 @@ class ExprEvaluator(object):
         if scp is None or value is not scp:
             self._code = self._assignment_code = None
             self._examiner = self.cached_grad_eq = None
+            self._fast_code = None
             if value is not None:
                 self._scope = weakref.ref(value)
             else:
@@ -455,13 +680,16 @@ class ExprEvaluator(object):
         # remove weakref to scope because it won't pickle
         state['_scope'] = self.scope
         state['_code'] = None  # <type 'code'> won't pickle either.
+        state['_fast_code'] = None
         state['cached_grad_eq'] = None
+        state['_grad_root'] = None
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
         return state
 
     def __setstate__(self, state):
         """Restore this component's state."""
+        self._fast_code = self._fast_version = None
         self.__dict__.update(state)
         if self._scope is not None:
             self._scope = weakref.ref(self._scope)
@@ -501,6 +729,51 @@ class ExprEvaluator(object):
                               % (self.text, str(err)))
         return new_ast
 
+    def _parse_fast(self, scope):
+        """Return code that evaluates our expression directly in the
+        namespace of `scope`, so that each variable reference is a plain
+        attribute lookup instead of a scope.get() call. Returns False if
+        that can't be done, e.g., if a name isn't already an entry in the
+        scope's __dict__ or a proxy is involved, in which case the
+        framework getters must be used.
+        """
+        if self.getter != 'get' or scope is None or \
+           not hasattr(scope, '__dict__'):
+            return False
+
+        try:
+            root = ast.parse(self.text, mode='eval')
+        except SyntaxError:
+            return False
+
+        sdict = scope.__dict__
+        scanner = ExprVarScanner()
+        scanner.visit(root)
+        try:
+            for node in ast.walk(root):
+                # list comprehension variables would leak into the scope
+                if isinstance(node, ast.ListComp):
+                    return False
+                if isinstance(node, ast.Name) and \
+                   not in_expr_locals(scope, node.id):
+                    if node.id not in sdict:
+                        return False
+
+            for name in scanner.varnames:
+                if in_expr_locals(scope, name):
+                    continue
+                obj = scope
+                for part in name.split('.'):
+                    obj = getattr(obj, part, _Missing)
+                    if obj is _Missing:
+                        break
+                    if IContainerProxy.providedBy(obj):
+                        return False
+        except KeyError:
+            return False
+
+        return compile(root, self.text, 'eval')
+
     def _get_updated_scope(self, scope):
         if scope is not None:
             self.scope = scope
@@ -519,6 +792,20 @@ class ExprEvaluator(object):
         try:
             if self._code is None:
                 self._parse()
+
+            version = getattr(scope, '_config_version', None)
+            if self._fast_code is None or self._fast_version != version:
+                self._fast_code = self._parse_fast(scope)
+                self._fast_version = version
+
+            if self._fast_code is not False:
+                try:
+                    return eval(self._fast_code, _expr_dict, scope.__dict__)
+                except (NameError, AttributeError):
+                    # Something moved out from under us. Use the framework
+                    # getters until the next configuration change.
+                    self._fast_code = False
+
             return eval(self._code, _expr_dict, locals())
         except Exception, err:
             raise type(err)("can't evaluate expression "
@@ -599,16 +886,24 @@ class ExprEvaluator(object):
 
         return imag(yp/stepsize)
 
-    def evaluate_gradient(self, stepsize=1.0e-6, wrt=None, scope=None):
+    def evaluate_gradient(self, stepsize=1.0e-6, wrt=None, scope=None,
+                          diagonal=False):
         """Return a dict containing the gradient of the expression with respect
-        to each of the referenced varpaths. The gradient is calculated by 1st
-        order central difference for now.
+        to each of the referenced varpaths. The gradient is calculated
+        symbolically (see :class:`ExprDifferentiator`) if possible, otherwise
+        by complex step, or by 1st order central difference if complex step
+        fails.
 
         stepsize: float
-            Step size for finite difference.
+            Step size for complex step or finite difference.
 
         wrt: list of varpaths
             Varpaths for which we want to calculate the gradient.
+
+        diagonal: bool
+            If True, the gradient with respect to an array which the
+            expression only uses elementwise is returned as a 1D array
+            holding the diagonal of the Jacobian.
         """
         scope = self._get_updated_scope(scope)
         inputs = list(self.refs(copy=False))
@@ -628,7 +923,7 @@ class ExprEvaluator(object):
                 replace_val = scope.get(name)
 
             if isinstance(replace_val, ndarray):
-                replace_val = replace_val.astype(numpy.complex)
+                replace_val = replace_val.astype(float)
             else:
                 replace_val = float(replace_val)
 
@@ -641,9 +936,47 @@ class ExprEvaluator(object):
 
             grad_text = transform_expression(self.text, new_names)
 
-            grad_root = ast.parse(grad_text, mode='eval')
-            self.cached_grad_eq = compile(grad_root, '<string>', 'eval')
+            self._grad_root = ast.parse(grad_text, mode='eval')
+            self.cached_grad_eq = compile(self._grad_root, '<string>', 'eval')
+
+        try:
+            yp, jacs = ExprDifferentiator(var_dict).visit(self._grad_root)
+        except Exception:
+            for name, val in var_dict.items():
+                if isinstance(val, ndarray):
+                    var_dict[name] = val.astype(numpy.complex)
+            return self._numerical_gradient(var_dict, inputs, wrt, stepsize)
+
+        gradient = {}
+        for var in wrt:
+
+            # Don't take derivative with respect to a variable that is not in
+            # the expression
+            if var not in inputs:
+                gradient[var] = 0.0
+                continue
 
+            jac = jacs.get(var)
+            if isinstance(var_dict[var], ndarray):
+                if jac is None:
+                    jac = zeros((numpy.size(yp), var_dict[var].size))
+                elif not diagonal:
+                    jac = _to_dense(jac)
+            elif isinstance(yp, ndarray):
+                if jac is None:
+                    jac = zeros((yp.size, 1))
+                else:
+                    jac = _to_dense(jac).reshape((yp.size, 1))
+            else:
+                jac = 0.0 if jac is None else float(jac.ravel()[0])
+            gradient[var] = jac
+
+        return gradient
+
+    def _numerical_gradient(self, var_dict, inputs, wrt, stepsize):
+        """Return gradient dict calculated by complex step, or central
+        difference if complex step fails.
+        """
         grad_code = self.cached_grad_eq
 
         gradient = {}
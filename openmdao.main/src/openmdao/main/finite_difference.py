@@ -2,15 +2,83 @@
 """
 
 # pylint: disable=E0611,F0401
+import sys
+from multiprocessing import Pool
 from sys import float_info
 
 from openmdao.main.array_helpers import flattened_size
+from openmdao.main.datatypes.file import FileRef
 from openmdao.main.interfaces import IVariableTree
 from openmdao.main.mp_support import has_interface
 from openmdao.main.mpiwrap import MPI
 from openmdao.util.graph import base_var
 
+import networkx as nx
 from numpy import ndarray, zeros, ones, unravel_index, complex128
+from numpy.random import RandomState
+
+# (FiniteDifference, outputs, iterbase) being solved in parallel. Set just
+# before the worker pool is forked so each worker inherits the model.
+_FD_WORKER = None
+
+
+def _fd_worker(task):
+    """Run the model in a forked worker with the (src, index, step)
+    perturbations in `task` applied and return the resulting outputs."""
+
+    fd, outputs, iterbase = _FD_WORKER
+
+    for src, index, step in task:
+        fd.set_value(src, step, index)
+    try:
+        fd.system.run(iterbase)
+        y = zeros(fd.y.shape)
+        fd.get_outputs(y, outputs)
+    finally:
+        for src, index, step in task:
+            fd.set_value(src, -step, index)
+
+    return y
+
+
+def _uses_files(system):
+    """Return True if a component run by `system` may read or write files,
+    as an ExternalCode wrapper does. Forked workers would all use the same
+    files, so the steps of such a system can't be evaluated concurrently."""
+
+    for sub in system.simple_subsystems():
+        comp = sub._comp
+        if comp is None:
+            continue
+        objs = [comp] + [obj for name, obj in comp.items(recurse=True)]
+        for obj in objs:
+            if isinstance(obj, FileRef) or \
+               getattr(obj, 'external_files', None) or \
+               getattr(obj, 'command', None):
+                return True
+
+    return False
+
+
+def _color_columns(pattern, columns):
+    """Greedily group (src, i, i1, fd_step) columns so that no two columns
+    in a group have a nonzero in the same row of the boolean sparsity
+    `pattern`. Densest columns are placed first."""
+
+    order = sorted(columns, key=lambda col: -pattern[:, col[1]].sum())
+
+    groups = []
+    for col in order:
+        rows = pattern[:, col[1]]
+        for used, cols in groups:
+            if not (used & rows).any():
+                used |= rows
+                cols.append(col)
+                break
+        else:
+            groups.append((rows.copy(), [col]))
+
+    return [cols for used, cols in groups]
 
 
 class FiniteDifference(object):
@@ -31,6 +99,10 @@ class FiniteDifference(object):
         options = system.options
         driver = options.parent
 
+        self.processes = options.fd_processes
+        self._warned_files = False
+        self.sparsity = options.fd_sparsity
+
         self.fd_step = options.fd_step*ones((len(self.inputs)))
         self.low = [None] * len(self.inputs)
         self.high = [None] * len(self.inputs)
@@ -165,6 +237,8 @@ class FiniteDifference(object):
         else:
             self.J = zeros((out_size, in_size))
 
+        self.in_size = in_size
+
         self.y_base = zeros((out_size,))
         self.y = zeros((out_size,))
         self.y2 = zeros((out_size,))
@@ -184,6 +258,40 @@ class FiniteDifference(object):
 
         uvec.set_to_array(self.y_base, outputs)
 
+        parallel = self.processes > 1 and not MPI and sys.platform != 'win32'
+        if parallel and _uses_files(self.system):
+            if not self._warned_files:
+                self.scope._logger.warning("%s contains file-based "
+                                           "components, so fd_processes is "
+                                           "ignored." % self.system.name)
+                self._warned_files = True
+            parallel = False
+
+        pattern = None
+        solved = False
+        if self.sparsity != 'none' and not MPI:
+            pattern, solved = self._get_sparsity(outputs, iterbase, parallel)
+
+        if pattern is None and not parallel:
+            for j, src, i, i1, form, fd_step in self._columns():
+                Jfd = self._calc_column(src, i-i1, form, fd_step, outputs,
+                                        iterbase)
+                self._pack_column(src, i, i1, Jfd, outputs)
+        elif not solved:
+            self._solve_grouped(outputs, iterbase, parallel, pattern)
+
+        # Restore final inputs/outputs.
+        uvec.set_from_array(self.y_base, outputs)
+        uvec.set_to_scope(self.scope)
+
+        #print 'after FD', self.J
+        return self.J
+
+    def _columns(self):
+        """Generate (j, src, i, i1, form, fd_step) for every column of the
+        Jacobian, where `form` and `fd_step` account for the per-variable
+        settings and for the distance to the bounds."""
+
         for j, src, in enumerate(self.inputs):
 
             # Users can customize relative/absolute step type per variable.
@@ -232,105 +340,318 @@ class FiniteDifference(object):
                     if current_val + fd_step > bound_val:
                         form = 'backward'
 
-                #--------------------
-                # Forward difference
-                #--------------------
-                if form == 'forward':
+                yield j, src, i, i1, form, fd_step
 
-                    # Step
-                    self.set_value(src, fd_step, i-i1)
+    def _calc_column(self, src, index, form, fd_step, outputs, iterbase):
+        """Run the perturbed model(s) for a single Jacobian column and return
+        the finite difference."""
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y, outputs)
+        #--------------------
+        # Forward difference
+        #--------------------
+        if form == 'forward':
 
-                    # Forward difference
-                    Jfd = (self.y - self.y_base)/fd_step
+            # Step
+            self.set_value(src, fd_step, index)
 
-                    # Undo step
-                    self.set_value(src, -fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y, outputs)
 
-                #--------------------
-                # Backward difference
-                #--------------------
-                elif form == 'backward':
+            # Forward difference
+            Jfd = (self.y - self.y_base)/fd_step
 
-                    # Step
-                    self.set_value(src, -fd_step, i-i1)
+            # Undo step
+            self.set_value(src, -fd_step, index)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y, outputs)
+        #--------------------
+        # Backward difference
+        #--------------------
+        elif form == 'backward':
 
-                    # Backward difference
-                    Jfd = (self.y_base - self.y)/fd_step
+            # Step
+            self.set_value(src, -fd_step, index)
 
-                    # Undo step
-                    self.set_value(src, fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y, outputs)
 
-                #--------------------
-                # Central difference
-                #--------------------
-                elif form == 'central':
+            # Backward difference
+            Jfd = (self.y_base - self.y)/fd_step
 
-                    # Forward Step
-                    self.set_value(src, fd_step, i-i1)
+            # Undo step
+            self.set_value(src, fd_step, index)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y, outputs)
+        #--------------------
+        # Central difference
+        #--------------------
+        elif form == 'central':
 
-                    # Backward Step
-                    self.set_value(src, -2.0*fd_step, i-i1)
+            # Forward Step
+            self.set_value(src, fd_step, index)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y2, outputs)
+            self.system.run(iterbase)
+            self.get_outputs(self.y, outputs)
 
-                    # Central difference
-                    Jfd = (self.y - self.y2)/(2.0*fd_step)
+            # Backward Step
+            self.set_value(src, -2.0*fd_step, index)
 
-                    # Undo step
-                    self.set_value(src, fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y2, outputs)
 
-                #--------------------
-                # Complex Step
-                #--------------------
-                elif form == 'complex_step':
+            # Central difference
+            Jfd = (self.y - self.y2)/(2.0*fd_step)
 
-                    complex_step = fd_step
-                    yc = zeros(len(self.y), dtype=complex128)
-                    self.system.set_complex_step(True)
+            # Undo step
+            self.set_value(src, fd_step, index)
 
-                    # Step
-                    self.set_value_complex(src, complex_step, i-i1)
+        #--------------------
+        # Complex Step
+        #--------------------
+        elif form == 'complex_step':
 
-                    self.system.run(iterbase)
-                    self.get_complex_outputs(yc)
+            complex_step = fd_step
+            yc = zeros(len(self.y), dtype=complex128)
+            self.system.set_complex_step(True)
+
+            # Step
+            self.set_value_complex(src, complex_step, index)
 
-                    # Forward difference
-                    Jfd = (yc/fd_step).imag
+            self.system.run(iterbase)
+            self.get_complex_outputs(yc)
+
+            # Forward difference
+            Jfd = (yc/fd_step).imag
 
-                    # Undo step
-                    self.set_value_complex(src, complex_step, i-i1,
-                                           undo_complex=True)
-                    self.system.set_complex_step(False)
+            # Undo step
+            self.set_value_complex(src, complex_step, index,
+                                   undo_complex=True)
+            self.system.set_complex_step(False)
 
-                # Pack Jacobian in either an array or a dictionary.
-                if self.return_format == 'dict':
-                    start = end = 0
-                    for okey in outputs:
+        return Jfd
+
+    def _solve_grouped(self, outputs, iterbase, parallel, pattern=None,
+                       dense=None):
+        """Perturb groups of columns together and unpack the differences
+        into J. Without a sparsity `pattern` every column is its own group.
+        With one, structurally orthogonal columns that share a form are
+        coloured into the same group and each column only keeps the rows
+        it can affect. If `parallel` is True, the perturbed points are
+        evaluated in a pool of forked processes. If `dense` is given, the
+        columns are also stored in it."""
+
+        groups = []
+        by_form = {}
+        for j, src, i, i1, form, fd_step in self._columns():
+            if form == 'complex_step':
+                # Needs the complex vectors of this process, so it is
+                # always run on its own.
+                Jfd = self._calc_column(src, i-i1, form, fd_step, outputs,
+                                        iterbase)
+                self._pack_column(src, i, i1, Jfd, outputs)
+                if dense is not None:
+                    dense[:, i] = Jfd
+            elif pattern is None:
+                groups.append((form, [(src, i, i1, fd_step)]))
+            else:
+                by_form.setdefault(form, []).append((src, i, i1, fd_step))
+
+        for form in ('forward', 'backward', 'central'):
+            if form in by_form:
+                for cols in _color_columns(pattern, by_form[form]):
+                    groups.append((form, cols))
+
+        tasks = []
+        for form, cols in groups:
+            if form in ('forward', 'central'):
+                tasks.append([(src, i-i1, fd_step)
+                              for src, i, i1, fd_step in cols])
+            if form in ('backward', 'central'):
+                tasks.append([(src, i-i1, -fd_step)
+                              for src, i, i1, fd_step in cols])
+
+        if not tasks:
+            return
+
+        if parallel:
+            global _FD_WORKER
+            _FD_WORKER = (self, outputs, iterbase)
+            pool = Pool(processes=min(self.processes, len(tasks)))
+            try:
+                results = pool.map(_fd_worker, tasks, chunksize=1)
+                pool.close()
+            except Exception:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+                _FD_WORKER = None
+        else:
+            results = []
+            for task in tasks:
+                for src, index, step in task:
+                    self.set_value(src, step, index)
+                self.system.run(iterbase)
+                self.get_outputs(self.y, outputs)
+                results.append(self.y.copy())
+                for src, index, step in task:
+                    self.set_value(src, -step, index)
+
+        k = 0
+        for form, cols in groups:
+            if form == 'central':
+                delta = results[k] - results[k+1]
+                k += 2
+            elif form == 'forward':
+                delta = results[k] - self.y_base
+                k += 1
+            else:
+                delta = self.y_base - results[k]
+                k += 1
 
-                        sz = uvec[okey].size
-                        end += sz
-                        #print Jfd, start, end, i, self.J
-                        self.J[okey][src][:, i-i1] = Jfd[start:end]
-                        start += sz
+            for src, i, i1, fd_step in cols:
+                if form == 'central':
+                    Jfd = delta/(2.0*fd_step)
                 else:
-                    self.J[:, i] = Jfd
+                    Jfd = delta/fd_step
+                if pattern is not None:
+                    Jfd = Jfd*pattern[:, i]
+                self._pack_column(src, i, i1, Jfd, outputs)
+                if dense is not None:
+                    dense[:, i] = Jfd
+
+    def _get_sparsity(self, outputs, iterbase, parallel):
+        """Return the boolean sparsity pattern of our Jacobian, which is
+        cached on our System. Returns (pattern, solved), where `solved` is
+        True if J was already filled in while detecting the pattern."""
+
+        key = (self.sparsity, tuple(self.inputs), tuple(outputs))
+        cached = self.system.fd_sparsity
+        if cached is not None and cached[0] == key:
+            return cached[1], False
+
+        pattern = self._graph_sparsity(outputs)
+        solved = False
+
+        if self.sparsity == 'probe':
+            # Probe at a random nearby point, then at the current one. A
+            # zero has to show up in both to be considered structural.
+            probe = zeros(pattern.shape)
+            self._probe(outputs, iterbase, parallel, probe)
+
+            dense = zeros(pattern.shape)
+            self._solve_grouped(outputs, iterbase, parallel, dense=dense)
+            pattern &= (probe != 0.0) | (dense != 0.0)
+            solved = True
+
+        self.system.fd_sparsity = (key, pattern)
+        return pattern, solved
+
+    def _graph_sparsity(self, outputs):
+        """Return the sparsity pattern implied by the connectivity of the
+        reduced graph. Anything that can't be found in the graph is
+        assumed to be dense."""
+
+        graph = self.scope._reduced_graph
+        name2collapsed = self.scope.name2collapsed
+        uvec = self.system.vec['u']
 
-        # Restore final inputs/outputs.
-        uvec.set_from_array(self.y_base, outputs)
-        uvec.set_to_scope(self.scope)
+        out_bounds = []
+        start = 0
+        for okey in outputs:
+            size = uvec[okey].size
+            out_bounds.append((name2collapsed.get(okey), start, start+size))
+            start += size
 
-        #print 'after FD', self.J
-        return self.J
+        pattern = ones((len(self.y_base), self.in_size), dtype=bool)
+
+        for srcs in self.inputs:
+            if isinstance(srcs, basestring):
+                srcs = (srcs,)
+
+            reach = set()
+            for src in srcs:
+                node = name2collapsed.get(src)
+                if node is None or node not in graph:
+                    reach = None
+                    break
+                reach.add(node)
+                reach.update(nx.descendants(graph, node))
+
+            if reach is None:
+                continue
+
+            i1, i2 = self.in_bounds[srcs[0]]
+            for node, o1, o2 in out_bounds:
+                if node is not None and node in graph and node not in reach:
+                    pattern[o1:o2, i1:i2] = False
+
+        return pattern
+
+    def _probe(self, outputs, iterbase, parallel, dense):
+        """Fill `dense` with a full finite difference taken about a
+        randomly perturbed copy of the current inputs."""
+
+        rand = RandomState(12345)
+        steps = []
+        for j, src in enumerate(self.inputs):
+            if isinstance(src, basestring):
+                i1, i2 = self.in_bounds[src]
+            else:
+                i1, i2 = self.in_bounds[src[0]]
+
+            for i in range(i1, i2):
+                current_val = self.get_value(src, i1, i2, i)
+                step = 1.0e-3*(abs(current_val) + 1.0)*rand.uniform(0.5, 1.0)
+
+                # Stay inside the bounds. Step down if there's no room
+                # above, and if there's no room below either, shrink the
+                # step to half of the larger gap.
+                if self.high[j] is not None:
+                    if isinstance(self.high[j], (list, ndarray)):
+                        high = self.high[j][i-i1]
+                    else:
+                        high = self.high[j]
+                    if current_val + step > high:
+                        step = -step
+                        if self.low[j] is not None:
+                            if isinstance(self.low[j], (list, ndarray)):
+                                low = self.low[j][i-i1]
+                            else:
+                                low = self.low[j]
+                            if current_val + step < low:
+                                if high - current_val >= current_val - low:
+                                    step = 0.5*(high - current_val)
+                                else:
+                                    step = -0.5*(current_val - low)
+
+                steps.append((src, i-i1, step))
+                self.set_value(src, step, i-i1)
+
+        y_base = self.y_base
+        try:
+            self.system.run(iterbase)
+            self.y_base = zeros(y_base.shape)
+            self.get_outputs(self.y_base, outputs)
+            self._solve_grouped(outputs, iterbase, parallel, dense=dense)
+        finally:
+            self.y_base = y_base
+            for src, index, step in steps:
+                self.set_value(src, -step, index)
+
+    def _pack_column(self, src, i, i1, Jfd, outputs):
+        """Pack a column in either an array or a dictionary."""
+
+        if self.return_format == 'dict':
+            uvec = self.system.vec['u']
+            start = end = 0
+            for okey in outputs:
+
+                sz = uvec[okey].size
+                end += sz
+                #print Jfd, start, end, i, self.J
+                self.J[okey][src][:, i-i1] = Jfd[start:end]
+                start += sz
+        else:
+            self.J[:, i] = Jfd
 
     def get_outputs(self, x, outputs):
         """Return matrix of flattened values from output edges."""
@@ -7,8 +7,12 @@ import traceback
 
 # pylint: disable=E0611, F0401
 import numpy as np
-from scipy.sparse.linalg import gmres, LinearOperator
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import gmres, LinearOperator, splu
 
+from openmdao.main.derivatives import jacobian_blocks, _applyJ_args
+from openmdao.main.interfaces import ISystem
 from openmdao.main.mpiwrap import MPI, PETSc, get_norm
 from openmdao.util.graph import fix_single_tuple
 from openmdao.util.log import logger
@@ -55,6 +59,11 @@ class LinearSolver(object):
 
         self.indent = '   ' * level
 
+    def reset(self):
+        """ Called after the system is linearized, so that any data
+        derived from the old linearization can be discarded. """
+        pass
+
     def print_norm(self, driver_string, iteration, res, res0, msg=None, solver='LN'):
         """ Prints out the norm of the residual in a neat readable format.
         """
@@ -105,6 +114,10 @@ class ScipyGMRES(LinearSolver):
 
     ln_string = 'GMRES'
 
+    # Set to True to always solve with the factored operator, regardless of
+    # gmres_mode.
+    always_direct = False
+
     def __init__(self, system):
         """ Set up ScipyGMRES object """
         super(ScipyGMRES, self).__init__(system)
@@ -116,6 +129,16 @@ class ScipyGMRES(LinearSolver):
         self.A = LinearOperator((n_edge, n_edge),
                                 matvec=self.mult,
                                 dtype=float)
+        self._lu = None
+        self._precon = None
+        self._block_lu = None
+        self._gs = None
+        self._gs_bufs = None
+
+        # Number of GMRES iterations and operator products since the last
+        # linearization.
+        self.iter_count = 0
+        self.mult_count = 0
 
     def calc_gradient(self, inputs, outputs, return_format='array'):
         """ Run GMRES solver to return a Jacobian of outputs
@@ -125,6 +148,10 @@ class ScipyGMRES(LinearSolver):
         system = self._system
         RHS = system.rhs_buf
         A = self.A
+        direct = self.always_direct or self.options.gmres_mode == 'direct'
+
+        # The system was just linearized, so any old factorization is stale.
+        self.reset()
 
         if return_format == 'dict':
             J = {}
@@ -159,14 +186,22 @@ class ScipyGMRES(LinearSolver):
                 j += len(in_indices)
                 continue
 
-            for irhs in in_indices:
+            # Solve for all columns belonging to this param at once using
+            # the factored operator.
+            if direct:
+                dxs = self.solve_direct(in_indices)
+
+            for k, irhs in enumerate(in_indices):
 
-                RHS[irhs] = 1.0
+                if direct:
+                    dx = dxs[:, k]
+                else:
+                    RHS[irhs] = 1.0
 
-                # Call GMRES to solve the linear system
-                dx = self.solve(RHS)
+                    # Call GMRES to solve the linear system
+                    dx = self.solve(RHS)
 
-                RHS[irhs] = 0.0
+                    RHS[irhs] = 0.0
 
                 i = 0
                 for item in outputs:
@@ -206,12 +241,21 @@ class ScipyGMRES(LinearSolver):
         system = self._system
         options = self.options
         A = self.A
+        iters = self.iter_count
+        mults = self.mult_count
 
         #print system.name, 'Linear solution start vec', system.rhs_vec.array
         # Call GMRES to solve the linear system
         dx, info = gmres(A, arg,
                          tol=options.atol,
-                         maxiter=options.maxiter)
+                         maxiter=options.maxiter,
+                         M=self._precon_op(),
+                         callback=self._monitor)
+
+        if options.iprint > 0:
+            msg = '%d applyJ' % (self.mult_count - mults)
+            self.print_norm(self.ln_string, self.iter_count - iters, 0, 0,
+                            msg=msg)
 
         if info > 0:
             msg = "ERROR in calc_gradient in '%s': gmres failed to converge " \
@@ -224,6 +268,39 @@ class ScipyGMRES(LinearSolver):
         #print system.name, 'Linear solution vec', -dx
         return dx
 
+    def _monitor(self, res):
+        """ GMRES Callback: counts the iterations. """
+        self.iter_count += 1
+
+    def solve_direct(self, indices):
+        """ Return the solutions for the unit right hand sides at the
+        given indices as the columns of an array. The linear operator is
+        assembled and LU factored on the first call after linearization
+        and reused for every subsequent call."""
+
+        if self._lu is None:
+            n_edge = self.A.shape[0]
+            mtx = np.zeros((n_edge, n_edge))
+            arg = np.zeros(n_edge)
+            for icol in xrange(n_edge):
+                arg[icol] = 1.0
+                mtx[:, icol] = self.mult(arg)
+                arg[icol] = 0.0
+
+            self._lu = lu_factor(mtx)
+
+        RHS = np.zeros((self.A.shape[0], len(indices)))
+        RHS[indices, np.arange(len(indices))] = 1.0
+
+        return lu_solve(self._lu, RHS)
+
+    def reset(self):
+        """ Discard the factored operator and preconditioner. """
+        self._lu = None
+        self._precon = None
+        self._block_lu = None
+        self.iter_count = 0
+        self.mult_count = 0
 
     def mult(self, arg):
         """ GMRES Callback: applies Jacobian matrix. Mode is determined by the
@@ -231,6 +308,7 @@ class ScipyGMRES(LinearSolver):
 
         system = self._system
         system.sol_vec.array[:] = arg[:]
+        self.mult_count += 1
 
         # Start with a clean slate
         system.rhs_vec.array[:] = 0.0
@@ -246,6 +324,404 @@ class ScipyGMRES(LinearSolver):
         #print system.rhs_vec.keys()
         return system.rhs_vec.array[:]
 
+    def _precon_op(self):
+        """ Return the preconditioner selected in the options as a
+        LinearOperator, or None. It is built on the first solve after
+        linearization."""
+
+        if self._precon is None:
+            system = self._system
+            n_edge = self.A.shape[0]
+            choice = self.options.preconditioner
+
+            self._precon = False
+            if choice == 'block_jacobi':
+                self._block_lu = self._block_jacobi()
+                if self._block_lu is None:
+                    msg = "'%s': couldn't assemble the diagonal blocks of " \
+                          "the Jacobian, so GMRES is not preconditioned."
+                    logger.warning(msg, system.name)
+                else:
+                    self._precon = LinearOperator((n_edge, n_edge),
+                                                  matvec=self._apply_block_jacobi,
+                                                  dtype=float)
+            elif choice == 'linear_gs':
+                rhs_buf, sol_buf = system.rhs_buf, system.sol_buf
+                try:
+                    self._gs = LinearGS(system)
+                    self._gs_bufs = (system.rhs_buf, system.sol_buf)
+                finally:
+                    system.rhs_buf, system.sol_buf = rhs_buf, sol_buf
+                self._precon = LinearOperator((n_edge, n_edge),
+                                              matvec=self._apply_linear_gs,
+                                              dtype=float)
+
+        if self._precon is False:
+            return None
+        return self._precon
+
+    def _block_jacobi(self):
+        """ Return the sparse LU factorization of the diagonal blocks of the
+        forward operator, one block for the unknowns of each component, or
+        None if the operator can't be assembled."""
+
+        system = self._system
+        mtx = self._assemble()
+        if mtx is None:
+            return None
+
+        # Unknowns that don't belong to a component are their own block.
+        n_edge = mtx.shape[0]
+        block = -1 - np.arange(n_edge)
+        uarr = system.vec['du'].array
+        for i, leaf in enumerate(_walk(system)[1]):
+            idxs = _vec_idxs(leaf.vec['du'].array, [(uarr, None)])
+            if idxs is not None:
+                block[idxs] = i
+
+        mtx = mtx.tocoo()
+        keep = block[mtx.row] == block[mtx.col]
+        mtx = coo_matrix((mtx.data[keep], (mtx.row[keep], mtx.col[keep])),
+                         shape=mtx.shape)
+
+        return _factor_sparse(mtx, system.name)
+
+    def _apply_block_jacobi(self, arg):
+        """ Preconditioner callback: solves with the diagonal blocks. """
+        return self._block_lu.solve(arg, trans=self._trans())
+
+    def _apply_linear_gs(self, arg):
+        """ Preconditioner callback: one block Gauss Seidel sweep from a zero
+        initial guess. The sweep uses its own buffers, so the right hand side
+        that GMRES is solving for is left alone."""
+
+        system = self._system
+        rhs_buf, sol_buf = system.rhs_buf, system.sol_buf
+        system.rhs_buf, system.sol_buf = self._gs_bufs
+        try:
+            system.rhs_buf[:] = arg
+            system.sol_buf[:] = 0.0
+            system.sol_vec.array[:] = 0.0
+            system.rhs_vec.array[:] = 0.0
+            system.clear_dp()
+            self._gs.sweep()
+            return system.sol_vec.array.copy()
+        finally:
+            system.rhs_buf, system.sol_buf = rhs_buf, sol_buf
+
+    def _trans(self):
+        """ The factorization is always of the forward operator, so adjoint
+        solves use its transpose. """
+        if self._system.mode == 'adjoint':
+            return 'T'
+        return 'N'
+
+    def _probe(self):
+        """ Build the forward operator one column at a time from products
+        with the operator."""
+
+        n_edge = self.A.shape[0]
+        arg = np.zeros(n_edge)
+        rows, cols, vals = [], [], []
+        for icol in xrange(n_edge):
+            arg[icol] = 1.0
+            col = self.mult(arg)
+            arg[icol] = 0.0
+            nonzero = np.nonzero(col)[0]
+            rows.append(nonzero)
+            cols.append(np.repeat(icol, len(nonzero)))
+            vals.append(col[nonzero])
+
+        mtx = coo_matrix((np.concatenate(vals),
+                          (np.concatenate(rows), np.concatenate(cols))),
+                         shape=(n_edge, n_edge))
+        if self._system.mode == 'adjoint':
+            return mtx.T
+        return mtx
+
+    def _assemble(self):
+        """ Build the forward operator ``D - C`` of the system, where C holds
+        the Jacobians of the components, placed at the residuals and the
+        unknowns that their inputs are scattered from, and D is the diagonal
+        contributed by the unknowns themselves. Returns None if some part of
+        the system can't be assembled this way, or if the result doesn't
+        reproduce the matrix-free product.
+        """
+        system = self._system
+        n_edge = self.A.shape[0]
+        uarr = system.vec['du'].array
+        farr = system.vec['df'].array
+
+        if system._parent_system:
+            vnames = system._parent_system._relevant_vars
+        else:
+            vnames = system.flat_vars.keys()
+
+        walked = _walk(system)
+        if walked is None:
+            return None
+        bases, leaves = walked
+
+        uarr[:] = 0.0
+        farr[:] = 0.0
+        for base, p2u in bases[1:]:
+            base[:] = 0.0
+
+        rows, cols, vals = [], [], []
+        for leaf in leaves:
+            saved = (leaf.mode, leaf.sol_vec, leaf.rhs_vec)
+            leaf.mode = 'forward'
+            leaf.sol_vec = leaf.vec['du']
+            leaf.rhs_vec = leaf.vec['df']
+            try:
+                if not _add_leaf(leaf, vnames, bases, farr, rows, cols, vals):
+                    return None
+            finally:
+                leaf.mode, leaf.sol_vec, leaf.rhs_vec = saved
+
+        if rows:
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            vals = np.concatenate(vals)
+        coupling = coo_matrix((vals, (rows, cols)),
+                              shape=(n_edge, n_edge)).tocsr()
+
+        if system.mode == 'adjoint':
+            coupling_op = coupling.T.tocsr()
+        else:
+            coupling_op = coupling
+
+        ones = np.ones(n_edge)
+        diag = self.mult(ones) + coupling_op.dot(ones)
+
+        # Make sure we reproduce the matrix-free product.
+        arg = np.random.RandomState(0).uniform(0.5, 1.5, n_edge)
+        expected = self.mult(arg).copy()
+        actual = diag * arg - coupling_op.dot(arg)
+        if not np.allclose(actual, expected, rtol=1e-8,
+                           atol=1e-10 * max(1.0, np.abs(expected).max())):
+            return None
+
+        idx = np.arange(n_edge)
+        return coo_matrix((diag, (idx, idx)),
+                          shape=(n_edge, n_edge)).tocsr() - coupling
+
+
+class ScipySparseLU(ScipyGMRES):
+    """ Direct solver that assembles the linear operator of the system as a
+    sparse matrix from the Jacobians of its components, factors it once with
+    Scipy's SuperLU, and reuses that factorization for every right hand side
+    until the system is linearized again. This is a serial solver, so it
+    should never be used in an MPI setting.
+    """
+
+    ln_string = 'SPLU'
+    always_direct = True
+
+    def solve(self, arg):
+        """ Solve the coupled equations for a new state vector that nulls the
+        residual. Used by the Newton solvers."""
+
+        if self._lu is None:
+            self._factor()
+
+        return self._lu.solve(arg, trans=self._trans())
+
+    def solve_direct(self, indices):
+        """ Return the solutions for the unit right hand sides at the
+        given indices as the columns of an array."""
+
+        if self._lu is None:
+            self._factor()
+
+        RHS = np.zeros((self.A.shape[0], len(indices)))
+        RHS[indices, np.arange(len(indices))] = 1.0
+
+        return self._lu.solve(RHS, trans=self._trans())
+
+    def _factor(self):
+        """ Assemble and factor the forward operator of the system. """
+
+        system = self._system
+        mtx = self._assemble()
+        if mtx is None:
+            logger.debug("'%s': couldn't assemble the Jacobian from its "
+                         "components, probing the operator instead.",
+                         system.name)
+            mtx = self._probe()
+
+        self._lu = _factor_sparse(mtx, system.name)
+
+
+def _factor_sparse(mtx, name):
+    """ Return the SuperLU factorization of `mtx`. Unknowns that have no
+    entries at all, because they aren't relevant to the solve, get a unit
+    diagonal so the matrix isn't singular.
+    """
+    n_edge = mtx.shape[0]
+    mtx = mtx.tocsc()
+    mtx.eliminate_zeros()
+
+    empty = np.where((np.diff(mtx.indptr) == 0) &
+                     (np.bincount(mtx.indices, minlength=n_edge) == 0))[0]
+    if len(empty):
+        mtx = mtx + coo_matrix((np.ones(len(empty)), (empty, empty)),
+                               shape=mtx.shape).tocsc()
+
+    logger.debug("'%s': factoring %d x %d Jacobian with %d nonzeros",
+                 name, n_edge, n_edge, mtx.nnz)
+    try:
+        return splu(mtx)
+    except RuntimeError as err:
+        msg = "ERROR in calc_gradient in '%s': %s" % (name, err)
+        raise RuntimeError(msg)
+
+
+def _walk(system):
+    """ Return ``(bases, leaves)`` for the tree of systems under `system`.
+    `bases` pairs the du vector and each dp vector with an array that gives,
+    for each of its entries, the du entry that is scattered to it (-1 if
+    there is none, None for du itself). `leaves` are the systems whose
+    Jacobians make up the operator. Returns None if a scatter can't be
+    mapped.
+    """
+    from openmdao.main.systems import CompoundSystem, VarSystem, \
+                                      TransparentDriverSystem
+
+    uarr = system.vec['du'].array
+    bases = [(uarr, None)]
+    leaves = []
+    nodes = [system]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, (CompoundSystem, TransparentDriverSystem)):
+            p2u = _scatter_map(node, uarr)
+            if p2u is None:
+                return None
+            bases.append((node.vec['dp'].array, p2u))
+            nodes.extend(node.local_subsystems())
+        elif not isinstance(node, VarSystem):
+            leaves.append(node)
+
+    return bases, leaves
+
+
+def _idx_array(idxs, size):
+    """ Return `idxs`, which may be a slice, as an index array. """
+    if isinstance(idxs, slice):
+        return np.arange(*idxs.indices(size))
+    return np.asarray(idxs, dtype=int)
+
+
+def _scatter_map(node, uarr):
+    """ Return an array giving the index in `uarr` of the du entry that
+    `node` scatters to each entry of its dp vector, or -1 if there is none.
+    Returns None if the scatter can't be mapped.
+    """
+    dparr = node.vec['dp'].array
+    p2u = -np.ones(dparr.size, dtype=int)
+
+    scatter = node.scatter_full
+    if scatter is None or getattr(scatter, 'var_idxs', None) is None:
+        return p2u
+
+    duarr = node.vec['du'].array
+    if duarr.size == 0:
+        return p2u
+    offset = _vec_idxs(duarr[:1], [(uarr, None)])
+    if offset is None:
+        return None
+
+    p2u[_idx_array(scatter.input_idxs, dparr.size)] = \
+        _idx_array(scatter.var_idxs, duarr.size) + offset[0]
+    return p2u
+
+
+def _vec_idxs(view, bases):
+    """ Return the indices of the entries of `view` in the first of the
+    ``(array, idxmap)`` pairs in `bases` whose array it is a view of, mapped
+    through `idxmap` if it isn't None. Returns None if `view` doesn't share
+    memory with any of them.
+    """
+    if view.ndim != 1:
+        return None
+    if view.size == 0:
+        return np.zeros(0, dtype=int)
+
+    ptr = view.__array_interface__['data'][0]
+    for base, idxmap in bases:
+        if view.dtype != base.dtype:
+            continue
+        start = ptr - base.__array_interface__['data'][0]
+        if start < 0 or start >= base.nbytes:
+            continue
+
+        itemsize = base.itemsize
+        if start % itemsize or view.strides[0] % itemsize:
+            return None
+        idxs = start // itemsize + \
+               (view.strides[0] // itemsize) * np.arange(view.size)
+        if idxs.min() < 0 or idxs.max() >= base.size:
+            return None
+        if idxmap is None:
+            return idxs
+        return idxmap[idxs]
+
+    return None
+
+
+def _add_leaf(leaf, vnames, bases, farr, rows, cols, vals):
+    """ Append the entries of the Jacobian of `leaf` to `rows`, `cols`
+    and `vals`. Returns False if they couldn't all be located.
+    """
+    blocks = jacobian_blocks(leaf, vnames)
+
+    if blocks is not None:
+        for result, arg, Jsub in blocks:
+            if not isinstance(Jsub, np.ndarray) or Jsub.ndim != 2:
+                return False
+            iout = _vec_idxs(result, [(farr, None)])
+            iarg = _vec_idxs(arg, bases)
+            if iout is None or iarg is None:
+                return False
+
+            irow, icol = np.nonzero(Jsub)
+            keep = iarg[icol] >= 0
+            rows.append(iout[irow[keep]])
+            cols.append(iarg[icol[keep]])
+            vals.append(Jsub[irow[keep], icol[keep]])
+        return True
+
+    # No explicit Jacobian (e.g. apply_deriv), so probe this leaf one input
+    # at a time. The result is -J times the unit input because the du
+    # vector is zero.
+    leaf_f = leaf.vec['df'].array
+    iout = _vec_idxs(leaf_f, [(farr, None)])
+    if iout is None:
+        return False
+
+    args = _applyJ_args(leaf, vnames, ISystem.providedBy(leaf.inner()))[0]
+    for arg in args.values():
+        iarg = _vec_idxs(arg, bases)
+        if iarg is None:
+            return False
+
+        for k in xrange(arg.size):
+            if iarg[k] < 0:
+                continue
+            leaf_f[:] = 0.0
+            arg[k] = 1.0
+            leaf.applyJ(vnames)
+            arg[k] = 0.0
+
+            nonzero = np.nonzero(leaf_f)[0]
+            rows.append(iout[nonzero])
+            cols.append(np.repeat(iarg[k], len(nonzero)))
+            vals.append(-leaf_f[nonzero])
+
+    leaf_f[:] = 0.0
+    return True
+
 
 class PETSc_KSP(LinearSolver):
     """ PETSc's KSP solver with preconditioning. MPI is supported."""
@@ -562,58 +1038,7 @@ class LinearGS(LinearSolver):
         while counter < options.maxiter and norm > options.atol and \
               norm/norm0 > options.rtol:
 
-            if system.mode == 'forward':
-                #print "Start Forward", system.name, system; sys.stdout.flush()
-                for subsystem in system.subsystems(local=True):
-                    #print subsystem.name; sys.stdout.flush()
-                    #print "Z1", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                    system.scatter('du', 'dp', subsystem=subsystem)
-                    #print "Z2", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                    system.rhs_vec.array[:] = 0.0
-                    subsystem.applyJ(system.flat_vars.keys())
-                    system.rhs_vec.array[:] *= -1.0
-                    system.rhs_vec.array[:] += system.rhs_buf[:]
-                    sub_options = options if subsystem.options is None \
-                                          else subsystem.options
-                    #print "Z4", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                    subsystem.solve_linear(sub_options)
-                    #print "Z5", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array
-                    #print subsystem.name, system.rhs_vec.array, system.sol_vec.array; sys.stdout.flush()
-
-                #print "End", system.name; sys.stdout.flush()
-            elif system.mode == 'adjoint':
-                #print "Start Adjoint", system.name, system; sys.stdout.flush()
-
-                rev_systems = [item for item in reversed(list(system.subsystems(local=True)))]
-
-                for subsystem in rev_systems:
-                    #print "Outer", subsystem.name; sys.stdout.flush()
-                    system.sol_buf[:] = system.rhs_buf[:]
-
-                    # Instead of a double loop, we can use the graph to only
-                    # call applyJ on the component behind us. This led to a
-                    # nice speedup.
-                    succs = [str(node) for node in system.graph.successors(subsystem.node)]
-
-                    for subsystem2 in rev_systems:
-                        if subsystem2.name in succs:
-                            #print "Inner", subsystem2.name; sys.stdout.flush()
-                            system.rhs_vec.array[:] = 0.0
-                            args = subsystem.flat_vars.keys()
-                            #print "Z1", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                            subsystem2.applyJ(args)
-                            #print "Z2", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                            system.scatter('du', 'dp', subsystem=subsystem2)
-                            #print subsystem2.name, subsystem2.vec['dp'].keys(), subsystem2.vec['du'].keys()
-                            #print "Z3", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                            system.sol_buf[:] -= system.rhs_vec.array[:]
-                            system.vec['dp'].array[:] = 0.0
-                            #print "Z4", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-                    system.rhs_vec.array[:] = system.sol_buf[:]
-                    #print "Z5", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
-
-                    subsystem.solve_linear(options)
-                    #print "Z6", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+            self.sweep()
 
             norm = self._norm()
             counter += 1
@@ -627,3 +1052,61 @@ class LinearGS(LinearSolver):
             #print "pZZ", psys.vec['du'].array, psys.vec['dp'].array, psys.vec['df'].array; sys.stdout.flush()
 
         return system.sol_vec.array
+
+    def sweep(self):
+        """ Performs one block Gauss Seidel sweep over the subsystems. """
+        system = self._system
+        options = self.options
+
+        if system.mode == 'forward':
+            #print "Start Forward", system.name, system; sys.stdout.flush()
+            for subsystem in system.subsystems(local=True):
+                #print subsystem.name; sys.stdout.flush()
+                #print "Z1", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                system.scatter('du', 'dp', subsystem=subsystem)
+                #print "Z2", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                system.rhs_vec.array[:] = 0.0
+                subsystem.applyJ(system.flat_vars.keys())
+                system.rhs_vec.array[:] *= -1.0
+                system.rhs_vec.array[:] += system.rhs_buf[:]
+                sub_options = options if subsystem.options is None \
+                                      else subsystem.options
+                #print "Z4", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                subsystem.solve_linear(sub_options)
+                #print "Z5", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array
+                #print subsystem.name, system.rhs_vec.array, system.sol_vec.array; sys.stdout.flush()
+
+            #print "End", system.name; sys.stdout.flush()
+        elif system.mode == 'adjoint':
+            #print "Start Adjoint", system.name, system; sys.stdout.flush()
+
+            rev_systems = [item for item in reversed(list(system.subsystems(local=True)))]
+
+            for subsystem in rev_systems:
+                #print "Outer", subsystem.name; sys.stdout.flush()
+                system.sol_buf[:] = system.rhs_buf[:]
+
+                # Instead of a double loop, we can use the graph to only
+                # call applyJ on the component behind us. This led to a
+                # nice speedup.
+                succs = [str(node) for node in system.graph.successors(subsystem.node)]
+
+                for subsystem2 in rev_systems:
+                    if subsystem2.name in succs:
+                        #print "Inner", subsystem2.name; sys.stdout.flush()
+                        system.rhs_vec.array[:] = 0.0
+                        args = subsystem.flat_vars.keys()
+                        #print "Z1", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                        subsystem2.applyJ(args)
+                        #print "Z2", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                        system.scatter('du', 'dp', subsystem=subsystem2)
+                        #print subsystem2.name, subsystem2.vec['dp'].keys(), subsystem2.vec['du'].keys()
+                        #print "Z3", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                        system.sol_buf[:] -= system.rhs_vec.array[:]
+                        system.vec['dp'].array[:] = 0.0
+                        #print "Z4", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+                system.rhs_vec.array[:] = system.sol_buf[:]
+                #print "Z5", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
+
+                subsystem.solve_linear(options)
+                #print "Z6", system.vec['du'].array, system.vec['dp'].array, system.vec['df'].array; sys.stdout.flush()
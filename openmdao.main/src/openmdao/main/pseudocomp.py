@@ -2,7 +2,7 @@
 import ast
 import weakref
 
-from numpy import ndarray, zeros
+from numpy import diag, ndarray, zeros
 
 from openmdao.main.array_helpers import flattened_size, \
                                         flattened_value, get_val_and_index, get_index
@@ -196,6 +196,7 @@ class PseudoComponent(object):
 
         self.missing_deriv_policy = 'error'
         self._negate = False
+        self._diagonals = None
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -351,14 +352,28 @@ class PseudoComponent(object):
                 n_out += width
             self.Jsize = (n_out, n_in)
 
+        grad = self._srcexpr.evaluate_gradient(diagonal=True)
+
+        # If the expression is elementwise in all of its inputs, just keep
+        # the diagonals and use apply_deriv/apply_derivT.
+        self._diagonals = None
+        if all([isinstance(grad[varname], ndarray) and grad[varname].ndim == 1
+                for varname in self._inputs]):
+            sign = -1. if self._negate else 1.
+            self._diagonals = [(varname, sign*grad[varname])
+                               for varname in self._inputs]
+            return None
+
         J = zeros(self.Jsize)
-        grad = self._srcexpr.evaluate_gradient()
 
         i = 0
         for varname in self._inputs:
             val = self.get(varname)
             width = flattened_size(varname, val, self)
-            J[:, i:i+width] = grad[varname]
+            if isinstance(grad[varname], ndarray) and grad[varname].ndim == 1:
+                J[:, i:i+width] = diag(grad[varname])
+            else:
+                J[:, i:i+width] = grad[varname]
             i += width
 
         if self._negate:
@@ -366,6 +381,25 @@ class PseudoComponent(object):
         else:
             return J
 
+    def apply_deriv(self, arg, result):
+        """ Matrix vector product with the Jacobian, used when
+        :meth:`provideJ` found the expression to be elementwise.
+        """
+        out = result['out0']
+        for varname, diagonal in self._diagonals:
+            if varname in arg:
+                out[:] += (diagonal * arg[varname].flatten()).reshape(out.shape)
+
+    def apply_derivT(self, arg, result):
+        """ Matrix vector product with the transpose Jacobian, used when
+        :meth:`provideJ` found the expression to be elementwise.
+        """
+        out = arg['out0'].flatten()
+        for varname, diagonal in self._diagonals:
+            if varname in result:
+                res = result[varname]
+                res[:] += (diagonal * out).reshape(res.shape)
+
     def ensure_init(self):
         """Make sure our inputs and outputs have been
         initialized.
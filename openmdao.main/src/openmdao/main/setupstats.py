@@ -0,0 +1,44 @@
+"""
+Timing of the stages of a top level Assembly setup.
+
+:meth:`Assembly._setup` calls :func:`start` and :func:`stop` around a full
+setup, and code anywhere below it can wrap a call in :func:`timed` to have
+its elapsed time added to a named stage.  Outside of a setup, :func:`timed`
+just calls the function.
+"""
+
+import time
+from collections import OrderedDict
+
+# stage times for each setup in progress, innermost last
+_active = []
+
+
+def start():
+    """Start collecting stage times for a new setup."""
+    _active.append(OrderedDict())
+
+
+def stop():
+    """Stop collecting stage times for the current setup and return an
+    OrderedDict mapping each stage name to its total time in seconds,
+    in the order the stages were first entered.
+    """
+    return _active.pop()
+
+
+def timed(stage, func, *args, **kwargs):
+    """Call `func` with the given args and return its result, adding
+    the time taken to `stage` if a setup is in progress.  A stage that
+    is entered more than once (e.g., once per Assembly) is totalled.
+    """
+    if not _active:
+        return func(*args, **kwargs)
+
+    stages = _active[-1]
+    stages.setdefault(stage, 0.)
+    t0 = time.time()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stages[stage] += time.time() - t0
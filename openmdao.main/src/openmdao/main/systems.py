@@ -1,4 +1,7 @@
 import sys
+import cPickle
+import hashlib
+from copy import deepcopy
 from StringIO import StringIO
 from collections import OrderedDict
 from itertools import chain
@@ -12,14 +15,15 @@ from openmdao.main.mpiwrap import MPI, MPI_info, PETSc, get_norm, make_idx_array
                                   to_idx_array, idx_arr_type
 from openmdao.main.exceptions import RunStopped
 from openmdao.main.finite_difference import FiniteDifference, DirectionalFD
-from openmdao.main.linearsolver import ScipyGMRES, PETSc_KSP, LinearGS
+from openmdao.main.linearsolver import ScipyGMRES, ScipySparseLU, PETSc_KSP, \
+                                      LinearGS
 from openmdao.main.mp_support import has_interface
 from openmdao.main.interfaces import IDriver, IAssembly, IImplicitComponent, \
                                      ISolver, IPseudoComp, IComponent, ISystem
 from openmdao.main.vecwrapper import VecWrapper, InputVecWrapper, DataTransfer, \
                                      idx_merge, _filter, _filter_subs, \
                                      _filter_flat, _filter_ignored, \
-                                     dedup
+                                     dedup, vector_views_enabled
 from openmdao.main.depgraph import break_cycles, get_node_boundary, gsort, \
                                    collapse_nodes, simple_node_iter
 from openmdao.main.derivatives import applyJ, applyJT
@@ -52,34 +56,31 @@ class System(object):
 
         self._mapped_resids = {}
 
-        self._out_nodes = []
-
         # find our output nodes (outputs from our System and any child Systems)
+        out_nodes = set()
         for node in nodes:
             if node in graph:
-                for succ in graph.successors(node):
-                    if succ not in self._out_nodes:
-                        self._out_nodes.append(succ)
+                out_nodes.update(graph.successors(node))
 
         all_outs = set(nodes)
-        all_outs.update(self._out_nodes)
+        all_outs.update(out_nodes)
 
         # get our input nodes from the depgraph
         ins, _ = get_node_boundary(graph, all_outs)
 
         #print "%s: ins = %s" % (self.name, ins)
-        self._in_nodes = []
+        in_nodes = set()
         for i in ins:
             if 'comp' not in graph.node[i]:
-                self._in_nodes.append(i)
+                in_nodes.add(i)
             elif i in self.scope.name2collapsed and self.scope.name2collapsed[i] in graph:
                 n = self.scope.name2collapsed[i]
-                if i != n and n not in self._in_nodes:
-                    self._in_nodes.append(n)
+                if i != n:
+                    in_nodes.add(n)
 
-        self._in_nodes = sorted(self._in_nodes)
+        self._in_nodes = sorted(in_nodes)
         #print "%s (%s): _in_nodes = %s" % (str(self.name), type(self), self._in_nodes)
-        self._out_nodes = sorted(self._out_nodes)
+        self._out_nodes = sorted(out_nodes)
 
         self.mpi = MPI_info()
         self.mpi.requested_cpus = (1,1)
@@ -97,6 +98,7 @@ class System(object):
         self.ln_solver = None
         self.fd_solver = None
         self.dfd_solver = None
+        self.fd_sparsity = None
         self.sol_buf = None
         self.rhs_buf = None
         self._parent_system = None
@@ -175,6 +177,19 @@ class System(object):
     def all_subsystems(self):
         return ()
 
+    def clear_solvers(self):
+        """Discard the linear and finite difference solvers and the finite
+        difference sparsity pattern, which are kept between gradient
+        calculations, so they will be recreated using the current options
+        at the current point.
+        """
+        self.ln_solver = None
+        self.fd_solver = None
+        self.dfd_solver = None
+        self.fd_sparsity = None
+        for sub in self.subsystems():
+            sub.clear_solvers()
+
     def list_subsystems(self, local=False):
         """Returns the names of our subsystems."""
         return [s.name for s in self.subsystems(local)]
@@ -786,16 +801,18 @@ class System(object):
 
             solver_choice = self.options.lin_solver
 
-            # scipy_gmres not supported in MPI, so swap with
+            # scipy_gmres and scipy_splu not supported in MPI, so swap with
             # petsc KSP.
-            if MPI and solver_choice=='scipy_gmres':
-                solver_choice = 'petsc_ksp'
-                msg = "scipy_gmres optimizer not supported in MPI. " + \
+            if MPI and solver_choice in ('scipy_gmres', 'scipy_splu'):
+                msg = "%s optimizer not supported in MPI. " % solver_choice + \
                       "Using petsc_ksp instead."
+                solver_choice = 'petsc_ksp'
                 self.options.parent._logger.warning(msg)
 
             if solver_choice == 'scipy_gmres':
                 self.ln_solver = ScipyGMRES(self)
+            elif solver_choice == 'scipy_splu':
+                self.ln_solver = ScipySparseLU(self)
             elif solver_choice == 'petsc_ksp':
                 self.ln_solver = PETSc_KSP(self)
             elif solver_choice == 'linear_gs':
@@ -807,6 +824,9 @@ class System(object):
         for subsystem in self.local_subsystems():
             subsystem.linearize()
 
+        if self.ln_solver is not None:
+            self.ln_solver.reset()
+
     def set_complex_step(self, complex_step=False):
         """ Toggles complex_step plumbing for this system and all
         local subsystems.
@@ -870,9 +890,12 @@ class System(object):
                                               return_format)
         return self.fd_solver.solve(iterbase=iterbase)
 
-    def calc_newton_direction(self, options=None, iterbase=''):
+    def calc_newton_direction(self, options=None, iterbase='',
+                              linearize=True):
         """ Solves for the new state in Newton's method and leaves it in the
-        df vector.
+        df vector. If linearize is False, the Jacobian (and any factorization
+        of it) from the last linearization is used instead, as in a modified
+        Newton method.
         """
 
         self.set_options('forward', options)
@@ -881,8 +904,9 @@ class System(object):
         self.vec['df'].array[:] = 0.0
         self.vec['dp'].array[:] = 0.0
 
-        self.initialize_gradient_solver()
-        self.linearize()
+        if linearize or self.ln_solver is None:
+            self.initialize_gradient_solver()
+            self.linearize()
 
         #print 'Newton Direction', self.vec['f'].array[:]
         self.vec['df'].array[:] = -self.ln_solver.solve(self.vec['f'].array)
@@ -993,6 +1017,17 @@ class SimpleSystem(System):
         self._mapped_resids = {}
         self.distrib_idxs = {}
 
+        # execution cache (see _get_exec_cache_size)
+        self._exec_cache = OrderedDict()
+        self._exec_cache_ins = None
+        self.exec_cache_hits = 0
+        self.exec_cache_misses = 0
+
+        # fingerprint of the point of our last linearization
+        # (see _reuse_linearization)
+        self._linearize_key = None
+        self.linearize_reuses = 0
+
     def setup_sizes(self):
         super(SimpleSystem, self).setup_sizes()
         if self.is_active():
@@ -1165,16 +1200,180 @@ class SimpleSystem(System):
             graph = self.scope._reduced_graph
 
             self._comp.set_itername('%s-%s' % (iterbase, self.name))
+
+            cache_size = self._get_exec_cache_size()
+            if cache_size:
+                key = self._exec_cache_key()
+                if key is not None and self._replay_exec_cache(key):
+                    return
+            else:
+                key = None
+
             self._comp.run(case_uuid=case_uuid)
 
             # put component outputs in u vector
             vnames = [n for n in graph.successors(self.name)
                                    if n in self.vector_vars]
-            self.vec['u'].set_from_scope(self.scope, vnames)
+            if self.complex_step is not True and \
+               vector_views_enabled(self.scope, self._comp.name):
+                self.vec['u'].set_from_scope_shared(self.scope, vnames)
+            else:
+                self.vec['u'].set_from_scope(self.scope, vnames)
 
             if self.complex_step is True:
                 self.vec['du'].set_from_scope_complex(self.scope, vnames)
 
+            if key is not None:
+                self._store_exec_cache(key, cache_size, vnames)
+
+    def _get_exec_cache_size(self):
+        """Return the maximum number of entries allowed in our execution
+        cache. The component's `exec_cache_size` attribute is used if it's
+        not None, otherwise the `default_exec_cache_size` of our scope is
+        used (PseudoComponents ignore the scope default). A size of 0
+        disables execution caching.
+        """
+        comp = self._comp
+        if comp is None or self.complex_step is True:
+            return 0
+
+        size = getattr(comp, 'exec_cache_size', None)
+        if size is None:
+            if has_interface(comp, IPseudoComp):
+                return 0
+            size = getattr(self.scope, 'default_exec_cache_size', 0)
+
+        return size or 0
+
+    def _get_exec_cache_ins(self):
+        """Return a tuple of the form (flat, noflat, unconnected, states)
+        where flat is a list of (vecwrapper, node) for each of our
+        flattenable inputs, noflat is a list of the pathnames of our
+        non-flattenable inputs, unconnected is a list of names of component
+        inputs that are not fully connected in the model, and states is a
+        list of the names of our component's states, if it's implicit.
+        """
+        varmeta = self.scope._var_meta
+        flat = []
+        noflat = []
+        connected = set()
+        for node in self._in_nodes:
+            if isinstance(node, tuple):
+                dests = [d for d in node[1]
+                           if d.split('[', 1)[0].split('.', 1)[0] == self.name]
+            else:
+                dests = [node]
+            connected.update([d.split('.', 1)[-1] for d in dests])
+
+            if varmeta[node].get('noflat'):
+                noflat.extend(dests)
+                continue
+
+            # the p vector of the system that owns the input node holds
+            # the value most recently scattered to us
+            parent = self._parent_system
+            while parent is not None:
+                if 'p' in parent.vec and node in parent.vec['p']:
+                    flat.append((parent.vec['p'], node))
+                    break
+                parent = parent._parent_system
+            else:
+                noflat.extend(dests)
+
+        # inputs that are set directly by the user (or only partially
+        # connected) aren't in any vector, so get those from the component
+        unconnected = [n for n in self._comp.list_inputs()
+                           if n not in connected]
+
+        # an implicit component's outputs depend on its states, which a
+        # solver may change while our inputs stay the same
+        if IImplicitComponent.providedBy(self._comp):
+            states = list(self._comp.list_states())
+        else:
+            states = []
+
+        return flat, noflat, unconnected, states
+
+    def _exec_cache_key(self):
+        """Return a hash of the current values of all of our inputs (and
+        states), or None if they can't be hashed.
+        """
+        if self._exec_cache_ins is None:
+            self._exec_cache_ins = self._get_exec_cache_ins()
+
+        flat, noflat, unconnected, states = self._exec_cache_ins
+        comp = self._comp
+        dumps = cPickle.dumps
+        hsh = hashlib.sha1()
+        try:
+            for vec, node in flat:
+                hsh.update(vec[node].tostring())
+            for name in noflat:
+                hsh.update(dumps(self.scope.get(name), cPickle.HIGHEST_PROTOCOL))
+            for name in chain(unconnected, states):
+                val = comp.get(name)
+                if isinstance(val, numpy.ndarray):
+                    hsh.update(str(val.shape))
+                    hsh.update(val.tostring())
+                else:
+                    hsh.update(dumps(val, cPickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return None
+
+        return hsh.digest()
+
+    def _store_exec_cache(self, key, size, vnames):
+        """Save copies of our current outputs under the given key, evicting
+        the least recently used entry if the cache is full.
+        """
+        scope = self.scope
+        uvec = self.vec['u']
+        flats = [(name, uvec[name].copy()) for name in vnames]
+        try:
+            noflats = []
+            for node in self.noflat_vars:
+                name = node[0] if isinstance(node, tuple) else node
+                noflats.append((name, deepcopy(scope.get(name))))
+        except Exception:
+            return
+
+        self._exec_cache[key] = (flats, noflats)
+        while len(self._exec_cache) > size:
+            self._exec_cache.popitem(last=False)
+
+    def _replay_exec_cache(self, key):
+        """If our cache has an entry for the given key, set our outputs
+        from it and return True, otherwise return False.
+        """
+        entry = self._exec_cache.pop(key, None)
+        if entry is None:
+            self.exec_cache_misses += 1
+            return False
+
+        # re-insert so that this entry is the most recently used
+        self._exec_cache[key] = entry
+        self.exec_cache_hits += 1
+
+        scope = self.scope
+        uvec = self.vec['u']
+        flats, noflats = entry
+        for name, val in flats:
+            uvec[name] = val
+            scope.set_flattened_value(name[0] if isinstance(name, tuple)
+                                              else name, val)
+        for name, val in noflats:
+            scope.set(name, deepcopy(val))
+
+        return True
+
+    def clear_exec_cache(self):
+        """Remove all entries from the execution cache and reset the
+        hit and miss counters.
+        """
+        self._exec_cache.clear()
+        self.exec_cache_hits = 0
+        self.exec_cache_misses = 0
+
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -1205,8 +1404,39 @@ class SimpleSystem(System):
             self.vec['dp'].array[:] = 0.0
 
     def linearize(self):
-        """ Linearize this component. """
+        """ Linearize this component. If linearization reuse is enabled,
+        the previous Jacobian is kept when our inputs, outputs and states
+        are unchanged since it was calculated.
+        """
+        key = None
+        if self._reuse_linearization():
+            key = self._exec_cache_key()
+            if key is not None:
+                key += self.vec['u'].array.tostring()
+                if key == self._linearize_key:
+                    self.linearize_reuses += 1
+                    return
+
         self.J = self._comp.linearize(first=True)
+        self._linearize_key = key
+
+    def _reuse_linearization(self):
+        """Return True if our Jacobian may be reused at an unchanged point.
+        The component's `reuse_linearization` attribute is used if it's not
+        None, otherwise the `default_reuse_linearization` of our scope is
+        used (PseudoComponents ignore the scope default).
+        """
+        comp = self._comp
+        if comp is None or self.complex_step is True:
+            return False
+
+        reuse = getattr(comp, 'reuse_linearization', None)
+        if reuse is None:
+            if has_interface(comp, IPseudoComp):
+                return False
+            reuse = getattr(self.scope, 'default_reuse_linearization', False)
+
+        return bool(reuse)
 
     def applyJ(self, variables):
         """ df = du - dGdp * dp or du = df and dp = -dGdp^T * df """
@@ -1426,6 +1656,11 @@ class AssemblySystem(SimpleSystem):
     def setup_scatters(self):
         self._comp.setup_scatters()
 
+    def clear_solvers(self):
+        super(AssemblySystem, self).clear_solvers()
+        if self._comp._system is not None:
+            self._comp._system.clear_solvers()
+
     def set_options(self, mode, options):
         """ Assembly inner system determines its own mode, but we use parents
         mode at this level. Options will be passed when the gradient is
@@ -1628,7 +1863,7 @@ class CompoundSystem(System):
         return to_idx_array(dedup(all_idxs))
 
     def _get_scatter_idxs(self, node, noflats, arg_idxs, dest_start, destsys):
-        varkeys = self.vector_vars.keys()
+        var_idxs = self._vector_var_idxs
         varmeta = self.scope._var_meta
 
         if node in noflats:
@@ -1639,8 +1874,8 @@ class CompoundSystem(System):
                 return (None, None, None)
 
             sizes = self.local_var_sizes
-            isrc = varkeys.index(node)
-            offset = numpy.sum(sizes[:, :isrc])
+            isrc = var_idxs[node]
+            offset = self._vector_var_offsets[isrc]
             src_idxs = offset + arg_idxs
 
             dest_idxs = dest_start + self.vec['p']._info[node].start + \
@@ -1685,8 +1920,8 @@ class CompoundSystem(System):
                 for comp in destsys._all_comp_nodes():
                     if comp in basedests:
                         return (None, None, None)
-            isrc = varkeys.index(base)
-            src_idxs = numpy.sum(self.local_var_sizes[:, :isrc]) + \
+            isrc = var_idxs[base]
+            src_idxs = self._vector_var_offsets[isrc] + \
                           self.scope._var_meta[node]['flat_idx']
 
             dest_idxs = dest_start + self.vec['p']._info[node].start + \
@@ -1721,6 +1956,16 @@ class CompoundSystem(System):
 
         dest_start = numpy.sum(input_sizes[:rank])
 
+        # position and starting offset of each vector var, and the position
+        # of each var, so scatter indices can be found without rescanning
+        # the var lists for every node.
+        self._vector_var_idxs = dict((node, i) for i, node
+                                         in enumerate(self.vector_vars))
+        self._vector_var_offsets = numpy.zeros(len(self.vector_vars)+1, int)
+        numpy.cumsum(numpy.sum(self.local_var_sizes, axis=0),
+                     out=self._vector_var_offsets[1:])
+        var_order = dict((node, i) for i, node in enumerate(self.variables))
+
         for subsystem in self.all_subsystems():
             src_partial = []
             dest_partial = []
@@ -1730,8 +1975,10 @@ class CompoundSystem(System):
             scatter_conns_rev = set()
             noflat_conns = set()  # non-flattenable vars
             for sub in subsystem.simple_subsystems():
-                for node in self.variables:
-                    if node not in sub._in_nodes or node in scatter_conns:
+                sub_nodes = sorted([n for n in set(sub._in_nodes)
+                                      if n in var_order], key=var_order.get)
+                for node in sub_nodes:
+                    if node in scatter_conns:
                         continue
                     arg_idxs = sub.get_distrib_idxs(node)
                     src_idxs, dest_idxs, nflat = self._get_scatter_idxs(node, noflats,
@@ -2230,6 +2477,10 @@ class OpaqueSystem(SimpleSystem):
     def _all_comp_nodes(self, local=False):
         return self._inner_system._all_comp_nodes(local=local)
 
+    def clear_solvers(self):
+        super(OpaqueSystem, self).clear_solvers()
+        self._inner_system.clear_solvers()
+
     def setup_communicators(self, comm):
         self.mpi.comm = comm
         self._inner_system.setup_communicators(comm)
@@ -2426,6 +2677,12 @@ class DriverSystem(SimpleSystem):
     def get_req_cpus(self):
         return self._comp.workflow._system.get_req_cpus()
 
+    def _get_exec_cache_size(self):
+        """Drivers iterate over their workflow, so their outputs are not
+        a function of their inputs alone. Never cache them.
+        """
+        return 0
+
 
 class FiniteDiffDriverSystem(DriverSystem):
     """A System for a Driver component that is not a Solver."""
@@ -2508,6 +2765,9 @@ class TransparentDriverSystem(DriverSystem):
         for subsystem in self.local_subsystems():
             subsystem.linearize()
 
+        if self.ln_solver is not None:
+            self.ln_solver.reset()
+
     def solve_linear(self, options=None):
         """ Single linear solve solution applied to whatever input is sitting
         in the RHS vector."""
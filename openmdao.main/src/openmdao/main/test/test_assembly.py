@@ -957,6 +957,39 @@ subassy.comp3: ReRun.2-driverB.2-subassy.2-comp3"""
         self.assertEqual([c.name for c in asm.sub.driver.workflow],
                          ['newcomp2', 'newcomp3'])
 
+    def test_incremental_depgraph(self):
+        top = set_as_top(Assembly())
+        top.add('comp1', Simple())
+        top.add('comp2', Simple())
+        top.driver.workflow.add(['comp1', 'comp2'])
+        top.connect('comp1.c', 'comp2.a')
+        top.run()
+
+        graph1 = top._comp_graphs['comp1'][2]
+        graph2 = top._comp_graphs['comp2'][2]
+
+        # a new connection doesn't change the variables of either comp
+        top.connect('comp1.d', 'comp2.b')
+        top.run()
+        self.assertTrue(top._comp_graphs['comp1'][2] is graph1)
+        self.assertTrue(top._comp_graphs['comp2'][2] is graph2)
+        self.assertTrue(top._depgraph.has_edge('comp1.d', 'comp2.b'))
+        self.assertEqual(top.comp2.b, -1.)
+
+        # but a new variable does
+        top.comp2.add('e', Float(3., iotype='out'))
+        top.run()
+        self.assertTrue(top._comp_graphs['comp1'][2] is graph1)
+        self.assertFalse(top._comp_graphs['comp2'][2] is graph2)
+        self.assertTrue('comp2.e' in top._depgraph)
+
+        # and so does replacing a comp
+        top.replace('comp1', Simple())
+        top.comp1.a = 5.
+        top.run()
+        self.assertFalse(top._comp_graphs['comp1'][2] is graph1)
+        self.assertEqual(top.comp2.a, 10.)
+
     def test_direct_connection_bug(self):
 
         # Test for a bug introduced with the MPI changes, where direct bdry-input to
@@ -804,6 +804,55 @@ class Testcase_derivatives(unittest.TestCase):
         assert_rel_error(self, J[0, 0], 5.0, 0.0001)
         assert_rel_error(self, J[0, 1], 21.0, 0.0001)
 
+    def test_setup_reuse(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp', Paraboloid())
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp'])
+        top.driver.add_parameter('comp.x', low=-1000, high=1000)
+        top.driver.add_parameter('comp.y', low=-1000, high=1000)
+        top.driver.add_objective('comp.f_xy')
+
+        top.comp.x = 3
+        top.comp.y = 5
+        top.run()
+
+        count = top.get_setup_stats()['count']
+        for mode in ('forward', 'adjoint', 'fd'):
+            J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                         outputs=['comp.f_xy'],
+                                         mode=mode)
+            assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+            assert_rel_error(self, J[0, 1], 21.0, 0.0001)
+
+        stats = top.get_setup_stats()
+        self.assertEqual(stats['count'], count + 1)
+        self.assertEqual(stats['reused'], 2)
+        phases = stats['phases']
+        self.assertTrue('setup_systems' in phases)
+        self.assertTrue(phases['relevant_subgraph'] <= phases['setup_reduced_graph'])
+        self.assertTrue(stats['last_time'] >= sum([phases[p] for p in
+                                                   ('setup_depgraph',
+                                                    'setup_systems')]))
+        nodes, edges = stats['graphs']['depgraph']
+        self.assertTrue(nodes > 0 and edges > 0)
+        self.assertTrue(stats['vector_size'] > 0)
+
+        # A different set of inputs needs a new setup.
+        J = top.driver.calc_gradient(inputs=['comp.x'],
+                                     outputs=['comp.f_xy'])
+        assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+        self.assertEqual(top.get_setup_stats()['count'], count + 2)
+
+        # So does a change in configuration.
+        top.driver.remove_parameter('comp.y')
+        top.driver.add_parameter('comp.y', low=-1000, high=1000)
+        J = top.driver.calc_gradient(inputs=['comp.x'],
+                                     outputs=['comp.f_xy'])
+        assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+        self.assertEqual(top.get_setup_stats()['count'], count + 3)
+
     def test_multi_non_relevant_path(self):
 
         self.top = set_as_top(Assembly())
@@ -2,13 +2,16 @@
 Specific unit testing for finite difference.
 """
 
+import sys
 import unittest
+from nose import SkipTest
 
 import numpy as np
 
 from openmdao.main.api import Component, VariableTree, Driver, Assembly, set_as_top
 from openmdao.main.datatypes.api import Float, Array, File
 from openmdao.main.depgraph import simple_node_iter
+from openmdao.main.file_supp import FileMetadata
 from openmdao.main.test.test_derivatives import SimpleDriver, ArrayComp2D
 from openmdao.test.execcomp import ExecCompWithDerivatives, ExecComp
 from openmdao.util.testutil import assert_rel_error
@@ -78,6 +81,24 @@ class ArrayParaboloid(Component):
         x = self.x
         self.f_x = (x[0][0]-3.0)**2 + x[0][0]*x[0][1] + (x[0][1]+4.0)**2 - 3.0
 
+class DiagComp(Component):
+
+    x = Array(np.array([1., 2., 3., 4.]), iotype='in')
+    y = Array(np.zeros(4), iotype='out')
+
+    def execute(self):
+        self.y = 3.0*self.x**2
+
+class BoundedComp(Component):
+
+    x = Float(1.0, iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        if not 0.9995 <= self.x <= 1.0005:
+            self.raise_exception('x out of bounds: %s' % self.x, ValueError)
+        self.y = 3.0*self.x**2
+
 class TestFiniteDifference(unittest.TestCase):
 
     def test_fd_step(self):
@@ -318,6 +339,115 @@ class TestFiniteDifference(unittest.TestCase):
         J = top.driver.calc_gradient()
         assert_rel_error(self, J[0, 0], 3.6, 0.001)
 
+    def test_fd_processes(self):
+
+        if sys.platform == 'win32':
+            raise SkipTest("Parallel FD needs fork")
+
+        top = set_as_top(Assembly())
+        top.add('comp', MyComp())
+        top.add('paraboloid', ArrayParaboloid())
+        driver = top.add('driver', SimpleDriver())
+        driver.workflow.add(['comp', 'paraboloid'])
+        driver.add_parameter('comp.x1', low=-1.0, high=1.0)
+        driver.add_parameter('comp.x3', low=-100., high=100.)
+        driver.add_parameter('paraboloid.x', low=[-100, -99], high=[100, 99])
+        driver.add_objective('comp.y')
+        driver.add_constraint('paraboloid.f_x < 0')
+        driver.gradient_options.fd_step = 0.1
+
+        top.comp.x1 = 0.95
+        top.paraboloid.x = np.array([[2., 5.]])
+        top.run()
+
+        J_serial = top.driver.calc_gradient(mode='fd')
+        Jdict_serial = top.driver.calc_gradient(mode='fd',
+                                                return_format='dict')
+        count = top.comp.exec_count
+
+        top.driver.gradient_options.fd_processes = 3
+        J = top.driver.calc_gradient(mode='fd')
+        Jdict = top.driver.calc_gradient(mode='fd', return_format='dict')
+
+        # All steps are taken in the workers.
+        self.assertEqual(top.comp.exec_count, count)
+
+        # Bounds switch x1 to backward; x3 is central from its metadata.
+        assert_rel_error(self, J[0, 0], 3.6, 0.001)
+        assert_rel_error(self, J[0, 1], 4.0, 0.001)
+        np.testing.assert_allclose(J, J_serial)
+        for okey in Jdict_serial:
+            for ikey in Jdict_serial[okey]:
+                np.testing.assert_allclose(Jdict[okey][ikey],
+                                           Jdict_serial[okey][ikey])
+
+        # Workers would share the files of file-based components, so their
+        # steps are taken serially.
+        top.comp.external_files = [FileMetadata(path='comp.out', output=True)]
+        J = top.driver.calc_gradient(mode='fd')
+        self.assertTrue(top.comp.exec_count > count)
+        np.testing.assert_allclose(J, J_serial)
+
+    def test_fd_sparsity(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp1', DiagComp())
+        top.add('comp2', MyCompDerivs())
+        top.driver.workflow.add(['comp1', 'comp2'])
+        top.run()
+
+        inputs = ['comp1.x', 'comp2.x1']
+        outputs = ['comp1.y', 'comp2.y']
+
+        count = top.comp1.exec_count
+        J_ref = top.driver.calc_gradient(inputs, outputs, mode='fd')
+        self.assertEqual(top.comp1.exec_count - count, 5)
+
+        # The graph only knows comp2.x1 can share a run with comp1.x
+        top.driver.gradient_options.fd_sparsity = 'graph'
+        count = top.comp1.exec_count
+        J = top.driver.calc_gradient(inputs, outputs, mode='fd')
+        self.assertEqual(top.comp1.exec_count - count, 4)
+        np.testing.assert_allclose(J, J_ref)
+
+        # The probe finds that comp1 is diagonal.
+        top.driver.gradient_options.fd_sparsity = 'probe'
+        J = top.driver.calc_gradient(inputs, outputs, mode='fd')
+        np.testing.assert_allclose(J, J_ref)
+        system = top.driver.workflow._system
+        self.assertTrue(system.fd_sparsity is not None)
+
+        count = top.comp1.exec_count
+        J = top.driver._calc_gradient(inputs, outputs, mode='fd')
+        self.assertEqual(top.comp1.exec_count - count, 1)
+        np.testing.assert_allclose(J, J_ref)
+
+        # The public calc_gradient reuses the systems but probes again.
+        sparsity = system.fd_sparsity
+        count = top.comp1.exec_count
+        J = top.driver.calc_gradient(inputs, outputs, mode='fd',
+                                     return_format='dict')
+        self.assertTrue(top.driver.workflow._system is system)
+        self.assertTrue(system.fd_sparsity is not sparsity)
+        self.assertTrue(top.comp1.exec_count - count > 1)
+        np.testing.assert_allclose(J['comp1.y']['comp1.x'], J_ref[:4, :4])
+        np.testing.assert_allclose(J['comp2.y']['comp2.x1'], J_ref[4:, 4:])
+
+    def test_fd_sparsity_bounds(self):
+
+        # The probe's random step must respect both parameter bounds.
+        top = set_as_top(Assembly())
+        top.add('comp', BoundedComp())
+        driver = top.add('driver', SimpleDriver())
+        driver.workflow.add('comp')
+        driver.add_parameter('comp.x', low=0.9995, high=1.0005)
+        driver.add_objective('comp.y')
+        driver.gradient_options.fd_sparsity = 'probe'
+        top.run()
+
+        J = top.driver.calc_gradient(mode='fd')
+        assert_rel_error(self, J[0, 0], 6.0, 0.001)
+
     def test_PA_slices(self):
 
         top = set_as_top(Assembly())
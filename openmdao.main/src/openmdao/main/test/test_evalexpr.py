@@ -309,6 +309,37 @@ class ExprEvalTestCase(unittest.TestCase):
         self.assertEqual(11.1, self.top.comp.y)
         self.assertEqual(new_text(ex), "scope.get('comp.y')")
 
+    def test_fast_path(self):
+        ex = ExprEvaluator('comp.x*2 + a.a1d[int(comp.y)-41]', self.top)
+        self.assertEqual(ex.evaluate(), 3.14*2 + 2.)
+        self.assertTrue(ex._fast_code)
+
+        self.top.comp.x = 1.0
+        self.top.a.a1d = array([1., 2., 3.])
+        self.assertEqual(ex.evaluate(), 4.)
+
+        # array expressions are evaluated by numpy as a whole
+        ex = ExprEvaluator('a.a1d**2 - a.f', self.top)
+        self.assertEqual(list(ex.evaluate()), [1., 4., 9.])
+
+        # replacing a component is a config change, so we recompile
+        ex = ExprEvaluator('comp.x', self.top)
+        ex.evaluate()
+        code = ex._fast_code
+        self.top.add('comp', Comp())
+        self.top.comp.x = 5.5
+        self.assertEqual(ex.evaluate(), 5.5)
+        self.assertTrue(ex._fast_code is not code)
+
+        # names that aren't in the scope's __dict__ use scope.get()
+        ex = ExprEvaluator('some_prop', self.top.a)
+        self.assertEqual(ex.evaluate(), 7)
+        self.assertTrue(ex._fast_code is False)
+
+        # list comprehension variables must not leak into the scope
+        ex = ExprEvaluator('sum([v for v in a.a1d])', self.top)
+        self.assertFalse(ex._parse_fast(self.top))
+
     def test_no_scope(self):
         ex = ExprEvaluator('abs(-3)+int(2.3)+math.floor(5.4)')
         self.assertEqual(ex.evaluate(), 10.0)
@@ -673,6 +704,51 @@ class ExprEvalTestCase(unittest.TestCase):
 
         assert_rel_error(self, grad['comp1.in1'], 1.0, 0.00001)
 
+    def test_eval_gradient_symbolic(self):
+        top = set_as_top(Assembly())
+        top.add('comp1', A())
+        top.comp1.f = 3.0
+        top.run()
+
+        # Elementwise expressions have diagonal Jacobians.
+        exp = ExprEvaluator('sin(comp1.c1d)*comp1.a1d/2.0 - exp(-comp1.c1d)',
+                            top.driver)
+        grad = exp.evaluate_gradient(scope=top, diagonal=True)
+        self.assertEqual(grad['comp1.c1d'].shape, (4,))
+        self.assertEqual(grad['comp1.a1d'].shape, (4,))
+        for i, (c, a) in enumerate(zip(top.comp1.c1d, top.comp1.a1d)):
+            assert_rel_error(self, grad['comp1.c1d'][i],
+                             cos(c)*a/2.0 + math.exp(-c), 0.000001)
+            assert_rel_error(self, grad['comp1.a1d'][i], sin(c)/2.0, 0.000001)
+
+        grad = exp.evaluate_gradient(scope=top)
+        self.assertEqual(grad['comp1.c1d'].shape, (4, 4))
+        self.assertEqual(grad['comp1.c1d'][0, 1], 0.0)
+        assert_rel_error(self, grad['comp1.c1d'][1, 1],
+                         cos(1.0) + math.exp(-1.0), 0.000001)
+
+        # Scalar broadcast against an array.
+        exp = ExprEvaluator('comp1.f**2*comp1.c1d', top.driver)
+        grad = exp.evaluate_gradient(scope=top, diagonal=True)
+        self.assertEqual(grad['comp1.f'].shape, (4, 1))
+        for i, c in enumerate(top.comp1.c1d):
+            assert_rel_error(self, grad['comp1.f'][i, 0], 6.0*c, 0.000001)
+            assert_rel_error(self, grad['comp1.c1d'][i], 9.0, 0.000001)
+
+        # Reduction.
+        exp = ExprEvaluator('numpy.sum(comp1.c1d**2)', top.driver)
+        grad = exp.evaluate_gradient(scope=top)
+        self.assertEqual(grad['comp1.c1d'].shape, (1, 4))
+        for i, c in enumerate(top.comp1.c1d):
+            assert_rel_error(self, grad['comp1.c1d'][0, i], 2.0*c, 0.000001)
+
+        # Unsupported functions fall back to complex step.
+        exp = ExprEvaluator('numpy.cumsum(comp1.c1d)', top.driver)
+        grad = exp.evaluate_gradient(scope=top, diagonal=True)
+        self.assertEqual(grad['comp1.c1d'].shape, (4, 4))
+        assert_rel_error(self, grad['comp1.c1d'][3, 0], 1.0, 0.000001)
+        assert_rel_error(self, grad['comp1.c1d'][0, 3], 0.0, 0.000001)
+
     def test_connected_expr(self):
         ConnectedExprEvaluator("var1[x]", self.top)._parse()
         try:
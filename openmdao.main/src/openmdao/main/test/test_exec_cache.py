@@ -0,0 +1,131 @@
+import unittest
+
+import numpy as np
+
+from openmdao.main.api import Assembly, Component, ImplicitComponent, \
+                              set_as_top
+from openmdao.main.datatypes.api import Float, Array
+
+
+class Doubler(Component):
+
+    x = Float(1.0, iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = 2.0*self.x
+
+
+class ArrDoubler(Component):
+
+    x = Array(np.ones(3), iotype='in')
+    y = Array(np.zeros(3), iotype='out')
+
+    def execute(self):
+        self.y = 2.0*self.x
+
+
+class Implicit(ImplicitComponent):
+
+    a = Float(2.0, iotype='in')
+    x = Float(1.0, iotype='state')
+    r = Float(iotype='residual')
+
+    def evaluate(self):
+        self.r = self.a*self.x - 4.0
+
+
+class ExecCacheTestCase(unittest.TestCase):
+
+    def _chain(self, klass):
+        top = set_as_top(Assembly())
+        top.add('c1', klass())
+        top.add('c2', klass())
+        top.connect('c1.y', 'c2.x')
+        top.driver.workflow.add(['c1', 'c2'])
+        return top
+
+    def test_disabled_by_default(self):
+        top = self._chain(Doubler)
+        top.run()
+        top.run()
+        self.assertEqual(top.c1.exec_count, 2)
+        self.assertEqual(top.c2.exec_count, 2)
+
+    def test_assembly_default(self):
+        top = self._chain(Doubler)
+        top.default_exec_cache_size = 4
+        top.c1.x = 3.0
+        top.run()
+        top.run()
+        self.assertEqual(top.c1.exec_count, 1)
+        self.assertEqual(top.c2.exec_count, 1)
+        self.assertEqual(top.c2.y, 12.0)
+
+        system = top._system.find_system('c2')
+        self.assertEqual(system.exec_cache_hits, 1)
+        self.assertEqual(system.exec_cache_misses, 1)
+
+        # changing an unconnected input must cause a miss
+        top.c1.x = 4.0
+        top.run()
+        self.assertEqual(top.c1.exec_count, 2)
+        self.assertEqual(top.c2.exec_count, 2)
+        self.assertEqual(top.c2.y, 16.0)
+
+        # previous inputs are still in the cache
+        top.c1.x = 3.0
+        top.run()
+        self.assertEqual(top.c1.exec_count, 2)
+        self.assertEqual(top.c2.exec_count, 2)
+        self.assertEqual(top.c1.y, 6.0)
+        self.assertEqual(top.c2.y, 12.0)
+
+    def test_per_comp_override(self):
+        top = self._chain(Doubler)
+        top.default_exec_cache_size = 4
+        top.c2.exec_cache_size = 0
+        top.run()
+        top.run()
+        self.assertEqual(top.c1.exec_count, 1)
+        self.assertEqual(top.c2.exec_count, 2)
+
+    def test_lru_eviction(self):
+        top = self._chain(ArrDoubler)
+        top.c1.exec_cache_size = 1
+        top.c1.x = np.array([1., 2., 3.])
+        top.run()
+        top.c1.x = np.array([4., 5., 6.])
+        top.run()
+        top.c1.x = np.array([1., 2., 3.])
+        top.run()
+        self.assertEqual(top.c1.exec_count, 3)
+        np.testing.assert_array_equal(top.c2.y, [4., 8., 12.])
+
+        top.run()
+        self.assertEqual(top.c1.exec_count, 3)
+        system = top._system.find_system('c1')
+        self.assertEqual(len(system._exec_cache), 1)
+        np.testing.assert_array_equal(top.c2.y, [4., 8., 12.])
+
+    def test_implicit_states(self):
+        top = set_as_top(Assembly())
+        top.add('comp', Implicit())
+        top.driver.workflow.add('comp')
+        top.comp.exec_cache_size = 4
+        top.run()
+        self.assertEqual(top.comp.r, -2.0)
+
+        # same inputs but a new state must not replay the old residual
+        top.comp.x = 3.0
+        top.run()
+        self.assertEqual(top.comp.exec_count, 2)
+        self.assertEqual(top.comp.r, 2.0)
+
+        top.run()
+        self.assertEqual(top.comp.exec_count, 2)
+        self.assertEqual(top.comp.r, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -165,6 +165,94 @@ class Testcase_Scipy_Gmres(unittest.TestCase):
         assert_rel_error(self, J[0, 0], 5.0, 0.0001)
         assert_rel_error(self, J[0, 1], 21.0, 0.0001)
 
+    def test_scipy_gmres_direct(self):
+
+        top = set_as_top(Sellar_MDA_subbed_connected())
+        top.driver.gradient_options.lin_solver = 'scipy_gmres'
+        top.run()
+        J_iter = top.driver.calc_gradient(mode='forward')
+
+        top.driver.gradient_options.gmres_mode = 'direct'
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, J[0, 0], J_iter[0, 0], 0.0001)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, J[0, 0], J_iter[0, 0], 0.0001)
+
+        J = top.driver.calc_gradient(mode='forward', return_format='dict')
+        cname = top.driver.list_constraint_targets()[0]
+        assert_rel_error(self, J[cname]['P1.x'][0][0], J_iter[0, 0], 0.0001)
+
+
+    def test_scipy_gmres_preconditioned(self):
+
+        top = set_as_top(Sellar_MDA_subbed_connected())
+        top.driver.gradient_options.lin_solver = 'scipy_gmres'
+        top.run()
+        J_base = top.driver.calc_gradient(mode='forward')
+        base_iters = top.driver.workflow._system.ln_solver.iter_count
+
+        for precon in ('block_jacobi', 'linear_gs'):
+            top.driver.gradient_options.preconditioner = precon
+
+            J = top.driver.calc_gradient(mode='forward')
+            assert_rel_error(self, J[0, 0], J_base[0, 0], 0.0001)
+            solver = top.driver.workflow._system.ln_solver
+            self.assertTrue(solver.iter_count <= base_iters)
+
+            J = top.driver.calc_gradient(mode='adjoint')
+            assert_rel_error(self, J[0, 0], J_base[0, 0], 0.0001)
+
+
+class Testcase_Scipy_SPLU(unittest.TestCase):
+    """ Test the assembled sparse LU linear solver. """
+
+    def test_scipy_splu_single_comp(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp', Paraboloid())
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp'])
+        top.driver.add_parameter('comp.x', low=-1000, high=1000)
+        top.driver.add_parameter('comp.y', low=-1000, high=1000)
+        top.driver.add_objective('comp.f_xy')
+
+        top.driver.gradient_options.lin_solver = 'scipy_splu'
+
+        top.comp.x = 3
+        top.comp.y = 5
+        top.run()
+
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                              outputs=['comp.f_xy'],
+                                              mode='forward')
+
+        assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 21.0, 0.0001)
+
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                              mode='adjoint')
+
+        assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 21.0, 0.0001)
+
+    def test_scipy_splu_Sellar_subbed_connected(self):
+
+        top = set_as_top(Sellar_MDA_subbed_connected())
+        top.driver.gradient_options.lin_solver = 'scipy_gmres'
+        top.run()
+        J_iter = top.driver.calc_gradient(mode='forward')
+
+        top = set_as_top(Sellar_MDA_subbed_connected())
+        top.driver.gradient_options.lin_solver = 'scipy_splu'
+        top.run()
+
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, J[0, 0], J_iter[0, 0], 0.0001)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, J[0, 0], J_iter[0, 0], 0.0001)
+
 
 class Testcase_Linear_GS(unittest.TestCase):
     """ Test Linear Gauss Siedel linear solver. """
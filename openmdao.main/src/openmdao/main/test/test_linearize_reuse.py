@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+from openmdao.main.test.simpledriver import SimpleDriver
+from openmdao.util.testutil import assert_rel_error
+
+
+class Square(Component):
+
+    x = Float(1.0, iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = self.x**2
+
+    def provideJ(self):
+        return np.array([[2.0*self.x]])
+
+    def list_deriv_vars(self):
+        return ('x',), ('y',)
+
+
+class LinearizeReuseTestCase(unittest.TestCase):
+
+    def _model(self):
+        top = set_as_top(Assembly())
+        top.add('comp', Square())
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp'])
+        top.driver.add_parameter('comp.x', low=-100, high=100)
+        top.driver.add_objective('comp.y')
+        return top
+
+    def test_disabled_by_default(self):
+        top = self._model()
+        top.run()
+        top.driver.calc_gradient()
+        top.driver.calc_gradient()
+        self.assertEqual(top.comp.derivative_exec_count, 2)
+
+    def test_assembly_default(self):
+        top = self._model()
+        top.default_reuse_linearization = True
+        top.comp.x = 3.0
+        top.run()
+        J = top.driver.calc_gradient()
+        assert_rel_error(self, J[0, 0], 6.0, 1e-6)
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, J[0, 0], 6.0, 1e-6)
+        self.assertEqual(top.comp.derivative_exec_count, 1)
+
+        system = top.driver.workflow._system.find_system('comp')
+        self.assertEqual(system.linearize_reuses, 1)
+
+        # a new point must be linearized again
+        top.comp.x = 4.0
+        top.run()
+        J = top.driver.calc_gradient()
+        assert_rel_error(self, J[0, 0], 8.0, 1e-6)
+        self.assertEqual(top.comp.derivative_exec_count, 2)
+
+    def test_per_comp_override(self):
+        top = self._model()
+        top.default_reuse_linearization = True
+        top.comp.reuse_linearization = False
+        top.run()
+        top.driver.calc_gradient()
+        top.driver.calc_gradient()
+        self.assertEqual(top.comp.derivative_exec_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
 
 import unittest
+
+import numpy
+
 from openmdao.main.api import set_as_top, Assembly, Component
-from openmdao.main.datatypes.api import Float
+from openmdao.main.datatypes.api import Float, Int, Str, List, Array
+from openmdao.main.vecwrapper import SerialScatter
 
 class Simple(Component):
 
@@ -18,6 +22,30 @@ class Simple(Component):
         self.d = self.a - self.b
 
 
+class NoFlat(Component):
+
+    n = Int(1, iotype='in')
+    s = Str('a', iotype='in')
+    lst = List([1], iotype='in')
+    n_out = Int(1, iotype='out')
+    s_out = Str('a', iotype='out')
+    lst_out = List([1], iotype='out')
+
+    def execute(self):
+        self.n_out = self.n + 1
+        self.s_out = self.s + 'b'
+        self.lst_out = self.lst + [len(self.lst)+1]
+
+
+class Scale(Component):
+
+    x = Array(numpy.ones(3), iotype='in')
+    y = Array(numpy.zeros(3), iotype='out')
+
+    def execute(self):
+        self.y = 2.0 * self.x
+
+
 def _nested_model():
     top = set_as_top(Assembly())
     top.add('sub', Assembly())
@@ -83,7 +111,87 @@ class VecWrapperTestCase(unittest.TestCase):
                               ('comp4.d', ('comp6.a',))]))
                 
         self.assertEqual(top.sub._system.vec['u'].array.size, 15)
- 
+
+    def test_serial_scatter_runs(self):
+        src = numpy.arange(200.)
+        src_idxs = numpy.concatenate((numpy.arange(100, 200),
+                                      numpy.arange(0, 100)))
+        dest_idxs = numpy.arange(200)
+        scatter = SerialScatter(None, src_idxs, None, dest_idxs)
+        self.assertEqual(len(scatter.runs), 2)
+
+        dest = numpy.zeros(200)
+        scatter.scatter(src, dest, False, False)
+        self.assertTrue(numpy.all(dest == src[src_idxs]))
+
+        # reverse scatter adds into the source
+        back = numpy.ones(200)
+        scatter.scatter(dest, back, True, True)
+        self.assertTrue(numpy.all(back[src_idxs] == dest + 1.))
+
+        # short runs, or duplicated sources, use fancy indexing
+        src_idxs = numpy.arange(200)[::-1]
+        scatter = SerialScatter(None, src_idxs, None, dest_idxs)
+        self.assertEqual(scatter.runs, None)
+        src_idxs = numpy.zeros(200, int)
+        scatter = SerialScatter(None, src_idxs, None, dest_idxs)
+        self.assertEqual(scatter.runs, None)
+
+    def test_noflat_transfer(self):
+        top = set_as_top(Assembly())
+        top.add('comp1', NoFlat())
+        top.add('comp2', NoFlat())
+        top.add('comp3', NoFlat())
+        top.driver.workflow.add(['comp1', 'comp2', 'comp3'])
+        for src, dest in (('comp1', 'comp2'), ('comp1', 'comp3')):
+            for name in ('n', 's', 'lst'):
+                top.connect('%s.%s_out' % (src, name), '%s.%s' % (dest, name))
+
+        top.comp1.n = 3
+        top.comp1.s = 'x'
+        top.comp1.lst = [7]
+        top.run()
+
+        for comp in (top.comp2, top.comp3):
+            self.assertEqual(comp.n, 4)
+            self.assertEqual(comp.s, 'xb')
+            self.assertEqual(comp.lst, [7, 2])
+
+        # each destination gets its own copy of a mutable value
+        self.assertFalse(top.comp2.lst is top.comp3.lst)
+
+        top.comp1.n = 5
+        top.run()
+        self.assertEqual(top.comp2.n, 6)
+        self.assertEqual(top.comp3.n_out, 7)
+
+    def test_vector_views(self):
+        top = set_as_top(Assembly())
+        top.default_vector_views = True
+        top.add('comp1', Scale())
+        top.add('comp2', Scale())
+        top.add('comp3', Scale())
+        top.comp3.vector_views = False
+        top.driver.workflow.add(['comp1', 'comp2', 'comp3'])
+        top.connect('comp1.y', 'comp2.x')
+        top.connect('comp2.y', 'comp3.x')
+
+        top.comp1.x = numpy.array([1.0, 2.0, 3.0])
+        top.run()
+
+        uvec = top._system.vec['u']
+        self.assertTrue(numpy.may_share_memory(top.comp1.y,
+                                               uvec['comp1.y']))
+        self.assertFalse(numpy.may_share_memory(top.comp3.y,
+                                                uvec['comp3.y']))
+        self.assertTrue(all(top.comp2.x == [2.0, 4.0, 6.0]))
+        self.assertTrue(all(top.comp3.y == [8.0, 16.0, 24.0]))
+
+        top.comp1.x = numpy.array([-1.0, 0.0, 1.0])
+        top.run()
+        self.assertTrue(all(top.comp2.x == [-2.0, 0.0, 2.0]))
+        self.assertTrue(all(top.comp3.y == [-8.0, 0.0, 8.0]))
+
 
 if __name__ == "__main__":
     unittest.main()
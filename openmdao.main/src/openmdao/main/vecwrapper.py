@@ -7,8 +7,11 @@ from openmdao.main.mpiwrap import MPI, create_petsc_vec, PETSc, make_idx_array,
 from openmdao.main.array_helpers import offset_flat_index, \
                                         get_flat_index_start, get_val_and_index, get_shape, \
                                         get_flattened_index, to_slice, to_indices
-from openmdao.main.interfaces import IImplicitComponent
+from openmdao.main.interfaces import IImplicitComponent, IAssembly, IDriver, \
+                                     IPseudoComp
+from openmdao.main.mp_support import has_interface
 from openmdao.main.datatypes.file import FileRef
+from openmdao.main.setupstats import timed
 
 from openmdao.util.typegroups import int_types
 from openmdao.util.graph import base_var
@@ -303,6 +306,37 @@ class VecWrapper(VecWrapperBase):
             else:
                 self[name] = scope.get_flattened_value(name).real
 
+    def set_from_scope_shared(self, scope, vnames):
+        """Like :meth:`set_from_scope`, except that a float array variable
+        that fills its view of our array is replaced in the scope by a view
+        of our array, so it won't have to be copied again. Variables that
+        already share our array's memory are skipped, and those that have
+        been replaced by a new array are copied and shared again. Any other
+        variables are copied as usual.
+        """
+        copies = []
+        for name in vnames:
+            if name not in self:
+                continue
+            info = self._info[name]
+            path = name[0] if isinstance(name, tuple) else name
+            if '[' in path or info.idxs != slice(None):
+                copies.append(name)
+                continue
+
+            val = scope.get(path)
+            if _shares_data(val, info.view):
+                continue
+            if isinstance(val, ndarray) and val.dtype == info.view.dtype and \
+               val.size == info.view.size:
+                info.view[:] = val.flat
+                scope.set(path, info.view.reshape(val.shape))
+            else:
+                copies.append(name)
+
+        if copies:
+            self.set_from_scope(scope, copies)
+
     def set_from_scope_complex(self, scope, vnames=None):
         """Get the named values from the given scope and set flattened
         versions of just the complex portion into our array.
@@ -346,6 +380,10 @@ class InputVecWrapper(VecWrapperBase):
         varmeta = scope._var_meta
         name2collapsed = scope.name2collapsed
         flat_ins = _filter_flat(scope, system._owned_args)
+
+        # whether each input we set belongs to a component that uses
+        # vector views, keyed by input pathname
+        self._views = {}
         start, end = 0, 0
 
         #print "%s: %s: %s" % (system.name, type(system), flat_ins)
@@ -415,12 +453,25 @@ class InputVecWrapper(VecWrapperBase):
             array_val = self[name]
             if isinstance(name, tuple):
                 for dest in name[1]:
-                    scope.set_flattened_value(dest, array_val)
+                    if not self._is_shared(scope, dest, array_val):
+                        scope.set_flattened_value(dest, array_val)
                     #print "scope set", dest, array_val
             else:
                 scope.set_flattened_value(name, array_val)
                 #print "scope set", name, array_val
 
+    def _is_shared(self, scope, dest, array_val):
+        """Return True if input `dest` belongs to a component that uses
+        vector views and its value already occupies the memory of
+        `array_val`, so there is no need to set it.
+        """
+        views = self._views.get(dest)
+        if views is None:
+            cname, _, vname = dest.partition('.')
+            views = self._views[dest] = bool(vname) and '[' not in dest and \
+                                        vector_views_enabled(scope, cname)
+        return views and _shares_data(scope.get(dest), array_val)
+
     def set_to_scope_complex(self, scope, vnames=None):
         """Pull values for the given set of names out of our array
         and set them into the given scope as the complex part of the value.
@@ -473,7 +524,8 @@ class DataTransfer(object):
             return  # no data to xfer
 
         try:
-            var_idxs, input_idxs = merge_idxs(var_idxs, input_idxs)
+            var_idxs, input_idxs = timed('merge_idxs', merge_idxs,
+                                         var_idxs, input_idxs)
         except Exception as err:
             raise RuntimeError("ERROR creating scatter for system %s in scope %s: %s" %
                                 (system.name, str(system.scope), str(err)))
@@ -581,14 +633,7 @@ class DataTransfer(object):
                                                                (dest, src), sys.exc_info())
             else:
                 for src, dests in self.noflat_vars:
-                    for dest in dests:
-                        if src != dest:
-                            try:
-                                system.scope.set(dest,
-                                                 system.scope.get_attr_w_copy(src))
-                            except Exception:
-                                system.scope.reraise_exception("cannot set '%s' from '%s'" %
-                                                               (dest, src), sys.exc_info())
+                    _transfer_noflat(system.scope, src, dests)
 
     def dump(self, system, srcvec, destvec, nest=0, stream=sys.stdout):
         if not self.scatter_conns:
@@ -615,6 +660,70 @@ class DataTransfer(object):
             stream.write("no-flats: %s\n" % self.noflat_vars)
 
 
+def vector_views_enabled(scope, cname):
+    """Return True if the component named `cname` in `scope` shares its
+    float array variables with the system vectors rather than copying them.
+    This is set by the component's `vector_views` attribute or, if that is
+    None, by the `default_vector_views` attribute of `scope`. Assemblies,
+    drivers and pseudocomponents never share.
+    """
+    comp = getattr(scope, cname, None)
+    if comp is None or has_interface(comp, IAssembly) or \
+       has_interface(comp, IDriver) or has_interface(comp, IPseudoComp):
+        return False
+
+    views = getattr(comp, 'vector_views', None)
+    if views is None:
+        views = getattr(scope, 'default_vector_views', False)
+    return bool(views)
+
+
+def _shares_data(val, view):
+    """Return True if `val` is a C contiguous array that occupies the same
+    memory as the 1D array `view`.
+    """
+    return isinstance(val, ndarray) and val.size == view.size and \
+           val.dtype == view.dtype and val.flags.c_contiguous and \
+           val.__array_interface__['data'][0] == \
+           view.__array_interface__['data'][0]
+
+
+# types of values that can be shared by the source and destinations of a
+# non-flattenable transfer rather than copied
+_immutable_types = (str, unicode, bool, int, long, float, complex, type(None))
+
+
+def _transfer_noflat(scope, src, dests):
+    """Set each of `dests` in `scope` to the value of `src`. Immutable values
+    are shared, and aren't set at all if a destination already has an equal
+    value. Others are copied for each destination according to their 'copy'
+    metadata.
+    """
+    dests = [dest for dest in dests if dest != src]
+    if not dests:
+        return
+
+    try:
+        val = scope.get(src)
+    except Exception:
+        scope.reraise_exception("cannot set '%s' from '%s'" %
+                                (dests[0], src), sys.exc_info())
+    shared = type(val) in _immutable_types
+
+    for dest in dests:
+        try:
+            if shared:
+                old = scope.get(dest)
+                if type(old) is type(val) and old == val:
+                    continue
+                scope.set(dest, val)
+            else:
+                scope.set(dest, scope.get_attr_w_copy(src))
+        except Exception:
+            scope.reraise_exception("cannot set '%s' from '%s'" %
+                                    (dest, src), sys.exc_info())
+
+
 class SerialScatter(object):
     def __init__(self, srcvec, src_idxs, destvec, dest_idxs):
         self.src_idxs = to_slice(src_idxs)
@@ -622,12 +731,53 @@ class SerialScatter(object):
         self.svec = srcvec
         self.dvec = destvec
 
+        # if the indices are made up of a few long runs of consecutive
+        # indices, copy each run as a slice rather than using fancy indexing
+        self.runs = None
+        if not (isinstance(self.src_idxs, slice) and
+                isinstance(self.dest_idxs, slice)):
+            runs = _contiguous_runs(numpy.asarray(src_idxs),
+                                    numpy.asarray(dest_idxs))
+            if runs is not None and \
+               len(src_idxs) >= _MIN_AVG_RUN * len(runs):
+                self.runs = runs
+
     def scatter(self, srcvec, destvec, addv, mode):
-        if addv is True:
+        if self.runs is not None:
+            if addv is True:
+                for src, dest in self.runs:
+                    destvec[src] += srcvec[dest]
+            else:
+                for src, dest in self.runs:
+                    destvec[dest] = srcvec[src]
+        elif addv is True:
             destvec[self.src_idxs] += srcvec[self.dest_idxs]
         else:
             destvec[self.dest_idxs] = srcvec[self.src_idxs]
 
+
+# minimum average run length for a SerialScatter to use slice copies
+_MIN_AVG_RUN = 32
+
+
+def _contiguous_runs(src_idxs, dest_idxs):
+    """Return a list of (src_slice, dest_slice) for each run of indices
+    that are consecutive in both `src_idxs` and `dest_idxs`, or None if
+    `src_idxs` has duplicates, since a reverse scatter by fancy indexing
+    would then only add one of the duplicated values.
+    """
+    if len(numpy.unique(src_idxs)) != len(src_idxs):
+        return None
+
+    breaks = numpy.nonzero((numpy.diff(src_idxs) != 1) |
+                           (numpy.diff(dest_idxs) != 1))[0] + 1
+    starts = [0] + breaks.tolist()
+    ends = breaks.tolist() + [len(src_idxs)]
+
+    return [(slice(int(src_idxs[start]), int(src_idxs[end-1])+1),
+             slice(int(dest_idxs[start]), int(dest_idxs[end-1])+1))
+            for start, end in zip(starts, ends)]
+
 def merge_idxs(src_idxs, dest_idxs):
     """Return source and destination index arrays, built up from
     smaller index arrays and combined in order of ascending source
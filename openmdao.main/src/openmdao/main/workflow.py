@@ -23,6 +23,7 @@ from openmdao.main.systems import SerialSystem, ParallelSystem, \
 from openmdao.main.depgraph import _get_inner_connections, get_nondiff_groups, \
                                    collapse_nodes, simple_node_iter, CollapsedGraph
 from openmdao.main.exceptions import RunStopped
+from openmdao.main.setupstats import timed
 from openmdao.main.interfaces import IVariableTree, IDriver
 from openmdao.main.depgraph import is_connection
 from openmdao.util.decorators import method_accepts
@@ -173,12 +174,13 @@ class Workflow(object):
                                        iterbase=self._iterbase(),
                                        return_format=return_format)
 
-    def calc_newton_direction(self):
+    def calc_newton_direction(self, linearize=True):
         """ Solves for the new state in Newton's method and leaves it in the
-        df vector."""
+        df vector. Set linearize to False to reuse the last linearization."""
 
         self._system.calc_newton_direction(options=self.parent.gradient_options,
-                                           iterbase=self._iterbase())
+                                           iterbase=self._iterbase(),
+                                           linearize=linearize)
 
     def configure_recording(self, recording_options=None):
         """Called at start of top-level run to configure case recording.
@@ -636,7 +638,8 @@ class Workflow(object):
         Collapse the graph into nodes representing parallel
         and serial subsystems.
         """
-        cgraph = partition_subsystems(scope, reduced, cgraph)
+        cgraph = timed('partition_subsystems', partition_subsystems,
+                       scope, reduced, cgraph)
 
         if len(cgraph) > 1:
             if len(cgraph.edges()) > 0:
@@ -5,6 +5,7 @@ Note: This is a work in progress.
 """
 
 import re
+from bisect import bisect_left, bisect_right
 
 from pyparsing import CaselessLiteral, Combine, OneOrMore, Optional, \
                       TokenConverter, Word, nums, oneOf, printables, \
@@ -12,82 +13,102 @@ from pyparsing import CaselessLiteral, Combine, OneOrMore, Optional, \
 
 from numpy import append, array, zeros
 
-def _getformat(val):
-    # Returns the output format for a floating point number.
-    # The general format is used with 16 places of accuracy, except for when
-    # the floating point value is an integer, in which case a decimal point
-    # followed by a single zero is used.
+# A field that is a plain integer or float, as the pyparsing grammar of
+# FileParser converts it. NaN, Inf and anything else are left to the grammar.
+_NUMBER = r'(?:[+-]?(?:\d+\.\d*|\.\d+)(?:[eED][+-]?\d+)?|\d+[eED][+-]?\d+|[+-]?\d+)'
+_INTEGER = re.compile(r'[+-]?\d+\Z')
 
-    if int(val) == val:
-        return "%.1f"
+
+def _to_value(field):
+    """Convert a numeric field to an int or a float."""
+    if _INTEGER.match(field):
+        return int(field)
+    return float(field.replace('D', 'E'))
+
+
+def _to_floats(fields):
+    """Convert a list (or list of lists) of numeric fields to a float array."""
+    try:
+        return array(fields, dtype=float)
+    except ValueError:  # Fortran 'D' exponents.
+        if fields and isinstance(fields[0], list):
+            fields = [[f.replace('D', 'E') for f in row] for row in fields]
+        else:
+            fields = [f.replace('D', 'E') for f in fields]
+        return array(fields, dtype=float)
+
+
+def _find_anchor(data, index, anchor, occurrence, current_row, anchored):
+    """Return the row of `data` holding the given `occurrence` of `anchor`,
+    searching as described in ``mark_anchor``, or None if there isn't one.
+    `index` maps each anchor searched for so far to the sorted rows that
+    contain it, so each anchor only scans the file once."""
+
+    rows = index.get(anchor)
+    if rows is None:
+        rows = index[anchor] = [i for i, line in enumerate(data)
+                                       if anchor in line]
+
+    # The text after (or before, for a reverse search) an anchor on its own
+    # line never contains it, so an anchored line is never a match.
+    if occurrence > 0:
+        first = current_row + 1 if anchored else current_row
+        i = bisect_left(rows, first) + occurrence - 1
+        if i < len(rows):
+            return rows[i]
     else:
-        return "%.16g"
+        last = len(data) - 2 if anchored else len(data) - 1
+        i = bisect_right(rows, last) + occurrence
+        if i >= 0:
+            return rows[i]
 
+    return None
 
-class _SubHelper(object):
-    """Replaces file text at the correct word location in a line. This
-    class contains the Helper Function that is passed to re.sub, etc."""
 
-    def __init__(self):
+def _format_value(val):
+    """Format a value for an input file."""
+    if isinstance(val, float):
+        return _getformat(val) % val
+    return str(val)
 
-        self.newtext = ""
-        self.replace_location = 0
-        self.current_location = 0
-        self.counter = 0
-        self.start_location = 0
-        self.end_location = 0
 
-    def set(self, newtext, location):
-        """Sets a new word location and value for replacement."""
+def _replace_fields(reg, line, values, offset, start, end):
+    """Return `line` with its fields numbered `start` through `end` (fields
+    are the matches of `reg`, counting from 1) replaced by ``values[offset:]``
+    for as long as there are values, and the number of values used."""
 
-        self.newtext = newtext
-        self.replace_location = location
-        self.current_location = 0
+    nvals = len(values) - offset
+    parts = []
+    pos = used = 0
+    location = 0
+    for match in reg.finditer(line):
+        location += 1
+        if location < start:
+            continue
+        if location > end or used >= nvals:
+            break
+        parts.append(line[pos:match.start()])
+        parts.append(_format_value(values[offset+used]))
+        pos = match.end()
+        used += 1
 
-    def set_array(self, newtext, start_location, end_location):
-        """For an array, sets a new starting location, ending location, and
-        value for replacement."""
+    if not used:
+        return line, 0
 
-        self.newtext = newtext
-        self.start_location = start_location
-        self.end_location = end_location
-        self.current_location = 0
+    parts.append(line[pos:])
+    return ''.join(parts), used
 
-    def replace(self, text):
-        """This function should be passed to re.sub.
-        Outputs newtext if current_location = replace_location
-        Otherwise, outputs the input text."""
 
-        self.current_location += 1
+def _getformat(val):
+    # Returns the output format for a floating point number.
+    # The general format is used with 16 places of accuracy, except for when
+    # the floating point value is an integer, in which case a decimal point
+    # followed by a single zero is used.
 
-        if self.current_location == self.replace_location:
-            if isinstance(self.newtext, float):
-                return _getformat(self.newtext) % self.newtext
-            else:
-                return str(self.newtext)
-        else:
-            return text.group()
-
-    def replace_array(self, text):
-        """This function should be passed to re.sub.
-        Outputs newtext if current_location = replace_location
-        Otherwise, outputs the input text."""
-
-        self.current_location += 1
-        end = len(self.newtext)
-
-        if self.current_location >= self.start_location and \
-           self.current_location <= self.end_location and \
-           self.counter < end:
-            if isinstance(self.newtext[self.counter], float):
-                val = self.newtext[self.counter]
-                newval = _getformat(val) % val
-            else:
-                newval = str(self.newtext[self.counter])
-            self.counter += 1
-            return newval
-        else:
-            return text.group()
+    if int(val) == val:
+        return "%.1f"
+    else:
+        return "%.16g"
 
 
 class ToInteger(TokenConverter):
@@ -132,6 +153,7 @@ class InputFileGenerator(object):
         self.data = []
         self.current_row = 0
         self.anchored = False
+        self._anchor_index = {}
 
     def set_template_file(self, filename):
         """Set the name of the template file to be used The template
@@ -145,6 +167,7 @@ class InputFileGenerator(object):
         templatefile = open(filename, 'r')
         self.data = templatefile.readlines()
         templatefile.close()
+        self._anchor_index = {}
 
     def set_generated_file(self, filename):
         """Set the name of the file that will be generated.
@@ -181,52 +204,16 @@ class InputFileGenerator(object):
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
 
-        instance = 0
-        if occurrence > 0:
-            count = 0
-            max_lines = len(self.data)
-            for index in xrange(self.current_row, max_lines):
-                line = self.data[index]
-
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only after the anchor.
-                if count == 0 and self.anchored:
-                    line = line.split(anchor)[-1]
-
-                if line.find(anchor) > -1:
-
-                    instance += 1
-                    if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
-
-                count += 1
-
-        elif occurrence < 0:
-            max_lines = len(self.data)-1
-            count = max_lines
-            for index in xrange(max_lines, -1, -1):
-                line = self.data[index]
-
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only before the anchor.
-                if count == max_lines and self.anchored:
-                    line = line.split(anchor)[0]
-
-                if line.find(anchor) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
-
-                count -= 1
-        else:
+        if occurrence == 0:
             raise ValueError("0 is not valid for an anchor occurrence.")
 
+        row = _find_anchor(self.data, self._anchor_index, anchor, occurrence,
+                           self.current_row, self.anchored)
+        if row is not None:
+            self.current_row = row
+            self.anchored = True
+            return
+
         raise RuntimeError("Could not find pattern %s in template file %s" % \
                            (anchor, self.template_filename))
 
@@ -236,6 +223,19 @@ class InputFileGenerator(object):
         self.current_row = 0
         self.anchored = False
 
+    def _set_line(self, j, line):
+        """Replace line `j`, keeping the anchor index up to date."""
+
+        self.data[j] = line
+        for anchor, rows in self._anchor_index.iteritems():
+            i = bisect_left(rows, j)
+            present = i < len(rows) and rows[i] == j
+            if anchor in line:
+                if not present:
+                    rows.insert(i, j)
+            elif present:
+                del rows[i]
+
     def transfer_var(self, value, row, field):
         """Changes a single variable in the template relative to the
         current anchor.
@@ -246,13 +246,9 @@ class InputFileGenerator(object):
         field - which word in line to replace, as denoted by delimiter(s)"""
 
         j = self.current_row + row
-        line = self.data[j]
-
-        sub = _SubHelper()
-        sub.set(value, field)
-        newline = re.sub(self.reg, sub.replace, line)
-
-        self.data[j] = newline
+        newline, used = _replace_fields(self.reg, self.data[j], [value], 0,
+                                        field, field)
+        self._set_line(j, newline)
 
     def transfer_array(self, value, row_start, field_start, field_end,
                        row_end=None, sep=", "):
@@ -285,7 +281,7 @@ class InputFileGenerator(object):
         if row_end == None:
             row_end = row_start
 
-        sub = _SubHelper()
+        counter = 0
         for row in range(row_start, row_end+1):
 
             j = self.current_row + row
@@ -295,29 +291,31 @@ class InputFileGenerator(object):
                 f_end = field_end
             else:
                 f_end = 99999
-            sub.set_array(value, field_start, f_end)
+
+            newline, used = _replace_fields(self.reg, line, value, counter,
+                                            field_start, f_end)
+            counter += used
             field_start = 0
 
-            newline = re.sub(self.reg, sub.replace_array, line)
-            self.data[j] = newline
+            self._set_line(j, newline)
 
         # Sometimes an array is too large for the example in the template
         # This is resolved by adding more fields at the end
-        if sub.counter < len(value):
-            for val in value[sub.counter:]:
+        if counter < len(value):
+            for val in value[counter:]:
                 newline = newline.rstrip() + sep + str(val)
 
-            self.data[j] = newline
+            self._set_line(j, newline)
 
         # Sometimes an array is too small for the template
         # This is resolved by removing fields
-        elif sub.counter > len(value):
+        elif counter > len(value):
 
             # TODO - Figure out how to handle this.
             # Ideally, we'd remove the extra field placeholders
             raise ValueError("Array is too small for the template.")
 
-        self.data[j] += "\n"
+        self._set_line(j, self.data[j] + "\n")
 
     def transfer_2Darray(self, value, row_start, row_end, field_start,
                        field_end, sep=", "):
@@ -346,20 +344,14 @@ class InputFileGenerator(object):
         sep: str (optional) (currently unsupported)
             Separator to append between values if we go beyond the template."""
 
-        sub = _SubHelper()
         i = 0
         for row in range(row_start, row_end+1):
 
             j = self.current_row + row
-            line = self.data[j]
-
-            sub.set_array(value[i, :], field_start, field_end)
-
-            newline = re.sub(self.reg, sub.replace_array, line)
-            self.data[j] = newline
-
-            sub.current_location = 0
-            sub.counter = 0
+            newline, used = _replace_fields(self.reg, self.data[j],
+                                            value[i, :], 0,
+                                            field_start, field_end)
+            self._set_line(j, newline)
             i += 1
 
         # TODO - Note, we currently can't handle going beyond the end of
@@ -371,7 +363,7 @@ class InputFileGenerator(object):
         row: integer
             Row number to clear, relative to current anchor."""
 
-        self.data[self.current_row + row] = "\n"
+        self._set_line(self.current_row + row, "\n")
 
     def generate(self):
         """Use the template file to generate the input file."""
@@ -395,6 +387,7 @@ class FileParser(object):
 
         self.current_row = 0
         self.anchored = False
+        self._anchor_index = {}
         self.set_delimiters(self.delimiter)
 
     def set_file(self, filename):
@@ -415,6 +408,7 @@ class FileParser(object):
                     continue
                 self.data.append( line.split( self.end_of_line_comment_char )[0] )
         inputfile.close()
+        self._anchor_index = {}
 
     def set_delimiters(self, delimiter):
         """Lets you change the delimiter that is used to identify field
@@ -449,52 +443,16 @@ class FileParser(object):
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
 
-        instance = 0
-        if occurrence > 0:
-            count = 0
-            max_lines = len(self.data)
-            for index in xrange(self.current_row, max_lines):
-                line = self.data[index]
-
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only after the anchor.
-                if count == 0 and self.anchored:
-                    line = line.split(anchor)[-1]
-
-                if anchor in line:
-
-                    instance += 1
-                    if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
-
-                count += 1
-
-        elif occurrence < 0:
-            max_lines = len(self.data)-1
-            count = max_lines
-            for index in xrange(max_lines, -1, -1):
-                line = self.data[index]
-
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only before the anchor.
-                if count == max_lines and self.anchored:
-                    line = line.split(anchor)[0]
-
-                if anchor in line:
-                    instance += -1
-                    if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
-
-                count -= 1
-        else:
+        if occurrence == 0:
             raise ValueError("0 is not valid for an anchor occurrence.")
 
+        row = _find_anchor(self.data, self._anchor_index, anchor, occurrence,
+                           self.current_row, self.anchored)
+        if row is not None:
+            self.current_row = row
+            self.anchored = True
+            return
+
         raise RuntimeError("Could not find pattern %s in output file %s" % \
                            (anchor, self.filename))
 
@@ -550,6 +508,12 @@ class FileParser(object):
             else:
                 line = line[(field-1):(fieldend)]
 
+            fields = self._numeric_fields(line)
+            if fields is not None:
+                if len(fields) > 1:
+                    return line
+                return _to_value(fields[0])
+
             # Let pyparsing figure out if this is a number, and return it
             # as a float or int as appropriate
             data = self._parse_line().parseString(line)
@@ -561,6 +525,10 @@ class FileParser(object):
             else:
                 return data[0]
         else:
+            fields = self._numeric_fields(line)
+            if fields is not None:
+                return _to_value(fields[field-1])
+
             data = self._parse_line().parseString(line)
             return data[field-1]
 
@@ -648,6 +616,10 @@ class FileParser(object):
 
         lines = self.data[j1:j2]
 
+        data = self._numeric_array(lines, fieldstart, fieldend, j2-j1-1)
+        if data is not None:
+            return data
+
         data = zeros(shape=(0, 0))
 
         for i, line in enumerate(lines):
@@ -713,6 +685,10 @@ class FileParser(object):
         j2 = self.current_row + rowend + 1
         lines = list(self.data[j1:j2])
 
+        data = self._numeric_2Darray(lines, fieldstart, fieldend)
+        if data is not None:
+            return data
+
         if self.delimiter == "columns":
 
             if fieldend:
@@ -757,6 +733,70 @@ class FileParser(object):
 
         return data
 
+    def _numeric_fields(self, line):
+        """Return the fields of `line` as strings if they are all plain
+        integers or floats, otherwise None. Checking and splitting a line
+        with regular expressions is much faster than the pyparsing grammar,
+        which is only needed for lines with other data."""
+
+        if self._numeric_line is None or not self._numeric_line.match(line):
+            return None
+        return self._field_split.split(line.strip(self._field_white))
+
+    def _numeric_array(self, lines, fieldstart, fieldend, last):
+        """Fast path for ``transfer_array``. Returns None unless all the
+        requested data is numeric."""
+
+        fields = []
+        for i, line in enumerate(lines):
+            if self.delimiter == "columns":
+                row = self._numeric_fields(line[(fieldstart-1):fieldend])
+                if row is None:
+                    return None
+            else:
+                row = self._numeric_fields(line)
+                if row is None:
+                    return None
+                if i == last:
+                    row = row[(fieldstart-1):fieldend]
+                else:
+                    row = row[(fieldstart-1):]
+                fieldstart = 1
+            fields.extend(row)
+
+        return _to_floats(fields)
+
+    def _numeric_2Darray(self, lines, fieldstart, fieldend):
+        """Fast path for ``transfer_2Darray``. Returns None unless all the
+        requested data is numeric, with the same number of values on each
+        line."""
+
+        rows = []
+        for line in lines:
+            if self.delimiter == "columns":
+                if fieldend:
+                    line = line[(fieldstart-1):fieldend]
+                else:
+                    line = line[(fieldstart-1):]
+                row = self._numeric_fields(line)
+                if row is None:
+                    return None
+            else:
+                row = self._numeric_fields(line)
+                if row is None:
+                    return None
+                if fieldend:
+                    row = row[(fieldstart-1):fieldend]
+                else:
+                    row = row[(fieldstart-1):]
+            rows.append(row)
+
+        if not rows or not rows[0] or \
+           any(len(row) != len(rows[0]) for row in rows):
+            return None
+
+        return _to_floats(rows)
+
     def _parse_line(self):
         """Parse a single data line that may contain string or numerical data.
         Float and Int 'words' are converted to their appropriate type.
@@ -810,4 +850,17 @@ class FileParser(object):
         self.line_parse_token = ( OneOrMore( (nan | num_float | mixed_exp | num_int |
                                               string_text) ) )
 
+        # Regular expressions for the numeric fast path, which splits fields
+        # on the same whitespace the grammar skips.
+        white = ParserElement.DEFAULT_WHITE_CHARS
+        if white and not set(white).intersection('0123456789.+-eED'):
+            chars = ''.join([re.escape(char) for char in white])
+            self._numeric_line = re.compile(r'[%s]*%s(?:[%s]+%s)*[%s\r\n]*\Z'
+                                            % (chars, _NUMBER, chars, _NUMBER,
+                                               chars))
+            self._field_split = re.compile('[%s]+' % chars)
+            self._field_white = white + '\r\n'
+        else:
+            self._numeric_line = None
+
 
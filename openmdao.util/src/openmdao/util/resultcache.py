@@ -0,0 +1,185 @@
+"""
+An on-disk cache of the output files of external commands, keyed by a hash
+of everything that determines those outputs.
+
+Each entry is a directory named by its key, holding a copy of each output
+file and an ``entry.json`` describing them.  Entries are built in a
+temporary directory and renamed into place, so a reader never sees a
+partial entry, and several processes (e.g. the workers of a
+CaseIteratorDriver) may share a cache.  When the cache grows beyond its
+maximum size the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+_ENTRY = 'entry.json'
+_TRASH = '.trash'
+_VERSION = '1'
+
+
+class ResultCache(object):
+    """
+    On-disk cache of command results.
+
+    directory: string
+        Root directory of the cache. It is created if necessary.
+
+    max_size: int (bytes)
+        Maximum total size of the cached files. A value of zero implies
+        no limit.
+    """
+
+    def __init__(self, directory, max_size=0):
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:  # Created by another process.
+                if not os.path.isdir(self.directory):
+                    raise
+
+    @staticmethod
+    def make_key(items, paths):
+        """
+        Return the key for a result that is determined by `items`, a list
+        of strings, and the contents of the files in `paths`.
+        """
+        hsh = hashlib.sha1(_VERSION)
+        for item in items:
+            hsh.update('%d:%s' % (len(item), item))
+        for path in paths:
+            hsh.update('%d:%s' % (len(path), path))
+            with open(path, 'rb') as inp:
+                data = inp.read(1 << 20)
+                while data:
+                    hsh.update(data)
+                    data = inp.read(1 << 20)
+        return hsh.hexdigest()
+
+    def restore(self, key):
+        """
+        If there is an entry for `key`, copy its files back to the paths
+        they were stored from and return its return code.
+        Otherwise return None.
+        """
+        entry_dir = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry_dir, _ENTRY), 'r') as inp:
+                entry = json.load(inp)
+            for i, path in enumerate(entry['paths']):
+                shutil.copyfile(os.path.join(entry_dir, str(i)), path)
+        except (IOError, OSError, ValueError):
+            # Missing, or evicted while we were reading it.
+            self.misses += 1
+            return None
+
+        # Mark as recently used.
+        try:
+            os.utime(entry_dir, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return entry['return_code']
+
+    def store(self, key, return_code, paths):
+        """
+        Save copies of the files in `paths` with `return_code` as the
+        entry for `key`, then evict old entries if the cache is too big.
+        """
+        entry_dir = os.path.join(self.directory, key)
+        if os.path.exists(entry_dir):
+            return
+
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        try:
+            size = 0
+            for i, path in enumerate(paths):
+                dst = os.path.join(tmp_dir, str(i))
+                shutil.copyfile(path, dst)
+                size += os.path.getsize(dst)
+            with open(os.path.join(tmp_dir, _ENTRY), 'w') as out:
+                json.dump(dict(return_code=return_code, paths=list(paths),
+                               size=size), out)
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:  # Stored by another process.
+                pass
+        finally:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if self.max_size:
+            self.evict(self.max_size)
+
+    def entries(self):
+        """
+        Return a list of ``(mtime, size, key)`` for each entry in the cache,
+        least recently used first.
+        """
+        entries = []
+        for key in os.listdir(self.directory):
+            if key.startswith('.'):
+                continue
+            entry_dir = os.path.join(self.directory, key)
+            try:
+                with open(os.path.join(entry_dir, _ENTRY), 'r') as inp:
+                    size = json.load(inp)['size']
+                mtime = os.path.getmtime(entry_dir)
+            except (IOError, OSError, ValueError, KeyError):
+                continue
+            entries.append((mtime, size, key))
+        return sorted(entries)
+
+    def evict(self, max_size):
+        """ Remove least recently used entries until at most `max_size` bytes
+        are cached. """
+        entries = self.entries()
+        total = sum(size for mtime, size, key in entries)
+        for mtime, size, key in entries:
+            if total <= max_size:
+                break
+            self._remove(key)
+            total -= size
+
+    def clear(self):
+        """ Remove all entries. """
+        for mtime, size, key in self.entries():
+            self._remove(key)
+
+    def stats(self):
+        """
+        Return a dictionary of this cache's hits, misses and evictions (as
+        seen by this object), and the number of entries and bytes on disk.
+        """
+        entries = self.entries()
+        return dict(hits=self.hits, misses=self.misses,
+                    evictions=self.evictions, entries=len(entries),
+                    size=sum(size for mtime, size, key in entries))
+
+    def _remove(self, key):
+        """ Remove entry `key`, which may be being removed concurrently. """
+        trash = os.path.join(self.directory, _TRASH)
+        try:
+            os.makedirs(trash)
+        except OSError:
+            pass
+
+        # Rename first so readers never see a partly removed entry.
+        dead = tempfile.mkdtemp(prefix=key, dir=trash)
+        try:
+            os.rename(os.path.join(self.directory, key),
+                      os.path.join(dead, key))
+        except OSError:  # Already gone.
+            pass
+        else:
+            self.evictions += 1
+        shutil.rmtree(dead, ignore_errors=True)
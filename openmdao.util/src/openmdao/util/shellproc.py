@@ -2,6 +2,7 @@ import os.path
 import signal
 import subprocess
 import sys
+import threading
 import time
 
 PIPE = subprocess.PIPE
@@ -104,13 +105,14 @@ class ShellProc(subprocess.Popen):
 
     def wait(self, poll_delay=0., timeout=0.):
         """
-        Polls for command completion or timeout.
+        Waits for command completion or timeout.
         Closes any files implicitly opened.
         Returns ``(return_code, error_msg)``.
 
         poll_delay: float (seconds)
             Time to delay between polling for command completion.
-            A value of zero uses an internal default.
+            A value of zero blocks until the command exits, so there is no
+            delay after it completes.
 
         timeout: float (seconds)
             Maximum time to wait for command completion.
@@ -118,20 +120,10 @@ class ShellProc(subprocess.Popen):
         """
         return_code = None
         try:
-            if poll_delay <= 0:
-                poll_delay = max(0.1, timeout/100.)
-                poll_delay = min(10., poll_delay)
-            npolls = int(timeout / poll_delay) + 1
-
-            time.sleep(poll_delay)
-            return_code = self.poll()
-            while return_code is None:
-                npolls -= 1
-                if (timeout > 0) and (npolls < 0):
-                    self.terminate()
-                    break
-                time.sleep(poll_delay)
-                return_code = self.poll()
+            if poll_delay > 0:
+                return_code = self._poll_wait(poll_delay, timeout)
+            else:
+                return_code = self._block_wait(timeout)
         finally:
             self.close_files()
 
@@ -142,6 +134,57 @@ class ShellProc(subprocess.Popen):
             self.errormsg = 'Timed out'
         return (return_code, self.errormsg)
 
+    def _poll_wait(self, poll_delay, timeout):
+        """
+        Polls every `poll_delay` seconds for command completion, terminating
+        the command after `timeout` seconds. Returns the return code, or None
+        if the command timed out.
+        """
+        npolls = int(timeout / poll_delay) + 1
+
+        time.sleep(poll_delay)
+        return_code = self.poll()
+        while return_code is None:
+            npolls -= 1
+            if (timeout > 0) and (npolls < 0):
+                self.terminate()
+                break
+            time.sleep(poll_delay)
+            return_code = self.poll()
+
+        return return_code
+
+    def _block_wait(self, timeout):
+        """
+        Blocks until the command exits. If `timeout` is nonzero, a timer
+        terminates the command after `timeout` seconds. Returns the return
+        code, or None if the command timed out.
+        """
+        if timeout <= 0:
+            return subprocess.Popen.wait(self)
+
+        expired = threading.Event()
+
+        def _expire():
+            if self.returncode is None:
+                expired.set()
+                try:
+                    self.terminate()
+                except OSError:  # Already gone.
+                    pass
+
+        timer = threading.Timer(timeout, _expire)
+        timer.daemon = True
+        timer.start()
+        try:
+            return_code = subprocess.Popen.wait(self)
+        finally:
+            timer.cancel()
+
+        if expired.is_set():
+            return None
+        return return_code
+
     def error_message(self, return_code):
         """
         Return error message for `return_code`.
@@ -189,7 +232,7 @@ def call(args, stdin=None, stdout=None, stderr=None, env=None,
 
     poll_delay: float (seconds)
         Time to delay between polling for command completion.
-        A value of zero uses an internal default.
+        A value of zero waits for the command to exit without polling.
 
     timeout: float (seconds)
         Maximum time to wait for command completion.
@@ -221,7 +264,7 @@ def check_call(args, stdin=None, stdout=None, stderr=None, env=None,
 
     poll_delay: float (seconds)
         Time to delay between polling for command completion.
-        A value of zero uses an internal default.
+        A value of zero waits for the command to exit without polling.
 
     timeout: float (seconds)
         Maximum time to wait for command completion.
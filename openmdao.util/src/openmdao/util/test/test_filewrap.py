@@ -504,6 +504,68 @@ class TestCase(unittest.TestCase):
         else:
             self.fail('ValueError expected')
 
+    def test_output_parse_numeric_blocks(self):
+
+        # Many anchored blocks of numbers, which take the fast path, mixed
+        # with lines that need the full grammar.
+        outfile = open(self.filename, 'w')
+        for i in range(50):
+            outfile.write("Step %d\n" % i)
+            outfile.write("Values\n")
+            for j in range(10):
+                outfile.write("  %d  %.3f  %.2E  1.5D-3\n" % (j, i+0.5*j, 1e3*j))
+            outfile.write("  Total  %d  NaN\n" % i)
+        outfile.close()
+
+        gen = FileParser()
+        gen.set_file(self.filename)
+
+        for i in range(50):
+            gen.mark_anchor('Values')
+            val = gen.transfer_2Darray(1, 1, 10)
+            self.assertEqual(val.shape, (10, 4))
+            self.assertEqual(val[9, 0], 9.0)
+            self.assertEqual(val[4, 1], i+2.0)
+            self.assertEqual(val[2, 2], 2000.0)
+            self.assertEqual(val[0, 3], 0.0015)
+
+            val = gen.transfer_array(1, 2, 2, 3)
+            self.assertEqual(list(val), [i, 0.0, 0.0015, 1.0, i+0.5, 1000.0])
+            self.assertEqual(gen.transfer_var(3, 1), 2)
+            self.assertEqual(gen.transfer_var(3, 4), 0.0015)
+            self.assertEqual(gen.transfer_var(11, 2), i)
+            self.assertTrue(isnan(gen.transfer_var(11, 3)))
+
+        gen.mark_anchor('Step', -2)
+        self.assertEqual(gen.transfer_var(0, 2), 48)
+        gen.mark_anchor('Step')
+        self.assertEqual(gen.transfer_var(0, 2), 49)
+        try:
+            gen.mark_anchor('Step')
+        except RuntimeError, err:
+            msg = "Could not find pattern Step in output file filename.dat"
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('RuntimeError expected')
+
+        gen.reset_anchor()
+        gen.mark_anchor('Step', 7)
+        self.assertEqual(gen.transfer_var(0, 2), 6)
+
+        # Anchors are found in lines changed in the template.
+        gen = InputFileGenerator()
+        gen.set_template_file(self.filename)
+        gen.set_generated_file('generated.dat')
+        gen.mark_anchor('Step', 3)
+        gen.transfer_var('Step', 1, 1)
+        gen.transfer_var('Other', 0, 1)
+        gen.reset_anchor()
+        gen.mark_anchor('Step', 3)
+        self.assertEqual(gen.current_row, 27)
+        gen.reset_anchor()
+        gen.mark_anchor('Other')
+        self.assertEqual(gen.current_row, 26)
+
     def test_comment_char(self):
 
         # Check to see if the use of the comment
@@ -0,0 +1,82 @@
+"""
+Test ResultCache.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from openmdao.util.resultcache import ResultCache
+
+
+class ResultCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_resultcache-')
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        if not os.environ.get('OPENMDAO_KEEPDIRS', False):
+            shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def _write(self, path, data):
+        with open(path, 'w') as out:
+            out.write(data)
+
+    def _read(self, path):
+        with open(path, 'r') as inp:
+            return inp.read()
+
+    def test_store_restore(self):
+        self._write('input', 'x = 1')
+        key = ResultCache.make_key(['cmd'], ['input'])
+        self.assertEqual(key, ResultCache.make_key(['cmd'], ['input']))
+        self.assertNotEqual(key, ResultCache.make_key(['cmd2'], ['input']))
+
+        cache = ResultCache('cache')
+        self.assertEqual(cache.restore(key), None)
+
+        self._write('output', 'y = 2')
+        cache.store(key, 0, ['output'])
+        os.remove('output')
+
+        # A second object sees the same entries.
+        cache2 = ResultCache('cache')
+        self.assertEqual(cache2.restore(key), 0)
+        self.assertEqual(self._read('output'), 'y = 2')
+
+        self._write('input', 'x = 2')
+        self.assertNotEqual(key, ResultCache.make_key(['cmd'], ['input']))
+
+        stats = cache2.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 0)
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['size'], 5)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_eviction(self):
+        cache = ResultCache('cache', max_size=25)
+        for i in range(5):
+            self._write('output', '%010d' % i)
+            cache.store('key%d' % i, 0, ['output'])
+            os.utime(os.path.join(cache.directory, 'key%d' % i),
+                     (1000+i, 1000+i))
+
+        # Only the two most recent entries fit.
+        self.assertEqual([key for mtime, size, key in cache.entries()],
+                         ['key3', 'key4'])
+        self.assertEqual(cache.evictions, 3)
+        self.assertEqual(cache.restore('key0'), None)
+        self.assertEqual(cache.restore('key4'), 0)
+        self.assertEqual(self._read('output'), '%010d' % 4)
+
+        cache.clear()
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,8 +8,11 @@ import signal
 import sys
 import tempfile
 import shutil
+import time
 import unittest
 
+from nose import SkipTest
+
 from openmdao.util.shellproc import call, check_call, CalledProcessError, \
                                     ShellProc
 
@@ -75,6 +78,29 @@ class TestCase(unittest.TestCase):
             if os.path.exists('stderr'):
                 os.remove('stderr')
 
+    def test_timeout(self):
+        logging.debug('')
+        logging.debug('test_timeout')
+
+        if sys.platform == 'win32':
+            raise SkipTest('Uses sleep command')
+
+        # Completion must be seen as soon as the command exits.
+        start = time.time()
+        return_code, error_msg = call('true', timeout=10.)
+        self.assertEqual(return_code, 0)
+        self.assertTrue(time.time() - start < 1.)
+
+        start = time.time()
+        return_code, error_msg = call('sleep 10', timeout=0.2)
+        self.assertEqual(return_code, None)
+        self.assertEqual(error_msg, 'Timed out')
+        self.assertTrue(time.time() - start < 5.)
+
+        return_code, error_msg = call('sleep 10', poll_delay=0.05, timeout=0.2)
+        self.assertEqual(return_code, None)
+        self.assertEqual(error_msg, 'Timed out')
+
     def test_errormsg(self):
         logging.debug('')
         logging.debug('test_errormsg')